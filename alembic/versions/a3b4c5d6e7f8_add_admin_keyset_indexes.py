@@ -0,0 +1,54 @@
+"""add (sort column, id) indexes for admin keyset pagination
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3b4c5d6e7f8"
+down_revision: Union[str, None] = "f2a3b4c5d6e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, sort column) pairs served by ORDER BY <column>, id. The unique
+# users.phone_number and users.telegram_id indexes already give a total order.
+KEYSET_INDEXES = (
+    ("orders", "user_id"),
+    ("orders", "status"),
+    ("orders", "total_amount"),
+    ("orders", "scheduled_at"),
+    ("orders", "created_at"),
+    ("orders", "updated_at"),
+    ("users", "language_code"),
+    ("users", "created_at"),
+    ("users", "updated_at"),
+)
+
+# Single-column indexes made redundant by a composite with the same leading column
+SUPERSEDED_INDEXES = (
+    ("orders", "idx_orders_user_id", "user_id"),
+    ("orders", "idx_orders_status", "status"),
+    ("orders", "idx_orders_created_at", "created_at"),
+)
+
+
+def upgrade() -> None:
+    """Create one composite (column, id) index per sortable admin list column."""
+    for table, column in KEYSET_INDEXES:
+        op.create_index(f"ix_{table}_{column}_id", table, [column, "id"])
+    for table, name, _ in SUPERSEDED_INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    """Restore the single-column indexes and drop the keyset pagination indexes."""
+    for table, name, column in SUPERSEDED_INDEXES:
+        op.create_index(name, table, [column])
+    for table, column in reversed(KEYSET_INDEXES):
+        op.drop_index(f"ix_{table}_{column}_id", table_name=table)
@@ -0,0 +1,35 @@
+"""add cache_invalidations table
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7b8c9d0e1f2"
+down_revision: Union[str, None] = "f6a7b8c9d0e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create cache_invalidations table (polling fallback for LISTEN/NOTIFY)."""
+    op.create_table(
+        "cache_invalidations",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_cache_invalidations_created_at", "cache_invalidations", ["created_at"])
+
+
+def downgrade() -> None:
+    """Drop cache_invalidations table."""
+    op.drop_index("ix_cache_invalidations_created_at", table_name="cache_invalidations")
+    op.drop_table("cache_invalidations")
@@ -0,0 +1,43 @@
+"""add stats_counters table
+
+Revision ID: b4c5d6e7f8a9
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4c5d6e7f8a9"
+down_revision: Union[str, None] = "a3b4c5d6e7f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create stats_counters and seed it from the current tables."""
+    op.create_table(
+        "stats_counters",
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("slot", sa.Integer(), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("name", "slot"),
+    )
+    op.execute(
+        """
+        INSERT INTO stats_counters (name, slot, value)
+        SELECT 'users', 0, count(*) FROM users
+        UNION ALL SELECT 'orders', 0, count(*) FROM orders
+        UNION ALL SELECT 'services_active', 0, count(*) FROM services WHERE is_active
+        UNION ALL SELECT 'orders_status:' || status, 0, count(*) FROM orders GROUP BY status
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop stats_counters."""
+    op.drop_table("stats_counters")
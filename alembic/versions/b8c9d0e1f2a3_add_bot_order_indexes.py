@@ -0,0 +1,41 @@
+"""add bot-facing order indexes
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8c9d0e1f2a3"
+down_revision: Union[str, None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create composite index for active orders and partial index for unnotified orders."""
+    op.create_index(
+        "ix_orders_user_status_created",
+        "orders",
+        ["user_id", "status", "created_at"],
+    )
+    op.create_index(
+        "ix_orders_unnotified",
+        "orders",
+        ["user_id", "updated_at"],
+        postgresql_where=sa.text(
+            "status <> 'pending' AND notified_status IS DISTINCT FROM status"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop bot-facing order indexes."""
+    op.drop_index("ix_orders_unnotified", table_name="orders")
+    op.drop_index("ix_orders_user_status_created", table_name="orders")
@@ -0,0 +1,55 @@
+"""add analytics_rollups and analytics_dirty_buckets tables
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d6e7f8a9b0"
+down_revision: Union[str, None] = "b4c5d6e7f8a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the rollup tables and queue every existing order hour for backfill."""
+    op.create_table(
+        "analytics_rollups",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("granularity", sa.String(length=10), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("service_id", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("language_code", sa.String(length=5), nullable=True),
+        sa.Column("order_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("amount_sum", sa.DECIMAL(precision=14, scale=2), nullable=False, server_default="0"),
+        sa.Column("paid_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_analytics_rollups_bucket", "analytics_rollups", ["granularity", "bucket_start"])
+    op.create_table(
+        "analytics_dirty_buckets",
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+        sa.PrimaryKeyConstraint("hour"),
+    )
+    op.execute(
+        """
+        INSERT INTO analytics_dirty_buckets (hour, version)
+        SELECT DISTINCT date_trunc('hour', created_at), 1 FROM orders
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the rollup tables."""
+    op.drop_table("analytics_dirty_buckets")
+    op.drop_index("ix_analytics_rollups_bucket", table_name="analytics_rollups")
+    op.drop_table("analytics_rollups")
@@ -0,0 +1,56 @@
+"""add notification_dead_letters table and sweeper index
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d0e1f2a3b4c5"
+down_revision: Union[str, None] = "c9d0e1f2a3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create notification_dead_letters and the partial index used by the sweeper."""
+    op.create_table(
+        "notification_dead_letters",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("order_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("http_status", sa.Integer(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_notification_dead_letters_order_status",
+        "notification_dead_letters",
+        ["order_id", "status"],
+    )
+    op.create_index(
+        "ix_orders_unnotified_updated",
+        "orders",
+        ["updated_at"],
+        postgresql_where=sa.text(
+            "status <> 'pending' AND notified_status IS DISTINCT FROM status"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop notification_dead_letters and the sweeper index."""
+    op.drop_index("ix_orders_unnotified_updated", table_name="orders")
+    op.drop_index(
+        "ix_notification_dead_letters_order_status", table_name="notification_dead_letters"
+    )
+    op.drop_table("notification_dead_letters")
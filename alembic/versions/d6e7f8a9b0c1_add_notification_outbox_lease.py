@@ -0,0 +1,40 @@
+"""lease notification_outbox rows instead of locking them while sending
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d6e7f8a9b0c1"
+down_revision: Union[str, None] = "c5d6e7f8a9b0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add locked_until, purge delivered rows and drop sent_at (delivered rows are now deleted)."""
+    op.add_column("notification_outbox", sa.Column("locked_until", sa.DateTime(), nullable=True))
+    op.execute("DELETE FROM notification_outbox WHERE sent_at IS NOT NULL")
+    op.drop_index("ix_notification_outbox_due", table_name="notification_outbox")
+    op.drop_column("notification_outbox", "sent_at")
+    op.create_index("ix_notification_outbox_due", "notification_outbox", ["available_at"])
+
+
+def downgrade() -> None:
+    """Restore sent_at and the partial due index; drop locked_until."""
+    op.drop_index("ix_notification_outbox_due", table_name="notification_outbox")
+    op.add_column("notification_outbox", sa.Column("sent_at", sa.DateTime(), nullable=True))
+    op.create_index(
+        "ix_notification_outbox_due",
+        "notification_outbox",
+        ["available_at"],
+        postgresql_where=sa.text("sent_at IS NULL"),
+    )
+    op.drop_column("notification_outbox", "locked_until")
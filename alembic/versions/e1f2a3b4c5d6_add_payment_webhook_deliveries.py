@@ -0,0 +1,49 @@
+"""add payment_webhook_deliveries table
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e1f2a3b4c5d6"
+down_revision: Union[str, None] = "d0e1f2a3b4c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create payment_webhook_deliveries with a unique (provider, transaction_id) key."""
+    op.create_table(
+        "payment_webhook_deliveries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("provider", sa.String(length=50), nullable=False),
+        sa.Column("transaction_id", sa.String(length=128), nullable=False),
+        sa.Column("payment_id", sa.Integer(), nullable=False),
+        sa.Column("payment_status", sa.String(length=50), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["payment_id"], ["payments.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "provider", "transaction_id", name="uq_payment_webhook_deliveries_transaction"
+        ),
+    )
+    op.create_index(
+        op.f("ix_payment_webhook_deliveries_payment_id"),
+        "payment_webhook_deliveries",
+        ["payment_id"],
+    )
+
+
+def downgrade() -> None:
+    """Drop payment_webhook_deliveries."""
+    op.drop_index(
+        op.f("ix_payment_webhook_deliveries_payment_id"), table_name="payment_webhook_deliveries"
+    )
+    op.drop_table("payment_webhook_deliveries")
@@ -0,0 +1,47 @@
+"""replace analytics_dirty_buckets with the append-only analytics_dirty_hours
+
+Revision ID: f8a9b0c1d2e3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f8a9b0c1d2e3"
+down_revision: Union[str, None] = "e7f8a9b0c1d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create analytics_dirty_hours, carry the queued hours over and drop the upserted table."""
+    op.create_table(
+        "analytics_dirty_hours",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_analytics_dirty_hours_hour", "analytics_dirty_hours", ["hour"])
+    op.execute("INSERT INTO analytics_dirty_hours (hour) SELECT hour FROM analytics_dirty_buckets")
+    op.drop_table("analytics_dirty_buckets")
+
+
+def downgrade() -> None:
+    """Restore analytics_dirty_buckets with one row per queued hour."""
+    op.create_table(
+        "analytics_dirty_buckets",
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+        sa.PrimaryKeyConstraint("hour"),
+    )
+    op.execute(
+        "INSERT INTO analytics_dirty_buckets (hour, version) "
+        "SELECT DISTINCT hour, 1 FROM analytics_dirty_hours"
+    )
+    op.drop_index("ix_analytics_dirty_hours_hour", table_name="analytics_dirty_hours")
+    op.drop_table("analytics_dirty_hours")
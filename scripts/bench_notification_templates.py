@@ -0,0 +1,85 @@
+"""
+Микро-бенчмарк рендеринга уведомлений о статусе заказа.
+
+Использование:
+    poetry run python scripts/bench_notification_templates.py [--batch 10000] [--repeat 5]
+
+Сравнивает стоимость рендеринга одного сообщения для пачки размером с рассылку:
+1. legacy   - str.format по исходному шаблону + Decimal(str(raw)) для суммы
+2. compiled - предкомпилированный шаблон из TemplateRegistry + format_amount
+"""
+
+import argparse
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from nms.services.notification_templates import template_registry  # noqa: E402
+
+
+def _legacy_price(raw) -> str:
+    """Прежний форматтер суммы (через Decimal)."""
+    if raw is None:
+        return "—"
+    try:
+        value = int(Decimal(str(raw)))
+        return f"{value:,}".replace(",", " ")
+    except Exception:
+        return str(raw)
+
+
+def _batch(size: int) -> list[tuple]:
+    """Пачка сообщений: (status, language, order_id, service_name, amount)."""
+    statuses = template_registry.statuses
+    languages = template_registry.languages
+    return [
+        (
+            statuses[i % len(statuses)],
+            languages[i % len(languages)],
+            i,
+            "Massage",
+            Decimal("150000.00") + i if i % 2 else f"{150000 + i}.00",
+        )
+        for i in range(size)
+    ]
+
+
+def _render_legacy(batch: list[tuple]) -> None:
+    for status, lang, order_id, service_name, amount in batch:
+        template = template_registry.get(status, lang).source
+        template.format(order_id=order_id, service_name=service_name, amount=_legacy_price(amount))
+
+
+def _render_compiled(batch: list[tuple]) -> None:
+    render = template_registry.render_order_status
+    for status, lang, order_id, service_name, amount in batch:
+        render(status, lang, order_id, service_name, amount)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=10_000, help="Сообщений в пачке")
+    parser.add_argument("--repeat", type=int, default=5, help="Повторов (берётся лучший)")
+    args = parser.parse_args()
+
+    batch = _batch(args.batch)
+    print(f"Пачка: {args.batch} сообщений, {args.repeat} повторов (лучший результат)")
+    print("-" * 60)
+    results = {}
+    for name, render in (("legacy", _render_legacy), ("compiled", _render_compiled)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            render(batch)
+            best = min(best, time.perf_counter() - started)
+        results[name] = best
+        print(f"{name:>9}: {best * 1000:8.2f} ms на пачку, {best / args.batch * 1e6:6.2f} µs на сообщение")
+    print("-" * 60)
+    print(f"Ускорение: x{results['legacy'] / results['compiled']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
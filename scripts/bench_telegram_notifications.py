@@ -0,0 +1,89 @@
+"""
+Бенчмарк сквозной пропускной способности уведомлений через локальную заглушку Bot API.
+
+Использование:
+    poetry run python scripts/bench_telegram_notifications.py [--messages 2000] [--chats 500]
+        [--rate 30] [--latency exp:40] [--rate-limit-rate 0.01] [--error-rate 0.005]
+
+Скрипт:
+1. Поднимает nms.testing.telegram_stub на свободном порту
+2. Отправляет уведомления о статусе заказа через TelegramNotifier
+   (общий HTTP-клиент + планировщик с лимитами Bot API)
+3. Выводит пропускную способность, задержки и статистику заглушки
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from nms.config import get_settings  # noqa: E402
+from nms.monitoring.metrics import Histogram  # noqa: E402
+from nms.services.notification_templates import template_registry  # noqa: E402
+from nms.services.telegram_notifier import SendScheduler, TelegramNotifier, create_http_client  # noqa: E402
+from nms.testing.telegram_stub import StubConfig, TelegramStubServer, parse_latency  # noqa: E402
+
+
+async def run(args: argparse.Namespace) -> None:
+    config = StubConfig(
+        latency=parse_latency(args.latency),
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        error_rate=args.error_rate,
+        chat_interval=args.chat_interval,
+        seed=42,
+    )
+    scheduler = SendScheduler(global_rate=args.rate, chat_interval=args.chat_interval)
+    latency_ms = Histogram()
+    statuses = template_registry.statuses
+    languages = template_registry.languages
+
+    async with TelegramStubServer(config) as stub, create_http_client(get_settings()) as client:
+        notifier = TelegramNotifier("BENCH", client=client, api_base_url=stub.base_url, scheduler=scheduler)
+
+        async def notify(i: int) -> bool:
+            started = time.monotonic()
+            result = await notifier.deliver_order_status(
+                telegram_id=1000 + i % args.chats,
+                order_id=i,
+                service_name="Massage",
+                total_amount="150000.00",
+                new_status=statuses[i % len(statuses)],
+                language_code=languages[i % len(languages)],
+            )
+            latency_ms.observe((time.monotonic() - started) * 1000)
+            return result.delivered
+
+        print(f"Заглушка: {stub.base_url}, сообщений: {args.messages}, чатов: {args.chats}, лимит: {args.rate}/с")
+        print("-" * 60)
+        started = time.monotonic()
+        results = await asyncio.gather(*(notify(i) for i in range(args.messages)))
+        elapsed = time.monotonic() - started
+
+        delivered = sum(results)
+        print(f"Доставлено:      {delivered}/{args.messages}")
+        print(f"Время:           {elapsed:.2f} с")
+        print(f"Пропускная сп.:  {delivered / elapsed:.1f} сообщ./с")
+        print(f"Задержка (мс):   {latency_ms.snapshot()}")
+        print(f"Планировщик:     {scheduler.snapshot()}")
+        print(f"Заглушка:        {stub.snapshot()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000, help="Количество уведомлений")
+    parser.add_argument("--chats", type=int, default=500, help="Количество разных чатов")
+    parser.add_argument("--rate", type=float, default=30.0, help="Глобальный лимит планировщика, сообщ./с")
+    parser.add_argument("--chat-interval", type=float, default=0.0, help="Интервал между сообщениями в один чат, с")
+    parser.add_argument("--latency", default="exp:40", help="Задержка заглушки: fixed:MS | uniform:MIN,MAX | exp:MEAN")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Доля ответов 429")
+    parser.add_argument("--retry-after", type=float, default=0.5, help="retry_after для ответов 429, с")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля ответов 500")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
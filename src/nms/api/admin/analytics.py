@@ -0,0 +1,192 @@
+"""Admin API endpoints for order and revenue analytics."""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import distinct, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.database import get_db
+from nms.models.db_models import AnalyticsDirtyHour, AnalyticsRollup
+from nms.models.admin import (
+    AdminAnalyticsBackfillResponse,
+    AdminAnalyticsPoint,
+    AdminAnalyticsTimeseriesResponse,
+)
+from nms.api.dependencies import get_admin_key
+from nms.services.analytics import DAY, HOUR, analytics_rollups, hour_of
+
+log = logging.getLogger(__name__)
+router = APIRouter(prefix="/admin/analytics", tags=["admin-analytics"])
+
+# group_by value -> (rollup column, AdminAnalyticsPoint field)
+_GROUPS = {
+    "service": (AnalyticsRollup.service_id, "service_id"),
+    "status": (AnalyticsRollup.status, "status"),
+    "language": (AnalyticsRollup.language_code, "language_code"),
+}
+
+# Longest range served at hourly granularity
+MAX_HOURLY_RANGE = timedelta(days=31)
+
+
+@router.get(
+    "/timeseries",
+    response_model=AdminAnalyticsTimeseriesResponse,
+    dependencies=[Depends(get_admin_key)],
+)
+async def get_timeseries(
+    granularity: Literal["day", "hour"] = Query(default="day", description="Bucket size"),
+    date_from: Optional[datetime] = Query(
+        default=None,
+        description="First bucket containing this moment (default: 30 days / 48 hours before date_to)"
+    ),
+    date_to: Optional[datetime] = Query(
+        default=None,
+        description="Last bucket containing this moment (default: now, UTC)"
+    ),
+    group_by: list[Literal["service", "status", "language"]] = Query(
+        default=[],
+        description="Split each bucket by these dimensions (repeatable)"
+    ),
+    service_id: Optional[int] = Query(default=None, description="Only orders of this service"),
+    status_filter: Optional[str] = Query(default=None, description="Only orders in this status"),
+    language_code: Optional[str] = Query(default=None, description="Only orders of users with this language"),
+    db: AsyncSession = Depends(get_db),
+) -> AdminAnalyticsTimeseriesResponse:
+    """
+    Get order counts, revenue and paid orders per time bucket.
+
+    Answered from analytics_rollups (see nms.services.analytics), never
+    from the orders table.
+
+    Args:
+        granularity: day or hour
+        date_from: Start of the range (inclusive, rounded down to the bucket)
+        date_to: End of the range (its bucket is included)
+        group_by: Dimensions to split by: service, status, language
+        service_id: Optional service filter
+        status_filter: Optional order status filter
+        language_code: Optional user language filter
+        db: Database session
+
+    Returns:
+        Points ordered by bucket and the number of hours not yet recomputed
+    """
+    step = DAY if granularity == "day" else HOUR
+    date_to = date_to or datetime.utcnow()
+    date_from = date_from or date_to - (timedelta(days=30) if granularity == "day" else timedelta(hours=48))
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must not be after date_to"
+        )
+    if granularity == "hour" and date_to - date_from > MAX_HOURLY_RANGE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Hourly ranges are limited to {MAX_HOURLY_RANGE.days} days"
+        )
+    group_by = list(dict.fromkeys(group_by))
+
+    def bucket_of(moment: datetime) -> datetime:
+        hour = hour_of(moment)
+        return hour.replace(hour=0) if granularity == "day" else hour
+
+    start, end = bucket_of(date_from), bucket_of(date_to) + step
+
+    try:
+        group_columns = [_GROUPS[name][0] for name in group_by]
+        query = (
+            select(
+                AnalyticsRollup.bucket_start,
+                *group_columns,
+                func.sum(AnalyticsRollup.order_count),
+                func.sum(AnalyticsRollup.amount_sum),
+                func.sum(AnalyticsRollup.paid_count),
+            )
+            .where(
+                AnalyticsRollup.granularity == granularity,
+                AnalyticsRollup.bucket_start >= start,
+                AnalyticsRollup.bucket_start < end,
+            )
+            .group_by(AnalyticsRollup.bucket_start, *group_columns)
+            .order_by(AnalyticsRollup.bucket_start, *group_columns)
+        )
+        if service_id is not None:
+            query = query.where(AnalyticsRollup.service_id == service_id)
+        if status_filter is not None:
+            query = query.where(AnalyticsRollup.status == status_filter)
+        if language_code is not None:
+            query = query.where(AnalyticsRollup.language_code == language_code)
+        result = await db.execute(query)
+
+        points = []
+        for row in result.all():
+            bucket_start, *groups, order_count, amount_sum, paid_count = row
+            points.append(AdminAnalyticsPoint(
+                bucket_start=bucket_start,
+                order_count=order_count,
+                amount_sum=amount_sum,
+                paid_count=paid_count,
+                **{_GROUPS[name][1]: value for name, value in zip(group_by, groups)},
+            ))
+
+        stale = await db.execute(
+            select(func.count(distinct(AnalyticsDirtyHour.hour))).where(
+                AnalyticsDirtyHour.hour >= start, AnalyticsDirtyHour.hour < end
+            )
+        )
+
+        return AdminAnalyticsTimeseriesResponse(
+            granularity=granularity,
+            date_from=start,
+            date_to=end,
+            group_by=group_by,
+            points=points,
+            stale_hours=stale.scalar_one(),
+        )
+    except Exception as e:
+        log.error(f"Error getting analytics timeseries: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get analytics timeseries"
+        ) from e
+
+
+@router.post(
+    "/backfill",
+    response_model=AdminAnalyticsBackfillResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(get_admin_key)],
+)
+async def backfill(
+    date_from: Optional[datetime] = Query(default=None, description="Orders created at or after (default: all)"),
+    date_to: Optional[datetime] = Query(default=None, description="Orders created at or before (default: all)"),
+    db: AsyncSession = Depends(get_db),
+) -> AdminAnalyticsBackfillResponse:
+    """
+    Queue the hours of orders created in a range for recomputation.
+
+    The background refresh works through them newest first; stale_hours
+    of the timeseries shows the remaining work.
+
+    Args:
+        date_from: Optional start of the orders.created_at range
+        date_to: Optional end of the orders.created_at range
+        db: Database session
+
+    Returns:
+        Number of hours queued
+    """
+    try:
+        queued = await analytics_rollups.mark_range(db, date_from, date_to)
+        log.info(f"[ADMIN] Analytics backfill queued {queued} hours")
+        return AdminAnalyticsBackfillResponse(status="accepted", queued_hours=queued)
+    except Exception as e:
+        log.error(f"Error queueing analytics backfill: {e}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue analytics backfill"
+        ) from e
@@ -0,0 +1,138 @@
+"""Admin API endpoints for broadcasts to Telegram users."""
+
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.database import get_db
+from nms.models.admin import AdminBroadcastCreateRequest, AdminBroadcastResponse
+from nms.models.db_models import BroadcastJob
+from nms.services.broadcast import broadcast_manager
+from nms.api.dependencies import get_admin_key
+
+log = logging.getLogger(__name__)
+router = APIRouter(prefix="/admin/broadcasts", tags=["admin-broadcasts"])
+
+
+def _found(job: BroadcastJob | None, job_id: int) -> BroadcastJob:
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Broadcast with ID {job_id} not found"
+        )
+    return job
+
+
+@router.post(
+    "",
+    response_model=AdminBroadcastResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(get_admin_key)],
+)
+async def create_broadcast(
+    request: AdminBroadcastCreateRequest,
+    db: AsyncSession = Depends(get_db)
+) -> AdminBroadcastResponse:
+    """
+    Start sending an announcement to every user with a telegram_id.
+
+    Args:
+        request: Texts per language and the fallback language
+        db: Database session
+
+    Returns:
+        The started job; poll GET /admin/broadcasts/{id} for progress
+    """
+    if request.default_language not in request.texts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"No text for default language '{request.default_language}'"
+        )
+    job = await broadcast_manager.create(db, request.texts, request.default_language)
+    return AdminBroadcastResponse(**broadcast_manager.snapshot(job))
+
+
+@router.get("", response_model=list[AdminBroadcastResponse], dependencies=[Depends(get_admin_key)])
+async def list_broadcasts(
+    limit: int = Query(50, ge=1, le=500, description="Number of latest jobs"),
+    db: AsyncSession = Depends(get_db)
+) -> list[AdminBroadcastResponse]:
+    """
+    List the latest broadcast jobs, newest first.
+
+    Args:
+        limit: Number of jobs
+        db: Database session
+
+    Returns:
+        Broadcast jobs with progress
+    """
+    jobs = await broadcast_manager.jobs(db, limit)
+    return [AdminBroadcastResponse(**broadcast_manager.snapshot(job)) for job in jobs]
+
+
+@router.get("/{job_id}", response_model=AdminBroadcastResponse, dependencies=[Depends(get_admin_key)])
+async def get_broadcast(job_id: int, db: AsyncSession = Depends(get_db)) -> AdminBroadcastResponse:
+    """
+    Get broadcast progress with per-language counters and send rate.
+
+    Args:
+        job_id: Broadcast job ID
+        db: Database session
+
+    Returns:
+        Broadcast job progress
+    """
+    job = _found(await broadcast_manager.get(db, job_id), job_id)
+    return AdminBroadcastResponse(**broadcast_manager.snapshot(job))
+
+
+@router.post("/{job_id}/pause", response_model=AdminBroadcastResponse, dependencies=[Depends(get_admin_key)])
+async def pause_broadcast(job_id: int, db: AsyncSession = Depends(get_db)) -> AdminBroadcastResponse:
+    """
+    Pause a running broadcast; the batch in flight still completes.
+
+    Args:
+        job_id: Broadcast job ID
+        db: Database session
+
+    Returns:
+        Broadcast job progress
+    """
+    job = _found(await broadcast_manager.pause(db, job_id), job_id)
+    log.info(f"[ADMIN] Broadcast {job_id} paused")
+    return AdminBroadcastResponse(**broadcast_manager.snapshot(job))
+
+
+@router.post("/{job_id}/resume", response_model=AdminBroadcastResponse, dependencies=[Depends(get_admin_key)])
+async def resume_broadcast(job_id: int, db: AsyncSession = Depends(get_db)) -> AdminBroadcastResponse:
+    """
+    Resume a paused broadcast.
+
+    Args:
+        job_id: Broadcast job ID
+        db: Database session
+
+    Returns:
+        Broadcast job progress
+    """
+    job = _found(await broadcast_manager.resume(db, job_id), job_id)
+    log.info(f"[ADMIN] Broadcast {job_id} resumed")
+    return AdminBroadcastResponse(**broadcast_manager.snapshot(job))
+
+
+@router.post("/{job_id}/cancel", response_model=AdminBroadcastResponse, dependencies=[Depends(get_admin_key)])
+async def cancel_broadcast(job_id: int, db: AsyncSession = Depends(get_db)) -> AdminBroadcastResponse:
+    """
+    Stop a broadcast; users not reached yet are skipped.
+
+    Args:
+        job_id: Broadcast job ID
+        db: Database session
+
+    Returns:
+        Broadcast job progress
+    """
+    job = _found(await broadcast_manager.cancel(db, job_id), job_id)
+    log.info(f"[ADMIN] Broadcast {job_id} cancelled")
+    return AdminBroadcastResponse(**broadcast_manager.snapshot(job))
@@ -0,0 +1,247 @@
+"""Admin API endpoints streaming full exports of orders, users and payments."""
+
+import csv
+import io
+import json
+import logging
+import zlib
+from collections.abc import AsyncIterator
+from datetime import datetime
+from decimal import Decimal
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.config import get_settings
+from nms.database import get_db
+from nms.models.db_models import Order, Payment, User
+from nms.api.dependencies import get_admin_key
+from nms.api.admin.orders import order_filters
+from nms.api.admin.users import user_filters
+
+log = logging.getLogger(__name__)
+router = APIRouter(prefix="/admin/export", tags=["admin-export"])
+
+ExportFormat = Literal["ndjson", "csv"]
+
+_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Encoded bytes collected before a chunk is sent (and compressed)
+_CHUNK_SIZE = 64 * 1024
+
+# zlib wbits for a gzip container
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+_FORMAT_QUERY = Query(default="ndjson", description="ndjson (one JSON object per line) or csv")
+_GZIP_QUERY = Query(default=False, description="Compress on the fly (the file gets a .gz suffix)")
+
+
+def _json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot export {type(value).__name__}")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def _encode(
+    db: AsyncSession,
+    query: Select,
+    fmt: ExportFormat,
+    compress: bool,
+    fetch_size: int,
+) -> AsyncIterator[bytes]:
+    """
+    Run query on a server-side cursor and yield encoded (optionally gzipped) chunks.
+
+    Only one fetch of rows and one chunk are held in memory at a time.
+    """
+    columns = [column.name for column in query.selected_columns]
+    compressor = zlib.compressobj(6, zlib.DEFLATED, _GZIP_WBITS) if compress else None
+    text = io.StringIO()
+    writer = csv.writer(text) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(columns)
+
+    def take() -> bytes:
+        data = text.getvalue().encode("utf-8")
+        text.seek(0)
+        text.truncate()
+        return compressor.compress(data) if compressor is not None else data
+
+    stream = await db.stream(query.execution_options(yield_per=fetch_size))
+    rows = 0
+    try:
+        async for row in stream:
+            if writer is not None:
+                writer.writerow([_csv_value(value) for value in row])
+            else:
+                text.write(json.dumps(dict(zip(columns, row)), default=_json_value, ensure_ascii=False))
+                text.write("\n")
+            rows += 1
+            if text.tell() >= _CHUNK_SIZE:
+                chunk = take()
+                if chunk:
+                    yield chunk
+        chunk = take()
+        if compressor is not None:
+            chunk += compressor.flush()
+        if chunk:
+            yield chunk
+        log.info("[EXPORT] Streamed %d rows", rows)
+    except Exception as e:
+        # Headers are already sent; the client sees a truncated file
+        log.error("[EXPORT] Export failed after %d rows: %s", rows, e)
+        raise
+    finally:
+        await stream.close()
+
+
+def _export(db: AsyncSession, entity: str, query: Select, fmt: ExportFormat, compress: bool) -> StreamingResponse:
+    filename = f"{entity}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}" + (".gz" if compress else "")
+    return StreamingResponse(
+        _encode(db, query, fmt, compress, get_settings().export_fetch_size),
+        media_type="application/gzip" if compress else _MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/orders", dependencies=[Depends(get_admin_key)])
+async def export_orders(
+    status_filter: Optional[str] = Query(default=None, description="Filter by order status"),
+    date_from: Optional[datetime] = Query(default=None, description="Filter by created_at >= date_from (ISO 8601)"),
+    date_to: Optional[datetime] = Query(default=None, description="Filter by created_at <= date_to (ISO 8601)"),
+    user_id: Optional[int] = Query(default=None, description="Filter by user ID"),
+    format: ExportFormat = _FORMAT_QUERY,
+    gzip: bool = _GZIP_QUERY,
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Stream all orders matching the list filters, ordered by ID.
+
+    Args:
+        status_filter: Optional status filter
+        date_from: Optional start of date range filter (inclusive)
+        date_to: Optional end of date range filter (inclusive)
+        user_id: Optional user filter
+        format: ndjson or csv
+        gzip: Compress the stream
+        db: Database session
+
+    Returns:
+        Streaming file download with the fields of the order list
+    """
+    query = (
+        select(
+            Order.id,
+            Order.user_id,
+            Order.service_id,
+            Order.status,
+            Payment.status.label("payment_status"),
+            Order.total_amount,
+            Order.address_text,
+            Order.scheduled_at,
+            Order.notes,
+            Order.created_at,
+            Order.updated_at,
+        )
+        .outerjoin(Payment, Payment.order_id == Order.id)
+        .where(*order_filters(status_filter, date_from, date_to, user_id))
+        .order_by(Order.id)
+    )
+    return _export(db, "orders", query, format, gzip)
+
+
+@router.get("/users", dependencies=[Depends(get_admin_key)])
+async def export_users(
+    date_from: Optional[datetime] = Query(default=None, description="Filter by created_at >= date_from (ISO 8601)"),
+    date_to: Optional[datetime] = Query(default=None, description="Filter by created_at <= date_to (ISO 8601)"),
+    q: Optional[str] = Query(default=None, description="Search by user ID (starts with)"),
+    format: ExportFormat = _FORMAT_QUERY,
+    gzip: bool = _GZIP_QUERY,
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Stream all users matching the list filters, ordered by ID.
+
+    Args:
+        date_from: Optional start of date range filter (inclusive)
+        date_to: Optional end of date range filter (inclusive)
+        q: Optional user ID prefix
+        format: ndjson or csv
+        gzip: Compress the stream
+        db: Database session
+
+    Returns:
+        Streaming file download with the fields of the user list
+    """
+    query = (
+        select(
+            User.id,
+            User.phone_number,
+            User.telegram_id,
+            User.language_code,
+            User.created_at,
+            User.updated_at,
+        )
+        .where(*user_filters(date_from, date_to, q))
+        .order_by(User.id)
+    )
+    return _export(db, "users", query, format, gzip)
+
+
+@router.get("/payments", dependencies=[Depends(get_admin_key)])
+async def export_payments(
+    status_filter: Optional[str] = Query(default=None, description="Filter by payment status"),
+    date_from: Optional[datetime] = Query(default=None, description="Filter by created_at >= date_from (ISO 8601)"),
+    date_to: Optional[datetime] = Query(default=None, description="Filter by created_at <= date_to (ISO 8601)"),
+    order_id: Optional[int] = Query(default=None, description="Filter by order ID"),
+    format: ExportFormat = _FORMAT_QUERY,
+    gzip: bool = _GZIP_QUERY,
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Stream all payments matching the filters, ordered by ID.
+
+    Checkout tokens are not exported.
+
+    Args:
+        status_filter: Optional payment status filter
+        date_from: Optional start of date range filter (inclusive)
+        date_to: Optional end of date range filter (inclusive)
+        order_id: Optional order filter
+        format: ndjson or csv
+        gzip: Compress the stream
+        db: Database session
+
+    Returns:
+        Streaming file download of payments
+    """
+    query = select(
+        Payment.id,
+        Payment.order_id,
+        Payment.amount,
+        Payment.status,
+        Payment.provider,
+        Payment.created_at,
+        Payment.updated_at,
+    ).order_by(Payment.id)
+    if status_filter:
+        query = query.where(Payment.status == status_filter)
+    if date_from is not None:
+        query = query.where(Payment.created_at >= date_from)
+    if date_to is not None:
+        query = query.where(Payment.created_at <= date_to)
+    if order_id is not None:
+        query = query.where(Payment.order_id == order_id)
+    return _export(db, "payments", query, format, gzip)
@@ -0,0 +1,105 @@
+"""Admin API endpoints for runtime monitoring (read-only)."""
+
+import logging
+from fastapi import APIRouter, Depends
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.database import engine, get_db
+from nms.models.admin import (
+    AdminPoolStatsResponse,
+    AdminInvalidationStatsResponse,
+    AdminOutboxStatsResponse,
+    AdminTelegramSendStatsResponse,
+    AdminWebhookQueueStatsResponse,
+)
+from nms.models.db_models import NotificationOutbox, PaymentWebhookInbox
+from nms.monitoring.pool import pool_snapshot
+from nms.services.invalidation import invalidation_bus
+from nms.services.notification_outbox import outbox_dispatcher
+from nms.services.telegram_notifier import send_scheduler
+from nms.services.webhook_inbox import webhook_inbox
+from nms.api.dependencies import get_admin_key
+
+log = logging.getLogger(__name__)
+router = APIRouter(prefix="/admin/monitoring", tags=["admin-monitoring"])
+
+
+@router.get("/db-pool", response_model=AdminPoolStatsResponse, dependencies=[Depends(get_admin_key)])
+async def get_db_pool_stats() -> AdminPoolStatsResponse:
+    """
+    Get live connection pool counters and checkout wait-time histogram.
+
+    Returns:
+        Pool size, checked-out/idle/overflow connections and wait times
+    """
+    return AdminPoolStatsResponse(**pool_snapshot(engine.pool))
+
+
+@router.get(
+    "/invalidation",
+    response_model=AdminInvalidationStatsResponse,
+    dependencies=[Depends(get_admin_key)],
+)
+async def get_invalidation_stats() -> AdminInvalidationStatsResponse:
+    """
+    Get cross-worker cache invalidation metrics.
+
+    Returns:
+        Bus mode (listen/poll), connection state, event counters and
+        publish-to-apply propagation latency
+    """
+    return AdminInvalidationStatsResponse(**invalidation_bus.snapshot())
+
+
+@router.get("/outbox", response_model=AdminOutboxStatsResponse, dependencies=[Depends(get_admin_key)])
+async def get_outbox_stats(db: AsyncSession = Depends(get_db)) -> AdminOutboxStatsResponse:
+    """
+    Get notification outbox backlog and dispatcher counters.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Undelivered row count and sent/failed/skipped counters of this worker
+    """
+    pending = await db.scalar(select(func.count(NotificationOutbox.id)))
+    return AdminOutboxStatsResponse(pending=pending or 0, **outbox_dispatcher.snapshot())
+
+
+@router.get(
+    "/telegram",
+    response_model=AdminTelegramSendStatsResponse,
+    dependencies=[Depends(get_admin_key)],
+)
+async def get_telegram_send_stats() -> AdminTelegramSendStatsResponse:
+    """
+    Get Telegram send scheduler metrics.
+
+    Returns:
+        Queue depth, in-flight sends, 429 count, current send rate
+        (messages per second) and queue wait-time histogram
+    """
+    return AdminTelegramSendStatsResponse(**send_scheduler.snapshot())
+
+
+@router.get(
+    "/webhooks",
+    response_model=AdminWebhookQueueStatsResponse,
+    dependencies=[Depends(get_admin_key)],
+)
+async def get_webhook_queue_stats(db: AsyncSession = Depends(get_db)) -> AdminWebhookQueueStatsResponse:
+    """
+    Get payment webhook ingestion queue backlog and worker counters.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Unprocessed webhook count, this worker's counters and the
+        ingest-to-processed lag histogram
+    """
+    pending = await db.scalar(
+        select(func.count(PaymentWebhookInbox.id)).where(PaymentWebhookInbox.processed_at.is_(None))
+    )
+    return AdminWebhookQueueStatsResponse(pending=pending or 0, **webhook_inbox.snapshot())
@@ -5,13 +5,13 @@ from datetime import datetime
 from typing import Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from nms.database import get_db
 from nms.models.db_models import User, Order, Service, OrderStatus, Payment
-from nms.config import get_settings
-from nms.services.telegram_notifier import TelegramNotifier
+from nms.services.notification_outbox import enqueue_status_notification, outbox_dispatcher
+from nms.services.stats_counters import ACTIVE_SERVICES, ORDER_STATUS_PREFIX, ORDERS, USERS, stats_counters
 from nms.models.admin import (
     AdminOrderResponse,
     AdminOrderWithUserResponse,
@@ -22,11 +22,32 @@ from nms.models.admin import (
     AdminUserResponse,
 )
 from nms.api.dependencies import get_admin_key
+from nms.api.admin.pagination import after_cursor, decode_cursor, next_cursor, order_by_key
+from nms.api.admin.totals import TotalMode, list_totals
 
 log = logging.getLogger(__name__)
 router = APIRouter(prefix="/admin/orders", tags=["admin-orders"])
 
 
+def order_filters(
+    status_filter: Optional[str],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    user_id: Optional[int],
+) -> list:
+    """WHERE clauses of the order list filters (shared with the export)."""
+    filters = []
+    if status_filter:
+        filters.append(Order.status == status_filter)
+    if date_from is not None:
+        filters.append(Order.created_at >= date_from)
+    if date_to is not None:
+        filters.append(Order.created_at <= date_to)
+    if user_id is not None:
+        filters.append(Order.user_id == user_id)
+    return filters
+
+
 @router.get("", response_model=AdminOrderListResponse, dependencies=[Depends(get_admin_key)])
 async def list_orders(
     skip: int = 0,
@@ -55,6 +76,14 @@ async def list_orders(
         default=None,
         description="Filter by user ID"
     ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="next_cursor of the previous page; switches to keyset pagination (skip is ignored)"
+    ),
+    total_mode: Optional[TotalMode] = Query(
+        default=None,
+        description="How total is computed: auto, exact, estimate or cached (default ADMIN_TOTAL_MODE)"
+    ),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -68,11 +97,14 @@ async def list_orders(
         order: Sort order (asc or desc)
         date_from: Optional start of date range filter (inclusive)
         date_to: Optional end of date range filter (inclusive)
+        cursor: Optional keyset cursor from the previous page's next_cursor
+        total_mode: Total strategy (exact, planner estimate or cached count)
         db: Database session
 
     Returns:
-        List of orders with total count
+        List of orders with total count and the cursor of the next page
     """
+    after = decode_cursor(cursor, sort_by, order) if cursor is not None else None
     try:
         # Map sort_by to actual column
         sort_columns = {
@@ -88,43 +120,24 @@ async def list_orders(
 
         sort_column = sort_columns[sort_by]
 
-        # Apply sort order
-        if order == "desc":
-            order_clause = sort_column.desc()
-        else:
-            order_clause = sort_column.asc()
-
-        # Build query with sorting
-        query = select(Order).order_by(order_clause)
+        filters = order_filters(status_filter, date_from, date_to, user_id)
 
-        if status_filter:
-            query = query.where(Order.status == status_filter)
-        if date_from is not None:
-            query = query.where(Order.created_at >= date_from)
-        if date_to is not None:
-            query = query.where(Order.created_at <= date_to)
-        if user_id is not None:
-            query = query.where(Order.user_id == user_id)
+        # Build query with sorting (id breaks ties)
+        query = order_by_key(select(Order), sort_column, Order.id, order).where(*filters)
 
         # Get total count
-        count_query = select(func.count(Order.id))
-        if status_filter:
-            count_query = count_query.where(Order.status == status_filter)
-        if date_from is not None:
-            count_query = count_query.where(Order.created_at >= date_from)
-        if date_to is not None:
-            count_query = count_query.where(Order.created_at <= date_to)
-        if user_id is not None:
-            count_query = count_query.where(Order.user_id == user_id)
-
-        count_result = await db.execute(count_query)
-        total = count_result.scalar_one()
+        total = await list_totals.count(db, Order, filters, total_mode)
 
         # Get orders with pagination (eagerly load payment)
+        if after is not None:
+            query = after_cursor(query, sort_column, Order.id, order, *after)
+        else:
+            query = query.offset(skip)
         result = await db.execute(
-            query.options(selectinload(Order.payment)).offset(skip).limit(limit)
+            query.options(selectinload(Order.payment)).limit(limit)
         )
         orders = result.scalars().all()
+        cursor_after_page = next_cursor(orders, limit, sort_by, order)
 
         order_responses = []
         for order in orders:
@@ -134,7 +147,9 @@ async def list_orders(
 
         return AdminOrderListResponse(
             orders=order_responses,
-            total=total
+            total=total.value,
+            total_exact=total.exact,
+            next_cursor=cursor_after_page,
         )
     except Exception as e:
         log.error(f"Error listing orders: {e}")
@@ -305,8 +320,7 @@ async def update_order(
             )
 
         # Track status change for notification
-        old_status = order.status
-        new_status = request.status
+        status_changed = request.status is not None and request.status != order.status
 
         # Update fields if provided
         if request.service_id is not None:
@@ -322,14 +336,17 @@ async def update_order(
         if request.notes is not None:
             order.notes = request.notes
 
+        # Queue the Telegram push in the same transaction as the status change
+        if status_changed:
+            enqueue_status_notification(db, order)
+
         await db.commit()
         await db.refresh(order)
 
         log.info(f"[ADMIN] Order {order_id} updated")
 
-        # Send Telegram notification if status changed
-        if new_status and new_status != old_status:
-            await _notify_status_change(order, db)
+        if status_changed:
+            outbox_dispatcher.wake()
 
         return AdminOrderResponse.model_validate(order)
     except HTTPException:
@@ -388,48 +405,6 @@ async def delete_order(
         ) from e
 
 
-async def _notify_status_change(order: Order, db: AsyncSession) -> None:
-    """Send Telegram push notification about order status change."""
-    try:
-        # Load user and service for notification details
-        user_result = await db.execute(
-            select(User).where(User.id == order.user_id)
-        )
-        user = user_result.scalar_one_or_none()
-        if not user or not user.telegram_id:
-            log.info("[ADMIN] No telegram_id for user %s, skipping push", order.user_id)
-            return
-
-        svc_result = await db.execute(
-            select(Service).where(Service.id == order.service_id)
-        )
-        service = svc_result.scalar_one_or_none()
-        service_name = service.name if service else "—"
-
-        settings = get_settings()
-        notifier = TelegramNotifier(settings.telegram_bot_token)
-        delivered = await notifier.notify_order_status(
-            telegram_id=user.telegram_id,
-            order_id=order.id,
-            service_name=service_name,
-            total_amount=order.total_amount,
-            new_status=order.status,
-            language_code=user.language_code,
-        )
-
-        if delivered:
-            order.notified_status = order.status
-            await db.commit()
-            log.info("[ADMIN] Push notification delivered for order #%s", order.id)
-        else:
-            log.info(
-                "[ADMIN] Push failed for order #%s, user will be notified on next visit",
-                order.id,
-            )
-    except Exception as e:
-        log.error("[ADMIN] Notification error for order #%s: %s", order.id, e)
-
-
 # Statistics endpoint
 stats_router = APIRouter(prefix="/admin", tags=["admin-stats"])
 
@@ -439,6 +414,9 @@ async def get_stats(db: AsyncSession = Depends(get_db)):
     """
     Get database statistics.
 
+    Reads the stats_counters table (one query) instead of counting the
+    tables; see nms.services.stats_counters.
+
     Args:
         db: Database session
 
@@ -446,32 +424,17 @@ async def get_stats(db: AsyncSession = Depends(get_db)):
         Database statistics
     """
     try:
-        # Total users
-        users_count = await db.execute(select(func.count(User.id)))
-        total_users = users_count.scalar_one()
-
-        # Total orders
-        orders_count = await db.execute(select(func.count(Order.id)))
-        total_orders = orders_count.scalar_one()
-
-        # Total active services
-        services_count = await db.execute(
-            select(func.count(Service.id)).where(Service.is_active == True)
-        )
-        total_services = services_count.scalar_one()
-
-        # Orders by status
-        status_result = await db.execute(
-            select(Order.status, func.count(Order.id))
-            .group_by(Order.status)
-        )
-        orders_by_status = {status: count for status, count in status_result.all()}
+        counters = await stats_counters.read(db)
 
         return AdminStatsResponse(
-            total_users=total_users,
-            total_orders=total_orders,
-            total_services=total_services,
-            orders_by_status=orders_by_status
+            total_users=counters.get(USERS, 0),
+            total_orders=counters.get(ORDERS, 0),
+            total_services=counters.get(ACTIVE_SERVICES, 0),
+            orders_by_status={
+                name.removeprefix(ORDER_STATUS_PREFIX): count
+                for name, count in counters.items()
+                if name.startswith(ORDER_STATUS_PREFIX) and count
+            },
         )
     except Exception as e:
         log.error(f"Error getting stats: {e}")
@@ -0,0 +1,127 @@
+"""Keyset (cursor) pagination shared by the admin list endpoints."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Literal, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, or_, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+        raise ValueError("unknown cursor value type")
+    return value
+
+
+def encode_cursor(sort_by: str, order: str, value: Any, row_id: int) -> str:
+    """Opaque cursor pointing just past the row with this sort value and id."""
+    payload = json.dumps(
+        {"s": sort_by, "o": order, "v": _dump_value(value), "id": row_id},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, order: str) -> tuple[Any, int]:
+    """
+    Decode a cursor into (sort value, id).
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or was issued for a
+            different sort_by/order
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["s"] != sort_by or payload["o"] != order:
+            raise ValueError("cursor was issued for a different sort")
+        return _load_value(payload["v"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {e}",
+        ) from e
+
+
+def order_by_key(
+    query: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    order: Literal["asc", "desc"],
+) -> Select:
+    """
+    Order by the sort column with the id as tie-breaker.
+
+    NULLs sort last ascending and first descending (PostgreSQL's default),
+    so a (sort_column, id) index serves both directions.
+    """
+    if sort_column is id_column:
+        return query.order_by(id_column.desc() if order == "desc" else id_column.asc())
+    if order == "desc":
+        return query.order_by(sort_column.desc().nulls_first(), id_column.desc())
+    return query.order_by(sort_column.asc().nulls_last(), id_column.asc())
+
+
+def after_cursor(
+    query: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    order: Literal["asc", "desc"],
+    value: Any,
+    row_id: int,
+) -> Select:
+    """Restrict the query to rows after (value, row_id) in order_by_key order."""
+    desc = order == "desc"
+    if sort_column is id_column:
+        return query.where(id_column < row_id if desc else id_column > row_id)
+
+    if not sort_column.nullable:
+        # Row-value comparison: an index range scan on (sort_column, id)
+        key, bound = tuple_(sort_column, id_column), tuple_(value, row_id)
+        return query.where(key < bound if desc else key > bound)
+
+    if value is None:
+        tail = and_(sort_column.is_(None), id_column < row_id if desc else id_column > row_id)
+        # Descending, the NULL group comes first and every non-NULL row follows it
+        return query.where(or_(tail, sort_column.is_not(None)) if desc else tail)
+    if desc:
+        return query.where(
+            or_(sort_column < value, and_(sort_column == value, id_column < row_id))
+        )
+    return query.where(
+        or_(
+            sort_column > value,
+            and_(sort_column == value, id_column > row_id),
+            sort_column.is_(None),
+        )
+    )
+
+
+def next_cursor(
+    rows: list,
+    limit: int,
+    sort_by: str,
+    order: str,
+) -> Optional[str]:
+    """Cursor for the page after rows, or None if this was the last page."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(sort_by, order, getattr(last, sort_by), last.id)
@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 
 from nms.database import get_db
 from nms.models.db_models import Service
@@ -13,15 +13,18 @@ from nms.models.service import (
     ServiceResponse,
     ServiceCreateRequest,
     ServiceUpdateRequest,
-    ServiceListResponse,
 )
+from nms.models.admin import AdminServiceListResponse
 from nms.api.dependencies import get_admin_key
+from nms.api.admin.pagination import after_cursor, decode_cursor, next_cursor, order_by_key
+from nms.api.admin.totals import TotalMode, list_totals
+from nms.services.invalidation import invalidation_bus
 
 log = logging.getLogger(__name__)
 router = APIRouter(prefix="/admin/services", tags=["admin-services"])
 
 
-@router.get("", response_model=ServiceListResponse, dependencies=[Depends(get_admin_key)])
+@router.get("", response_model=AdminServiceListResponse, dependencies=[Depends(get_admin_key)])
 async def list_services(
     skip: int = 0,
     limit: int = 100,
@@ -42,8 +45,16 @@ async def list_services(
         default=None,
         description="Filter by created_at <= date_to (ISO 8601)"
     ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="next_cursor of the previous page; switches to keyset pagination (skip is ignored)"
+    ),
+    total_mode: Optional[TotalMode] = Query(
+        default=None,
+        description="How total is computed: auto, exact, estimate or cached (default ADMIN_TOTAL_MODE)"
+    ),
     db: AsyncSession = Depends(get_db),
-) -> ServiceListResponse:
+) -> AdminServiceListResponse:
     """
     Get list of all services (including inactive by default).
 
@@ -53,11 +64,14 @@ async def list_services(
         include_inactive: If True, include inactive services (default True for admin)
         sort_by: Field to sort by
         order: Sort order (asc or desc)
+        cursor: Optional keyset cursor from the previous page's next_cursor
+        total_mode: Total strategy (exact, planner estimate or cached count)
         db: Database session
 
     Returns:
-        List of services with total count
+        List of services with total count and the cursor of the next page
     """
+    after = decode_cursor(cursor, sort_by, order) if cursor is not None else None
     try:
         sort_columns = {
             "id": Service.id,
@@ -70,37 +84,30 @@ async def list_services(
 
         sort_column = sort_columns[sort_by]
 
-        if order == "desc":
-            order_clause = sort_column.desc()
-        else:
-            order_clause = sort_column.asc()
-
-        query = select(Service).order_by(order_clause)
-
+        filters = []
         if not include_inactive:
-            query = query.where(Service.is_active == True)
+            filters.append(Service.is_active == True)
         if date_from is not None:
-            query = query.where(Service.created_at >= date_from)
+            filters.append(Service.created_at >= date_from)
         if date_to is not None:
-            query = query.where(Service.created_at <= date_to)
+            filters.append(Service.created_at <= date_to)
 
-        count_query = select(func.count(Service.id))
-        if not include_inactive:
-            count_query = count_query.where(Service.is_active == True)
-        if date_from is not None:
-            count_query = count_query.where(Service.created_at >= date_from)
-        if date_to is not None:
-            count_query = count_query.where(Service.created_at <= date_to)
+        query = order_by_key(select(Service), sort_column, Service.id, order).where(*filters)
 
-        count_result = await db.execute(count_query)
-        total = count_result.scalar_one()
+        total = await list_totals.count(db, Service, filters, total_mode)
 
-        result = await db.execute(query.offset(skip).limit(limit))
+        if after is not None:
+            query = after_cursor(query, sort_column, Service.id, order, *after)
+        else:
+            query = query.offset(skip)
+        result = await db.execute(query.limit(limit))
         services = result.scalars().all()
 
-        return ServiceListResponse(
+        return AdminServiceListResponse(
             services=[ServiceResponse.model_validate(s) for s in services],
-            total=total,
+            total=total.value,
+            total_exact=total.exact,
+            next_cursor=next_cursor(services, limit, sort_by, order),
         )
     except Exception as e:
         log.error(f"Error listing services: {e}")
@@ -170,7 +177,8 @@ async def create_service(
             is_active=request.is_active,
         )
         db.add(service)
-        await db.commit()
+        await db.flush()
+        await invalidation_bus.commit_and_publish(db, "services", service.id)
         await db.refresh(service)
 
         log.info(f"[ADMIN] Created service: {service.id} - {service.name}")
@@ -215,7 +223,7 @@ async def update_service(
         for field, value in update_data.items():
             setattr(service, field, value)
 
-        await db.commit()
+        await invalidation_bus.commit_and_publish(db, "services", service.id)
         await db.refresh(service)
 
         log.info(f"[ADMIN] Updated service: {service.id} - {service.name}")
@@ -254,7 +262,7 @@ async def deactivate_service(
             )
 
         service.is_active = False
-        await db.commit()
+        await invalidation_bus.commit_and_publish(db, "services", service.id)
 
         log.info(f"[ADMIN] Deactivated service: {service.id} - {service.name}")
     except HTTPException:
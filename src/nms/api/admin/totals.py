@@ -0,0 +1,139 @@
+"""Total-count strategies for the admin list endpoints."""
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+from sqlalchemy import ColumnElement, func, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.config import get_settings
+
+log = logging.getLogger(__name__)
+
+TotalMode = Literal["auto", "exact", "estimate", "cached"]
+
+
+@dataclass(frozen=True, slots=True)
+class Total:
+    """A list total and whether it is an exact, current count."""
+
+    value: int
+    exact: bool
+
+
+class ListTotals:
+    """
+    Computes `total` for paginated admin lists.
+
+    Modes:
+        exact: SELECT count(*) with the list filters.
+        estimate: the planner's row estimate, from pg_class.reltuples for an
+            unfiltered table and from EXPLAIN for a filtered one. Only
+            PostgreSQL has one; other dialects count exactly.
+        cached: an exact count reused for `ttl` seconds per table and filter
+            set. A reused count is reported as not exact.
+        auto: the estimate, unless it is below `exact_threshold` rows, where
+            counting is cheap and estimates are least accurate. A table whose
+            reltuples is already below the threshold is counted without an
+            EXPLAIN, since no filter can match more rows than the table has.
+    """
+
+    def __init__(
+        self,
+        mode: TotalMode = "exact",
+        ttl: float = 30.0,
+        exact_threshold: int = 10_000,
+        max_entries: int = 1024,
+    ) -> None:
+        self.mode = mode
+        self.ttl = ttl
+        self.exact_threshold = exact_threshold
+        self.max_entries = max_entries
+        self._cache: dict[tuple, tuple[float, int]] = {}
+
+    async def count(
+        self,
+        db: AsyncSession,
+        model: type,
+        filters: list[ColumnElement],
+        mode: Optional[TotalMode] = None,
+    ) -> Total:
+        """Total rows of model matching filters, computed per mode (default self.mode)."""
+        mode = mode or self.mode
+        count_query = select(func.count()).select_from(model).where(*filters)
+
+        if mode == "cached":
+            return await self._cached(db, count_query)
+        if mode in ("estimate", "auto"):
+            estimate = await self._estimate(db, model, filters, mode)
+            if estimate is not None and (mode == "estimate" or estimate >= self.exact_threshold):
+                return Total(estimate, exact=False)
+        return Total((await db.execute(count_query)).scalar_one(), exact=True)
+
+    def clear(self) -> None:
+        """Forget all cached totals."""
+        self._cache.clear()
+
+    async def _cached(self, db: AsyncSession, count_query) -> Total:
+        compiled = count_query.compile()
+        key = (str(compiled), tuple(sorted(compiled.params.items())))
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] > now:
+            return Total(entry[1], exact=False)
+
+        value = (await db.execute(count_query)).scalar_one()
+        self._cache.pop(key, None)
+        self._cache[key] = (now + self.ttl, value)
+        if len(self._cache) > self.max_entries:
+            self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+            while len(self._cache) > self.max_entries:
+                # Oldest insertion first
+                del self._cache[next(iter(self._cache))]
+        return Total(value, exact=True)
+
+    async def _estimate(
+        self, db: AsyncSession, model: type, filters: list[ColumnElement], mode: TotalMode
+    ) -> Optional[int]:
+        """Planner row estimate, or None where there is none (or auto mode will count anyway)."""
+        dialect = db.bind.dialect
+        if dialect.name != "postgresql":
+            return None
+        try:
+            # A savepoint keeps a failed estimate from aborting the request's transaction
+            async with db.begin_nested():
+                if not filters or mode == "auto":
+                    result = await db.execute(
+                        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+                        {"table": model.__tablename__},
+                    )
+                    rows = result.scalar_one_or_none()
+                    # -1 until the table has been vacuumed or analyzed
+                    rows = rows if rows is not None and rows >= 0 else None
+                    if not filters:
+                        return rows
+                    if rows is not None and rows < self.exact_threshold:
+                        return None  # small table: the exact count is cheap
+
+                query = select(literal_column("1")).select_from(model).where(*filters)
+                sql = query.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+                conn = await db.connection()
+                result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+                plan = result.scalar_one()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return int(plan[0]["Plan"]["Plan Rows"])
+        except Exception as e:
+            log.warning("[ADMIN] Row estimate for %s failed, counting exactly: %s", model.__tablename__, e)
+            return None
+
+
+_settings = get_settings()
+list_totals = ListTotals(
+    mode=_settings.admin_total_mode,
+    ttl=_settings.admin_total_cache_ttl,
+    exact_threshold=_settings.admin_total_exact_threshold,
+)
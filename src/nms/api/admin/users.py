@@ -18,11 +18,26 @@ from nms.models.admin import (
     AdminOrderResponse,
 )
 from nms.api.dependencies import get_admin_key
+from nms.api.admin.pagination import after_cursor, decode_cursor, next_cursor, order_by_key
+from nms.api.admin.totals import TotalMode, list_totals
+from nms.services.invalidation import invalidation_bus
 
 log = logging.getLogger(__name__)
 router = APIRouter(prefix="/admin/users", tags=["admin-users"])
 
 
+def user_filters(date_from: Optional[datetime], date_to: Optional[datetime], q: Optional[str]) -> list:
+    """WHERE clauses of the user list filters (shared with the export)."""
+    filters = []
+    if date_from is not None:
+        filters.append(User.created_at >= date_from)
+    if date_to is not None:
+        filters.append(User.created_at <= date_to)
+    if q is not None:
+        filters.append(cast(User.id, String).startswith(q))
+    return filters
+
+
 @router.get("", response_model=AdminUserListResponse, dependencies=[Depends(get_admin_key)])
 async def list_users(
     skip: int = 0,
@@ -47,6 +62,14 @@ async def list_users(
         default=None,
         description="Search by user ID (starts with)"
     ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="next_cursor of the previous page; switches to keyset pagination (skip is ignored)"
+    ),
+    total_mode: Optional[TotalMode] = Query(
+        default=None,
+        description="How total is computed: auto, exact, estimate or cached (default ADMIN_TOTAL_MODE)"
+    ),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -59,22 +82,19 @@ async def list_users(
         order: Sort order (asc or desc)
         date_from: Optional start of date range filter (inclusive)
         date_to: Optional end of date range filter (inclusive)
+        cursor: Optional keyset cursor from the previous page's next_cursor
+        total_mode: Total strategy (exact, planner estimate or cached count)
         db: Database session
 
     Returns:
-        List of users with total count
+        List of users with total count and the cursor of the next page
     """
+    after = decode_cursor(cursor, sort_by, order) if cursor is not None else None
     try:
+        filters = user_filters(date_from, date_to, q)
+
         # Get total count
-        count_query = select(func.count(User.id))
-        if date_from is not None:
-            count_query = count_query.where(User.created_at >= date_from)
-        if date_to is not None:
-            count_query = count_query.where(User.created_at <= date_to)
-        if q is not None:
-            count_query = count_query.where(cast(User.id, String).startswith(q))
-        count_result = await db.execute(count_query)
-        total = count_result.scalar_one()
+        total = await list_totals.count(db, User, filters, total_mode)
 
         # Map sort_by to actual column
         sort_columns = {
@@ -88,30 +108,20 @@ async def list_users(
 
         sort_column = sort_columns[sort_by]
 
-        # Apply sort order
-        if order == "desc":
-            order_clause = sort_column.desc()
+        # Get users with sorting (id breaks ties) and date filtering
+        users_query = order_by_key(select(User), sort_column, User.id, order).where(*filters)
+        if after is not None:
+            users_query = after_cursor(users_query, sort_column, User.id, order, *after)
         else:
-            order_clause = sort_column.asc()
-
-        # Get users with sorting and date filtering
-        users_query = select(User).order_by(order_clause)
-        if date_from is not None:
-            users_query = users_query.where(User.created_at >= date_from)
-        if date_to is not None:
-            users_query = users_query.where(User.created_at <= date_to)
-        if q is not None:
-            users_query = users_query.where(cast(User.id, String).startswith(q))
-        result = await db.execute(
-            users_query
-            .offset(skip)
-            .limit(limit)
-        )
+            users_query = users_query.offset(skip)
+        result = await db.execute(users_query.limit(limit))
         users = result.scalars().all()
 
         return AdminUserListResponse(
             users=[AdminUserResponse.model_validate(user) for user in users],
-            total=total
+            total=total.value,
+            total_exact=total.exact,
+            next_cursor=next_cursor(users, limit, sort_by, order),
         )
     except Exception as e:
         log.error(f"Error listing users: {e}")
@@ -156,7 +166,12 @@ async def create_user(
             language_code=request.language_code
         )
         db.add(new_user)
-        await db.commit()
+        await db.flush()
+        if new_user.telegram_id is None:
+            # Nothing is cached for it; a None key would flush every worker's cache
+            await db.commit()
+        else:
+            await invalidation_bus.commit_and_publish(db, "users", new_user.telegram_id)
         await db.refresh(new_user)
         
         log.info(f"[ADMIN] User created: ID={new_user.id}, phone={new_user.phone_number}")
@@ -241,8 +256,12 @@ async def delete_user(
         orders_count = orders_result.scalar_one()
         
         # Delete user (orders will be deleted via CASCADE)
+        telegram_id = user.telegram_id
         await db.delete(user)
-        await db.commit()
+        if telegram_id is None:
+            await db.commit()
+        else:
+            await invalidation_bus.commit_and_publish(db, "users", telegram_id)
         
         log.info(f"[ADMIN] User {user_id} deleted with {orders_count} orders")
         
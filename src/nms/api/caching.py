@@ -0,0 +1,73 @@
+"""HTTP conditional-request helpers (ETag / If-None-Match)."""
+
+import hashlib
+
+from fastapi import Header, Response, status
+
+# OpenAPI documentation of the client contract for ETag-enabled routes
+ETAG_RESPONSES: dict = {
+    200: {
+        "headers": {
+            "ETag": {
+                "description": (
+                    "Strong validator of the representation. Store it with the body "
+                    "and send it back in If-None-Match on the next request."
+                ),
+                "schema": {"type": "string"},
+            },
+        },
+    },
+    304: {
+        "description": (
+            "Not Modified: the ETag sent in If-None-Match is current. "
+            "The body is empty; reuse the cached copy."
+        ),
+        "headers": {
+            "ETag": {"description": "Current ETag (unchanged)", "schema": {"type": "string"}},
+        },
+    },
+}
+
+
+def if_none_match_header(
+    if_none_match: str | None = Header(
+        None,
+        description="ETag(s) of the cached copy; the server answers 304 if still current",
+    ),
+) -> str | None:
+    """Dependency returning the If-None-Match request header."""
+    return if_none_match
+
+
+def make_etag(*parts: object) -> str:
+    """Build a strong ETag from version components (ids, timestamps, bytes)."""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\x00")
+    return f'"{digest.hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check If-None-Match against an ETag.
+
+    Uses the weak comparison required for If-None-Match (RFC 9110 13.1.2),
+    so W/"x" matches "x"; "*" matches any current representation.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -8,13 +8,16 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import select, update, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from ..models import OrderCreateRequest, OrderResponse
-from ..models.db_models import Order, User, Service
+from ..models.db_models import Order, User, Service, UNNOTIFIED_ORDER
 from ..services.order import OrderService
+from ..services.user_resolver import telegram_user_resolver
 from ..database import get_db
 from .dependencies import get_api_key
+from ..monitoring.request_queries import query_budget
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 order_service = OrderService()
@@ -94,7 +97,7 @@ class ActiveOrdersResponse(BaseModel):
 @router.get(
     "/active",
     response_model=ActiveOrdersResponse,
-    dependencies=[Depends(get_api_key)],
+    dependencies=[Depends(get_api_key), Depends(query_budget(1))],
     summary="Get user's active orders",
 )
 async def get_active_orders(
@@ -107,36 +110,35 @@ async def get_active_orders(
     Active = status in (pending, confirmed, in_progress).
     """
     try:
-        user_result = await db.execute(
-            select(User).where(User.telegram_id == telegram_id)
-        )
-        user = user_result.scalar_one_or_none()
-        if not user:
-            return ActiveOrdersResponse()
-
+        # One statement: resolve the user by telegram_id in the join
         result = await db.execute(
-            select(Order, Service.name.label("service_name"))
+            select(
+                Order.id,
+                Order.total_amount,
+                Order.address_text,
+                Order.status,
+                Order.created_at,
+                Service.name.label("service_name"),
+            )
+            .join(User, Order.user_id == User.id)
             .outerjoin(Service, Order.service_id == Service.id)
             .where(
-                Order.user_id == user.id,
+                User.telegram_id == telegram_id,
                 Order.status.in_(_ACTIVE_STATUSES),
             )
             .order_by(Order.created_at.desc())
         )
-        rows = result.all()
-        if not rows:
-            return ActiveOrdersResponse()
 
         orders = [
             ActiveOrderDetail(
-                order_id=order.id,
-                service_name=svc_name,
-                total_amount=order.total_amount,
-                address_text=order.address_text,
-                status=order.status,
-                created_at=order.created_at,
+                order_id=row.id,
+                service_name=row.service_name,
+                total_amount=row.total_amount,
+                address_text=row.address_text,
+                status=row.status,
+                created_at=row.created_at,
             )
-            for order, svc_name in rows
+            for row in result
         ]
         return ActiveOrdersResponse(orders=orders)
     except Exception as e:
@@ -175,7 +177,7 @@ class AckRequest(BaseModel):
 @router.get(
     "/pending-notifications",
     response_model=PendingNotificationsResponse,
-    dependencies=[Depends(get_api_key)],
+    dependencies=[Depends(get_api_key), Depends(query_budget(1))],
     summary="Get pending status notifications for a user",
 )
 async def get_pending_notifications(
@@ -188,44 +190,35 @@ async def get_pending_notifications(
     The bot calls this when a user starts a conversation to show missed updates.
     """
     try:
-        # Find user by telegram_id
-        user_result = await db.execute(
-            select(User).where(User.telegram_id == telegram_id)
-        )
-        user = user_result.scalar_one_or_none()
-        if not user:
-            return PendingNotificationsResponse(notifications=[])
-
-        # Find orders with undelivered notifications
-        # notified_status IS NULL or notified_status != status
-        # Exclude 'pending' — user already knows about it from order creation
+        # One statement: resolve the user by telegram_id in the join.
+        # UNNOTIFIED_ORDER excludes 'pending' (user already saw it on creation)
+        # and matches the partial index ix_orders_unnotified.
         result = await db.execute(
-            select(Order, Service.name.label("service_name"))
-            .outerjoin(Service, Order.service_id == Service.id)
-            .where(
-                Order.user_id == user.id,
-                Order.status != "pending",
-                or_(
-                    Order.notified_status.is_(None),
-                    Order.notified_status != Order.status,
-                ),
+            select(
+                Order.id,
+                Order.total_amount,
+                Order.status,
+                Order.notified_status,
+                Order.updated_at,
+                Service.name.label("service_name"),
             )
+            .join(User, Order.user_id == User.id)
+            .outerjoin(Service, Order.service_id == Service.id)
+            .where(User.telegram_id == telegram_id, UNNOTIFIED_ORDER)
             .order_by(Order.updated_at.asc())
         )
-        rows = result.all()
-
-        notifications = []
-        for order, svc_name in rows:
-            notifications.append(
-                PendingNotification(
-                    order_id=order.id,
-                    service_name=svc_name,
-                    total_amount=order.total_amount,
-                    status=order.status,
-                    notified_status=order.notified_status,
-                    updated_at=order.updated_at,
-                )
+
+        notifications = [
+            PendingNotification(
+                order_id=row.id,
+                service_name=row.service_name,
+                total_amount=row.total_amount,
+                status=row.status,
+                notified_status=row.notified_status,
+                updated_at=row.updated_at,
             )
+            for row in result
+        ]
 
         return PendingNotificationsResponse(notifications=notifications)
     except Exception as e:
@@ -236,9 +229,21 @@ async def get_pending_notifications(
         ) from e
 
 
+def _id_in(db: AsyncSession, ids: list[int]):
+    """
+    Order.id membership filter.
+
+    On PostgreSQL uses `id = ANY(:ids)` with one array parameter, so the
+    statement text (and its prepared plan) is the same for any list size.
+    """
+    if db.bind.dialect.name == "postgresql":
+        return Order.id == any_(bindparam("order_ids", ids, type_=ARRAY(Integer)))
+    return Order.id.in_(ids)
+
+
 @router.post(
     "/notifications/ack",
-    dependencies=[Depends(get_api_key)],
+    dependencies=[Depends(get_api_key), Depends(query_budget(2))],
     summary="Acknowledge delivered notifications",
 )
 async def ack_notifications(
@@ -251,34 +256,34 @@ async def ack_notifications(
     The bot calls this after it has shown the notification messages to the user.
     """
     try:
-        # Find user
-        user_result = await db.execute(
-            select(User).where(User.telegram_id == request.telegram_id)
+        # One set-based UPDATE: user resolved by telegram_id in a subquery,
+        # only rows whose notified_status actually differs are touched
+        user_id = (
+            select(User.id)
+            .where(User.telegram_id == request.telegram_id)
+            .scalar_subquery()
         )
-        user = user_result.scalar_one_or_none()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found",
-            )
-
-        # Update notified_status for matching orders
         result = await db.execute(
-            select(Order).where(
-                Order.user_id == user.id,
-                Order.id.in_(request.order_ids),
+            update(Order)
+            .where(
+                Order.user_id == user_id,
+                _id_in(db, request.order_ids),
+                Order.notified_status.is_distinct_from(Order.status),
             )
+            .values(notified_status=Order.status)
+            .returning(Order.id)
+            .execution_options(synchronize_session=False)
         )
-        orders = result.scalars().all()
-
-        updated = 0
-        for order in orders:
-            if order.notified_status != order.status:
-                order.notified_status = order.status
-                updated += 1
+        updated = len(result.all())
 
         if updated:
             await db.commit()
+        elif not await telegram_user_resolver.resolve(request.telegram_id, db):
+            # Nothing updated: tell "unknown user" apart from "already acknowledged"
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
 
         return {"status": "ok", "acknowledged": updated}
     except HTTPException:
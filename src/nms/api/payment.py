@@ -3,7 +3,7 @@
 import logging
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,9 +11,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.payment import PaymentInitiateRequest, PaymentInitiateResponse, PaymentStatusResponse
 from ..models.db_models import Order, Payment
 from ..services.payment import PaymentService
+from ..services.payment_events import payment_status_watcher
 from ..database import get_db
 from ..config import get_settings
 from .dependencies import get_api_key
+from ..monitoring.request_queries import query_budget
 
 router = APIRouter(prefix="/payment", tags=["payment"])
 payment_service = PaymentService()
@@ -97,6 +99,7 @@ async def initiate_payment(
 @router.get(
     "/checkout/{payment_id}",
     response_class=HTMLResponse,
+    dependencies=[Depends(query_budget(3))],
     summary="Payment checkout page (demo emulation)",
 )
 async def checkout_page(
@@ -197,6 +200,10 @@ async def get_payment_status(
             detail=f"Payment {payment_id} not found",
         )
 
+    return _status_response(payment)
+
+
+def _status_response(payment: Payment) -> PaymentStatusResponse:
     return PaymentStatusResponse(
         payment_id=payment.id,
         order_id=payment.order_id,
@@ -206,3 +213,47 @@ async def get_payment_status(
         created_at=payment.created_at,
         updated_at=payment.updated_at,
     )
+
+
+@router.get(
+    "/status/{payment_id}/wait",
+    response_model=PaymentStatusResponse,
+    dependencies=[Depends(get_api_key), Depends(query_budget(2))],
+    summary="Wait for a payment status change (long-poll)",
+)
+async def wait_payment_status(
+    payment_id: int,
+    known_status: str = Query(
+        default="pending",
+        alias="status",
+        description="Status the client already knows; the request returns once it differs",
+    ),
+    timeout: float = Query(default=25.0, gt=0, le=60, description="Seconds to hold the request"),
+    db: AsyncSession = Depends(get_db),
+) -> PaymentStatusResponse:
+    """
+    Long-poll replacement for polling GET /payment/status/{payment_id}.
+
+    Returns at once if the payment is no longer in `status`; otherwise holds
+    the request until the payment webhook changes it (on any worker) or the
+    timeout passes, then returns the current state. While waiting the
+    request holds no DB connection and runs no queries.
+    """
+    event = payment_status_watcher.register(payment_id)
+    try:
+        payment = await payment_service.get_payment_status(payment_id, db)
+        if not payment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Payment {payment_id} not found",
+            )
+        if payment.status != known_status:
+            return _status_response(payment)
+
+        # Return the connection to the pool before sleeping
+        await db.commit()
+        if await payment_status_watcher.wait(event, timeout):
+            await db.refresh(payment)
+        return _status_response(payment)
+    finally:
+        payment_status_watcher.unregister(payment_id, event)
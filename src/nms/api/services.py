@@ -1,17 +1,18 @@
 """Service-related API endpoints (read-only, for bot/client access)."""
 
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from nms.models.service import (
     ServiceResponse,
     ServiceListResponse,
 )
-from nms.models.db_models import Service
+from nms.services.catalog import service_catalog
 from nms.database import get_db
 from nms.api.dependencies import get_api_key
+from nms.api.caching import ETAG_RESPONSES, etag_matches, if_none_match_header, not_modified
+from nms.monitoring.request_queries import query_budget
 
 router = APIRouter(prefix="/services", tags=["services"])
 log = logging.getLogger(__name__)
@@ -20,52 +21,54 @@ log = logging.getLogger(__name__)
 @router.get(
     "",
     response_model=ServiceListResponse,
-    dependencies=[Depends(get_api_key)],
+    dependencies=[Depends(get_api_key), Depends(query_budget(1))],
+    responses=ETAG_RESPONSES,
     summary="Get list of services",
 )
 async def get_services(
     include_inactive: bool = Query(False, description="Include inactive services"),
+    if_none_match: str | None = Depends(if_none_match_header),
     db: AsyncSession = Depends(get_db),
-) -> ServiceListResponse:
+) -> Response:
     """
     Get list of services.
 
+    Served from the in-process service catalog; the database is only
+    queried when the catalog is stale. Clients should cache the body with
+    its ETag and send If-None-Match; an unchanged catalog answers 304.
+
     Args:
         include_inactive: If True, include inactive services
+        if_none_match: ETag of the client's cached copy
         db: Database session
 
     Returns:
         List of services
     """
-    query = select(Service)
-    if not include_inactive:
-        query = query.where(Service.is_active == True)
-    query = query.order_by(Service.name)
-
-    result = await db.execute(query)
-    services = result.scalars().all()
-
-    return ServiceListResponse(
-        services=[ServiceResponse.model_validate(s) for s in services],
-        total=len(services),
-    )
+    cached = await service_catalog.list_response(db, include_inactive=include_inactive)
+    if etag_matches(if_none_match, cached.etag):
+        return not_modified(cached.etag)
+    return Response(content=cached.body, media_type="application/json", headers={"ETag": cached.etag})
 
 
 @router.get(
     "/{service_id}",
     response_model=ServiceResponse,
-    dependencies=[Depends(get_api_key)],
+    dependencies=[Depends(get_api_key), Depends(query_budget(1))],
+    responses=ETAG_RESPONSES,
     summary="Get service by ID",
 )
 async def get_service(
     service_id: int,
+    if_none_match: str | None = Depends(if_none_match_header),
     db: AsyncSession = Depends(get_db),
-) -> ServiceResponse:
+) -> Response:
     """
     Get service details by ID.
 
     Args:
         service_id: Service ID
+        if_none_match: ETag of the client's cached copy
         db: Database session
 
     Returns:
@@ -74,10 +77,11 @@ async def get_service(
     Raises:
         HTTPException: 404 if service not found
     """
-    result = await db.execute(select(Service).where(Service.id == service_id))
-    service = result.scalar_one_or_none()
+    cached = await service_catalog.item_response(service_id, db)
 
-    if not service:
+    if cached is None:
         raise HTTPException(status_code=404, detail="Service not found")
 
-    return ServiceResponse.model_validate(service)
+    if etag_matches(if_none_match, cached.etag):
+        return not_modified(cached.etag)
+    return Response(content=cached.body, media_type="application/json", headers={"ETag": cached.etag})
@@ -1,12 +1,14 @@
 """User-related API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from nms.models import UserRegistrationRequest, RegistrationResponse
 from nms.models.user import UserResponse, LanguageUpdateRequest, LanguageUpdateResponse
 from nms.services.auth import AuthService
 from nms.database import get_db
 from nms.api.dependencies import get_api_key
+from nms.api.caching import ETAG_RESPONSES, etag_matches, if_none_match_header, make_etag, not_modified
+from nms.monitoring.request_queries import query_budget
 
 router = APIRouter(prefix="/users", tags=["users"])
 auth_service = AuthService()
@@ -15,7 +17,7 @@ auth_service = AuthService()
 @router.post(
     "/register",
     response_model=RegistrationResponse,
-    dependencies=[Depends(get_api_key)],
+    dependencies=[Depends(get_api_key), Depends(query_budget(5))],
     summary="Register new user",
 )
 async def register_user(
@@ -43,17 +45,26 @@ async def register_user(
 @router.get(
     "/by-telegram/{telegram_id}",
     response_model=UserResponse,
-    dependencies=[Depends(get_api_key)],
+    dependencies=[Depends(get_api_key), Depends(query_budget(1))],
+    responses=ETAG_RESPONSES,
     summary="Get user by Telegram ID",
 )
 async def get_user_by_telegram_id(
-    telegram_id: int, db: AsyncSession = Depends(get_db)
-) -> UserResponse:
+    telegram_id: int,
+    response: Response,
+    if_none_match: str | None = Depends(if_none_match_header),
+    db: AsyncSession = Depends(get_db),
+) -> UserResponse | Response:
     """
     Get user by Telegram ID.
 
+    The ETag is derived from the user's id and updated_at, so a matching
+    If-None-Match is answered with 304 without serializing the user.
+
     Args:
         telegram_id: User's Telegram ID
+        response: Outgoing response (for the ETag header)
+        if_none_match: ETag of the client's cached copy
         db: Database session
 
     Returns:
@@ -67,6 +78,11 @@ async def get_user_by_telegram_id(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    etag = make_etag("user", user.id, user.updated_at.isoformat())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    response.headers["ETag"] = etag
     return UserResponse.model_validate(user)
 
 
@@ -2,14 +2,13 @@
 
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.payment import PaymeWebhookPayload
-from ..models.db_models import Order, User, Service
 from ..services.payment import PaymentService
-from ..services.telegram_notifier import TelegramNotifier
+from ..services.notification_outbox import outbox_dispatcher
+from ..services.webhook_inbox import enqueue_webhook, webhook_inbox
 from ..database import get_db
 from ..config import get_settings
 
@@ -17,6 +16,8 @@ router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 payment_service = PaymentService()
 log = logging.getLogger(__name__)
 
+settings = get_settings()
+
 
 @router.post(
     "/payme",
@@ -24,6 +25,7 @@ log = logging.getLogger(__name__)
 )
 async def payme_webhook(
     payload: PaymeWebhookPayload,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """
@@ -33,25 +35,46 @@ async def payme_webhook(
     In production: called by real Payme service after payment is processed.
 
     The endpoint validates the token, updates payment and order statuses,
-    and sends a Telegram notification to the user.
+    and queues a Telegram notification to the user. Replayed callbacks
+    (same transaction_id, or the same token and status when none is sent) return the
+    stored result without repeating the transition.
     No API key required — webhook endpoints use token-based validation.
+
+    With WEBHOOK_QUEUE enabled the raw callback is only persisted and
+    acknowledged ("accepted"); background workers process it in order per
+    order_id.
     """
+    if settings.webhook_queue:
+        try:
+            row = enqueue_webhook(db, "payme_demo", payload.order_id, await request.body())
+            await db.commit()
+        except Exception as e:
+            log.error("Webhook ingestion error: %s", e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error",
+            ) from e
+        webhook_inbox.wake()
+        return {"status": "accepted", "webhook_id": row.id}
+
     try:
-        payment = await payment_service.process_webhook(
+        result = await payment_service.process_webhook(
             order_id=payload.order_id,
             token=payload.token,
             amount=payload.amount,
             status=payload.status,
             db=db,
+            transaction_id=payload.transaction_id,
         )
 
-        # Send Telegram notification to user about payment result
-        await _notify_payment_result(payload.order_id, db)
+        if not result.replayed:
+            # The payment result push was queued with the status change; deliver it now
+            outbox_dispatcher.wake()
 
         return {
             "status": "ok",
-            "payment_id": payment.id,
-            "payment_status": payment.status,
+            "payment_id": result.payment_id,
+            "payment_status": result.payment_status,
         }
     except ValueError as e:
         log.error("Webhook validation error: %s", e)
@@ -65,45 +88,3 @@ async def payme_webhook(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
         ) from e
-
-
-async def _notify_payment_result(order_id: int, db: AsyncSession) -> None:
-    """Send Telegram push notification about payment result."""
-    try:
-        result = await db.execute(select(Order).where(Order.id == order_id))
-        order = result.scalar_one_or_none()
-        if not order:
-            return
-
-        user_result = await db.execute(select(User).where(User.id == order.user_id))
-        user = user_result.scalar_one_or_none()
-        if not user or not user.telegram_id:
-            log.info("[WEBHOOK] No telegram_id for user %s, skipping push", order.user_id)
-            return
-
-        svc_result = await db.execute(select(Service).where(Service.id == order.service_id))
-        service = svc_result.scalar_one_or_none()
-        service_name = service.name if service else "—"
-
-        settings = get_settings()
-        notifier = TelegramNotifier(settings.telegram_bot_token)
-        delivered = await notifier.notify_order_status(
-            telegram_id=user.telegram_id,
-            order_id=order.id,
-            service_name=service_name,
-            total_amount=order.total_amount,
-            new_status=order.status,
-            language_code=user.language_code,
-        )
-
-        if delivered:
-            order.notified_status = order.status
-            await db.commit()
-            log.info("[WEBHOOK] Push notification delivered for order #%s", order.id)
-        else:
-            log.info(
-                "[WEBHOOK] Push failed for order #%s, user will be notified on next visit",
-                order.id,
-            )
-    except Exception as e:
-        log.error("[WEBHOOK] Notification error for order #%s: %s", order_id, e)
@@ -2,6 +2,7 @@
 
 import json
 from functools import lru_cache
+from typing import Literal
 from pydantic import Field, BaseModel, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -35,6 +36,11 @@ class Settings(BaseSettings):
 
     # Environment
     environment: str = Field(default="development", alias="ENVIRONMENT")
+    background_services: bool = Field(
+        default=True,
+        alias="BACKGROUND_SERVICES",
+        description="Warm caches and start background workers on startup (disabled in tests)",
+    )
 
     # Database
     database_url: str = Field(
@@ -42,6 +48,89 @@ class Settings(BaseSettings):
         alias="DATABASE_URL",
     )
 
+    # Database connection pool (ignored for SQLite)
+    db_pool_size: int = Field(default=5, ge=1, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, ge=0, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(
+        default=30.0,
+        gt=0,
+        alias="DB_POOL_TIMEOUT",
+        description="Seconds to wait for a free connection before failing",
+    )
+    db_pool_recycle: int = Field(
+        default=1800,
+        alias="DB_POOL_RECYCLE",
+        description="Recycle connections older than N seconds (-1 disables)",
+    )
+    db_pool_pre_ping: bool = Field(default=True, alias="DB_POOL_PRE_PING")
+    db_statement_cache_size: int = Field(
+        default=100,
+        ge=0,
+        alias="DB_STATEMENT_CACHE_SIZE",
+        description="asyncpg prepared statement cache size (0 disables, e.g. behind pgbouncer)",
+    )
+
+    # SQL logging
+    db_echo: bool = Field(
+        default=False,
+        alias="DB_ECHO",
+        description="Log every SQL statement (debugging only, very slow)",
+    )
+    slow_query_threshold_ms: float = Field(
+        default=200.0,
+        ge=0,
+        alias="SLOW_QUERY_THRESHOLD_MS",
+        description="Log statements slower than this (0 disables)",
+    )
+    slow_query_sample_rate: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        alias="SLOW_QUERY_SAMPLE_RATE",
+        description="Fraction of all other statements to log for sampling",
+    )
+
+    # Cross-worker cache invalidation
+    invalidation_channel: str = Field(
+        default="nms_invalidation",
+        alias="INVALIDATION_CHANNEL",
+        description="PostgreSQL LISTEN/NOTIFY channel for cache invalidation events",
+    )
+    invalidation_poll_interval: float = Field(
+        default=2.0,
+        gt=0,
+        alias="INVALIDATION_POLL_INTERVAL",
+        description="Polling interval (seconds) when LISTEN/NOTIFY is unavailable",
+    )
+
+    # Telegram ID → user resolution cache
+    user_cache_size: int = Field(default=10000, ge=1, alias="USER_CACHE_SIZE")
+    user_cache_ttl: float = Field(
+        default=300.0,
+        gt=0,
+        alias="USER_CACHE_TTL",
+        description="Seconds a resolved telegram_id stays cached",
+    )
+    user_cache_negative_ttl: float = Field(
+        default=30.0,
+        gt=0,
+        alias="USER_CACHE_NEGATIVE_TTL",
+        description="Seconds an unknown telegram_id stays cached",
+    )
+
+    # Per-request query accounting
+    query_repeat_threshold: int = Field(
+        default=3,
+        ge=2,
+        alias="QUERY_REPEAT_THRESHOLD",
+        description="Warn when one statement shape repeats this often in a request (N+1)",
+    )
+    query_budget_strict: bool = Field(
+        default=False,
+        alias="QUERY_BUDGET_STRICT",
+        description="Raise instead of warn when a route exceeds its query budget (tests/CI)",
+    )
+
     # Telegram Bot (for sending notifications to users)
     telegram_bot_token: str = Field(default="", alias="TELEGRAM_BOT_TOKEN")
     telegram_bot_username: str = Field(
@@ -50,6 +139,228 @@ class Settings(BaseSettings):
         description="Bot username (without @) for building deeplinks on checkout page",
     )
 
+    telegram_api_base_url: str = Field(
+        default="https://api.telegram.org",
+        alias="TELEGRAM_API_BASE_URL",
+        description="Bot API server; point at nms.testing.telegram_stub for load tests",
+    )
+
+    # Telegram HTTP client (one pooled client per process)
+    telegram_http2: bool = Field(
+        default=False,
+        alias="TELEGRAM_HTTP2",
+        description="Use HTTP/2 to api.telegram.org (requires the 'h2' package)",
+    )
+    telegram_max_connections: int = Field(default=100, ge=1, alias="TELEGRAM_MAX_CONNECTIONS")
+    telegram_max_keepalive: int = Field(default=20, ge=0, alias="TELEGRAM_MAX_KEEPALIVE")
+    telegram_keepalive_expiry: float = Field(
+        default=60.0,
+        ge=0,
+        alias="TELEGRAM_KEEPALIVE_EXPIRY",
+        description="Seconds an idle keep-alive connection is kept open",
+    )
+    telegram_connect_timeout: float = Field(default=5.0, gt=0, alias="TELEGRAM_CONNECT_TIMEOUT")
+    telegram_read_timeout: float = Field(default=10.0, gt=0, alias="TELEGRAM_READ_TIMEOUT")
+    telegram_write_timeout: float = Field(default=5.0, gt=0, alias="TELEGRAM_WRITE_TIMEOUT")
+    telegram_pool_timeout: float = Field(
+        default=5.0,
+        gt=0,
+        alias="TELEGRAM_POOL_TIMEOUT",
+        description="Seconds to wait for a free connection from the client pool",
+    )
+    telegram_global_rate: float = Field(
+        default=30.0,
+        gt=0,
+        alias="TELEGRAM_GLOBAL_RATE",
+        description="Bot-wide sendMessage budget, messages per second",
+    )
+    telegram_chat_interval: float = Field(
+        default=1.0,
+        ge=0,
+        alias="TELEGRAM_CHAT_INTERVAL",
+        description="Minimum seconds between two messages to the same chat",
+    )
+    telegram_max_retries: int = Field(
+        default=3,
+        ge=0,
+        alias="TELEGRAM_MAX_RETRIES",
+        description="Resends after a 429 Too Many Requests before giving up",
+    )
+
+    # Notification outbox
+    outbox_batch_size: int = Field(
+        default=50,
+        ge=1,
+        alias="OUTBOX_BATCH_SIZE",
+        description="Outbox rows claimed per dispatcher transaction",
+    )
+    outbox_poll_interval: float = Field(
+        default=1.0,
+        gt=0,
+        alias="OUTBOX_POLL_INTERVAL",
+        description="Seconds between outbox scans when no local wake-up arrives",
+    )
+    outbox_lease: float = Field(
+        default=300.0,
+        gt=0,
+        alias="OUTBOX_LEASE",
+        description="Seconds a claimed batch stays reserved for its dispatcher before others may retry it",
+    )
+    outbox_retry_delay: float = Field(
+        default=5.0,
+        ge=0,
+        alias="OUTBOX_RETRY_DELAY",
+        description="Base retry delay in seconds; doubles per attempt with jitter",
+    )
+    outbox_retry_max_delay: float = Field(
+        default=3600.0,
+        ge=0,
+        alias="OUTBOX_RETRY_MAX_DELAY",
+        description="Upper bound for the backoff delay in seconds",
+    )
+    outbox_max_attempts: int = Field(
+        default=8,
+        ge=1,
+        alias="OUTBOX_MAX_ATTEMPTS",
+        description="Send attempts before a notification is dead-lettered",
+    )
+    notification_sweep_interval: float = Field(
+        default=300.0,
+        gt=0,
+        alias="NOTIFICATION_SWEEP_INTERVAL",
+        description="Seconds between sweeps for orders with a stale notified_status",
+    )
+    notification_sweep_batch_size: int = Field(
+        default=100,
+        ge=1,
+        alias="NOTIFICATION_SWEEP_BATCH_SIZE",
+        description="Maximum orders re-queued per sweep",
+    )
+    notification_sweep_grace: float = Field(
+        default=300.0,
+        ge=0,
+        alias="NOTIFICATION_SWEEP_GRACE",
+        description="Orders changed more recently than this (seconds) are left to the outbox",
+    )
+    notification_sweep_max_age: float = Field(
+        default=86400.0,
+        gt=0,
+        alias="NOTIFICATION_SWEEP_MAX_AGE",
+        description="Orders changed longer ago than this (seconds) are never re-queued",
+    )
+
+    # Broadcasts
+    broadcast_concurrency: int = Field(
+        default=30,
+        ge=1,
+        alias="BROADCAST_CONCURRENCY",
+        description="Concurrent sends per broadcast job (rate limits still apply)",
+    )
+    broadcast_fetch_size: int = Field(
+        default=500,
+        ge=1,
+        alias="BROADCAST_FETCH_SIZE",
+        description="Recipients read and recorded per broadcast batch transaction",
+    )
+    broadcast_poll_interval: float = Field(
+        default=5.0,
+        gt=0,
+        alias="BROADCAST_POLL_INTERVAL",
+        description="Seconds between scans for runnable broadcast jobs created on other workers",
+    )
+    broadcast_lease: float = Field(
+        default=300.0,
+        gt=0,
+        alias="BROADCAST_LEASE",
+        description="Seconds a worker keeps a broadcast job after its last batch before others may take it over",
+    )
+
+    # Payment webhook ingestion
+    webhook_queue: bool = Field(
+        default=False,
+        alias="WEBHOOK_QUEUE",
+        description="Persist payment webhooks and acknowledge at once; a worker pool processes them",
+    )
+    webhook_workers: int = Field(
+        default=4,
+        ge=1,
+        alias="WEBHOOK_WORKERS",
+        description="Concurrent webhook processors per app worker",
+    )
+    webhook_poll_interval: float = Field(
+        default=1.0,
+        gt=0,
+        alias="WEBHOOK_POLL_INTERVAL",
+        description="Seconds between inbox scans when no local wake-up arrives",
+    )
+    webhook_retry_delay: float = Field(
+        default=2.0,
+        ge=0,
+        alias="WEBHOOK_RETRY_DELAY",
+        description="Base retry delay in seconds; doubles per attempt with jitter",
+    )
+    webhook_max_attempts: int = Field(
+        default=5,
+        ge=1,
+        alias="WEBHOOK_MAX_ATTEMPTS",
+        description="Processing attempts before a queued webhook is given up",
+    )
+
+    # Admin list totals
+    admin_total_mode: Literal["auto", "exact", "estimate", "cached"] = Field(
+        default="exact",
+        alias="ADMIN_TOTAL_MODE",
+        description="Default total strategy of admin lists (overridable per request with total_mode)",
+    )
+    admin_total_exact_threshold: int = Field(
+        default=10_000,
+        ge=0,
+        alias="ADMIN_TOTAL_EXACT_THRESHOLD",
+        description="In auto mode, planner estimates below this many rows are replaced by an exact count",
+    )
+    admin_total_cache_ttl: float = Field(
+        default=30.0,
+        ge=0,
+        alias="ADMIN_TOTAL_CACHE_TTL",
+        description="Seconds a cached-mode total is reused per filter set",
+    )
+
+    # Admin statistics counters
+    stats_counter_slots: int = Field(
+        default=8,
+        ge=1,
+        alias="STATS_COUNTER_SLOTS",
+        description="Rows each stats counter is spread over to reduce write contention",
+    )
+    stats_reconcile_interval: float = Field(
+        default=600.0,
+        gt=0,
+        alias="STATS_RECONCILE_INTERVAL",
+        description="Seconds between recounts that repair stats counter drift",
+    )
+
+    # Admin analytics rollups
+    analytics_refresh_interval: float = Field(
+        default=60.0,
+        gt=0,
+        alias="ANALYTICS_REFRESH_INTERVAL",
+        description="Seconds between recomputations of changed analytics hours",
+    )
+    analytics_batch_hours: int = Field(
+        default=168,
+        ge=1,
+        alias="ANALYTICS_BATCH_HOURS",
+        description="Dirty hours recomputed per refresh transaction (backfill step)",
+    )
+
+    # Admin exports
+    export_fetch_size: int = Field(
+        default=1000,
+        ge=1,
+        alias="EXPORT_FETCH_SIZE",
+        description="Rows fetched per server-side cursor round trip in admin exports",
+    )
+
     # Payment
     payment_base_url: str = Field(
         default="http://localhost:8000",
@@ -3,16 +3,49 @@
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from nms.config import get_settings
+from nms.config import Settings, get_settings
+from nms.monitoring.pool import InstrumentedAsyncPool
+from nms.monitoring.queries import add_observer, install_query_timing
+from nms.monitoring.slow_query import SlowQueryLog
 
 settings = get_settings()
 
+
+def _engine_options(settings: Settings) -> dict:
+    """Build create_async_engine() keyword arguments from settings."""
+    options = {
+        "echo": settings.db_echo,
+        "future": True,
+    }
+    if settings.database_url.startswith("sqlite"):
+        # SQLite uses its own pool classes; queue pool settings do not apply
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    if "+asyncpg" in settings.database_url:
+        options["connect_args"] = {
+            "statement_cache_size": settings.db_statement_cache_size,
+        }
+    return options
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.environment == "development",
-    future=True,
+engine = create_async_engine(settings.database_url, **_engine_options(settings))
+
+# Time every statement; slow and sampled ones go to the "nms.slow_query" logger
+install_query_timing(engine)
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.slow_query_threshold_ms,
+    sample_rate=settings.slow_query_sample_rate,
 )
+add_observer(slow_query_log)
 
 # Create async session factory
 async_session_maker = async_sessionmaker(
@@ -1,5 +1,6 @@
 """Main application entry point for NMservices."""
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Depends, HTTPException, status
@@ -14,6 +15,10 @@ from nms.api.webhooks import router as webhooks_router
 from nms.api.admin.users import router as admin_users_router
 from nms.api.admin.orders import router as admin_orders_router, stats_router
 from nms.api.admin.services import router as admin_services_router
+from nms.api.admin.monitoring import router as admin_monitoring_router
+from nms.api.admin.broadcasts import router as admin_broadcasts_router
+from nms.api.admin.analytics import router as admin_analytics_router
+from nms.api.admin.export import router as admin_export_router
 from nms.api.dependencies import get_api_key
 from nms.models import (
     UserRegistrationRequest,
@@ -21,9 +26,19 @@ from nms.models import (
     OrderCreateRequest,
     OrderResponse,
 )
-from nms.database import get_db
+from nms.database import get_db, async_session_maker
+from nms.monitoring.request_context import RequestContextMiddleware
+from nms.monitoring.request_queries import QueryStatsMiddleware
 from nms.services.auth import AuthService
 from nms.services.order import OrderService
+from nms.services.catalog import service_catalog
+from nms.services.invalidation import invalidation_bus
+from nms.services.notification_outbox import outbox_dispatcher
+from nms.services.broadcast import broadcast_manager
+from nms.services.webhook_inbox import webhook_inbox
+from nms.services.stats_counters import stats_counters
+from nms.services.analytics import analytics_rollups
+from nms.services.telegram_notifier import open_http_client, close_http_client
 
 settings = get_settings()
 
@@ -37,7 +52,45 @@ def _setup_logging() -> logging.Logger:
 
 log = _setup_logging()
 
-app = FastAPI(title=settings.app_title)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm in-process caches, start background services and shared clients."""
+    open_http_client()
+    if settings.background_services:
+        await _start_background_services()
+    yield
+    await analytics_rollups.stop()
+    await stats_counters.stop()
+    await webhook_inbox.stop()
+    await broadcast_manager.stop()
+    await outbox_dispatcher.stop()
+    await invalidation_bus.stop()
+    await close_http_client()
+
+
+async def _start_background_services() -> None:
+    """Preload the catalog and start the workers that run against DATABASE_URL."""
+    try:
+        async with async_session_maker() as db:
+            await service_catalog.load(db)
+    except Exception as e:
+        # Not fatal: the catalog loads lazily on the first request
+        log.warning("Service catalog preload failed: %s", e)
+    await invalidation_bus.start(
+        async_session_maker,
+        settings.database_url,
+        poll_interval=settings.invalidation_poll_interval,
+    )
+    await outbox_dispatcher.start(async_session_maker)
+    await broadcast_manager.start(async_session_maker)
+    if settings.webhook_queue:
+        await webhook_inbox.start(async_session_maker)
+    await stats_counters.start(async_session_maker)
+    await analytics_rollups.start(async_session_maker)
+
+
+app = FastAPI(title=settings.app_title, lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -48,6 +101,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request SQL round-trip counter (Server-Timing header, N+1 and budget checks)
+app.add_middleware(
+    QueryStatsMiddleware,
+    repeat_threshold=settings.query_repeat_threshold,
+    strict=settings.query_budget_strict,
+)
+
+# Expose the current route to SQL monitoring (added last so it wraps the above)
+app.add_middleware(RequestContextMiddleware)
+
 # Mount static files
 static_dir = Path(__file__).resolve().parent / "static"
 if static_dir.exists():
@@ -77,6 +140,10 @@ app.include_router(admin_users_router)
 app.include_router(admin_orders_router)
 app.include_router(admin_services_router)
 app.include_router(stats_router)
+app.include_router(admin_monitoring_router)
+app.include_router(admin_broadcasts_router)
+app.include_router(admin_analytics_router)
+app.include_router(admin_export_router)
 
 # Service instances for legacy endpoints
 auth_service = AuthService()
@@ -5,6 +5,8 @@ from decimal import Decimal
 from typing import Optional
 from pydantic import BaseModel, Field, ConfigDict
 
+from nms.models.service import ServiceListResponse
+
 
 # User models
 class AdminUserResponse(BaseModel):
@@ -49,6 +51,8 @@ class AdminUserListResponse(BaseModel):
     
     users: list[AdminUserResponse]
     total: int
+    total_exact: bool = Field(True, description="False when total is a planner estimate or a cached count")
+    next_cursor: Optional[str] = None
 
 
 # Order models
@@ -117,6 +121,8 @@ class AdminOrderListResponse(BaseModel):
     
     orders: list[AdminOrderResponse]
     total: int
+    total_exact: bool = Field(True, description="False when total is a planner estimate or a cached count")
+    next_cursor: Optional[str] = None
 
 
 # Statistics models
@@ -127,3 +133,155 @@ class AdminStatsResponse(BaseModel):
     total_orders: int
     total_services: int
     orders_by_status: dict[str, int]
+
+
+# Service models
+class AdminServiceListResponse(ServiceListResponse):
+    """Response model for the admin list of services."""
+
+    total_exact: bool = Field(True, description="False when total is a planner estimate or a cached count")
+    next_cursor: Optional[str] = None
+
+
+# Broadcast models
+class AdminBroadcastCreateRequest(BaseModel):
+    """Request model for starting a broadcast."""
+
+    texts: dict[str, str] = Field(
+        ..., min_length=1, description="Message text per language code, e.g. {'ru': '...', 'uz': '...'}"
+    )
+    default_language: str = Field(
+        default="ru", description="Language used for users whose language has no text"
+    )
+
+
+class AdminBroadcastLanguageStats(BaseModel):
+    """Per-language broadcast progress."""
+
+    total: int
+    sent: int
+    failed: int
+    send_rate: float
+
+
+class AdminBroadcastResponse(BaseModel):
+    """Response model for broadcast job progress."""
+
+    id: int
+    status: str
+    total: int
+    sent: int
+    failed: int
+    progress: float
+    languages: dict[str, AdminBroadcastLanguageStats]
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+# Analytics models
+class AdminAnalyticsPoint(BaseModel):
+    """One time bucket of the analytics timeseries (per group_by combination)."""
+
+    bucket_start: datetime
+    service_id: Optional[int] = Field(None, description="Set when grouped by service")
+    status: Optional[str] = Field(None, description="Set when grouped by status")
+    language_code: Optional[str] = Field(None, description="Set when grouped by language")
+    order_count: int
+    amount_sum: Decimal = Field(..., description="Sum of orders.total_amount")
+    paid_count: int = Field(..., description="Orders whose payment is paid")
+
+
+class AdminAnalyticsTimeseriesResponse(BaseModel):
+    """Response model for the analytics timeseries."""
+
+    granularity: str
+    date_from: datetime = Field(..., description="Start of the first bucket")
+    date_to: datetime = Field(..., description="End of the last bucket (exclusive)")
+    group_by: list[str]
+    points: list[AdminAnalyticsPoint]
+    stale_hours: int = Field(..., description="Hours in the range still waiting to be (re)computed")
+
+
+class AdminAnalyticsBackfillResponse(BaseModel):
+    """Response model for queueing an analytics backfill."""
+
+    status: str
+    queued_hours: int
+
+
+# Monitoring models
+class AdminHistogramResponse(BaseModel):
+    """Latency histogram snapshot (milliseconds, non-cumulative buckets)."""
+
+    count: int
+    sum_ms: float
+    max_ms: float
+    avg_ms: float
+    buckets: dict[str, int]
+
+
+class AdminInvalidationStatsResponse(BaseModel):
+    """Response model for cross-worker cache invalidation metrics."""
+
+    mode: str
+    channel: str
+    origin: str
+    connected: bool
+    published: int
+    received: int
+    propagation_ms: AdminHistogramResponse
+
+
+class AdminOutboxStatsResponse(BaseModel):
+    """Response model for notification outbox dispatcher metrics."""
+
+    running: bool
+    pending: int
+    sent: int
+    failed: int
+    skipped: int
+    dead_lettered: int
+    swept: int
+    lease_lost: int
+
+
+class AdminWebhookQueueStatsResponse(BaseModel):
+    """Response model for payment webhook ingestion queue metrics."""
+
+    running: bool
+    workers: int
+    pending: int
+    processed: int
+    rejected: int
+    retried: int
+    given_up: int
+    lag_ms: AdminHistogramResponse
+
+
+class AdminTelegramSendStatsResponse(BaseModel):
+    """Response model for Telegram send scheduler metrics."""
+
+    queue_depth: int
+    in_flight: int
+    active_chats: int
+    sent: int
+    throttled: int
+    send_rate: float
+    global_rate: float
+    wait_ms: AdminHistogramResponse
+
+
+class AdminPoolStatsResponse(BaseModel):
+    """Response model for database connection pool health."""
+
+    pool_class: str
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+    timeout: float
+    checkouts: int
+    timeouts: int
+    wait_ms: AdminHistogramResponse
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, DECIMAL, Text, BigInteger, Boolean
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, DECIMAL, Text, BigInteger, Boolean, Index, UniqueConstraint, and_, literal_column
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from nms.database import Base
 
@@ -49,6 +49,13 @@ class User(Base):
         return f"<User(id={self.id}, phone={self.phone_number}, telegram_id={self.telegram_id}, lang={self.language_code})>"
 
 
+# Admin keyset pagination: ORDER BY <column>, id for each sortable column.
+# phone_number and telegram_id are unique, so their own indexes suffice.
+Index("ix_users_language_code_id", User.language_code, User.id)
+Index("ix_users_created_at_id", User.created_at, User.id)
+Index("ix_users_updated_at_id", User.updated_at, User.id)
+
+
 class Service(Base):
     """Service table model."""
 
@@ -79,15 +86,16 @@ class Order(Base):
     __tablename__ = "orders"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # user_id, status and created_at lead the composite indexes below
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     service_id = Column(Integer, ForeignKey("services.id", ondelete="SET NULL"), nullable=True, index=True)
-    status: Mapped[str] = mapped_column(String(50), nullable=False, default=OrderStatus.PENDING, index=True)
+    status: Mapped[str] = mapped_column(String(50), nullable=False, default=OrderStatus.PENDING)
     notified_status = Column(String(50), nullable=True, default=None)
     total_amount = Column(DECIMAL(10, 2), nullable=True)
     address_text = Column(Text, nullable=True)
     scheduled_at = Column(DateTime, nullable=True)
     notes = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
@@ -103,6 +111,46 @@ class Order(Base):
         return f"<Order(id={self.id}, user_id={self.user_id}, service_id={self.service_id}, status={self.status})>"
 
 
+# Orders whose status change has not been delivered to the user yet.
+# Shared by the pending-notifications query and the partial index below,
+# so the planner can prove the query matches the index predicate. The
+# constant is inlined: a bound parameter in a generic prepared plan
+# (asyncpg) cannot be matched against the index predicate.
+UNNOTIFIED_ORDER = and_(
+    Order.status != literal_column(f"'{OrderStatus.PENDING.value}'"),
+    Order.notified_status.is_distinct_from(Order.status),
+)
+
+# Bot "my orders" screen: WHERE user_id = ? AND status IN (...) ORDER BY created_at
+Index("ix_orders_user_status_created", Order.user_id, Order.status, Order.created_at)
+
+# Admin keyset pagination: ORDER BY <column>, id for each sortable column.
+# address_text is not indexed (unbounded text); it falls back to a sort.
+Index("ix_orders_user_id_id", Order.user_id, Order.id)
+Index("ix_orders_status_id", Order.status, Order.id)
+Index("ix_orders_total_amount_id", Order.total_amount, Order.id)
+Index("ix_orders_scheduled_at_id", Order.scheduled_at, Order.id)
+Index("ix_orders_created_at_id", Order.created_at, Order.id)
+Index("ix_orders_updated_at_id", Order.updated_at, Order.id)
+
+# Bot pending notifications: small partial index over unnotified orders only
+Index(
+    "ix_orders_unnotified",
+    Order.user_id,
+    Order.updated_at,
+    postgresql_where=UNNOTIFIED_ORDER,
+    sqlite_where=UNNOTIFIED_ORDER,
+)
+
+# Notification sweeper: oldest unnotified orders first, across all users
+Index(
+    "ix_orders_unnotified_updated",
+    Order.updated_at,
+    postgresql_where=UNNOTIFIED_ORDER,
+    sqlite_where=UNNOTIFIED_ORDER,
+)
+
+
 class Payment(Base):
     """Payment table model."""
 
@@ -125,3 +173,208 @@ class Payment(Base):
     def __repr__(self) -> str:
         """String representation of Payment."""
         return f"<Payment(id={self.id}, order_id={self.order_id}, status={self.status}, provider={self.provider})>"
+
+
+class PaymentWebhookDelivery(Base):
+    """Processed payment webhooks, keyed by provider transaction id (replay dedupe)."""
+
+    __tablename__ = "payment_webhook_deliveries"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    provider = Column(String(50), nullable=False)
+    transaction_id = Column(String(128), nullable=False)
+    payment_id = Column(Integer, ForeignKey("payments.id", ondelete="CASCADE"), nullable=False, index=True)
+    payment_status = Column(String(50), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("provider", "transaction_id", name="uq_payment_webhook_deliveries_transaction"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation of PaymentWebhookDelivery."""
+        return f"<PaymentWebhookDelivery(id={self.id}, provider={self.provider}, transaction_id={self.transaction_id}, payment_id={self.payment_id})>"
+
+
+class PaymentWebhookInbox(Base):
+    """Raw payment webhooks persisted for asynchronous processing (ingestion queue)."""
+
+    __tablename__ = "payment_webhook_inbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    provider = Column(String(50), nullable=False)
+    order_id = Column(Integer, nullable=False)
+    payload = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    available_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Workers look up the oldest unprocessed webhook per order
+        Index(
+            "ix_payment_webhook_inbox_pending",
+            "order_id",
+            "id",
+            postgresql_where=processed_at.is_(None),
+            sqlite_where=processed_at.is_(None),
+        ),
+    )
+
+    def __repr__(self) -> str:
+        """String representation of PaymentWebhookInbox."""
+        return f"<PaymentWebhookInbox(id={self.id}, provider={self.provider}, order_id={self.order_id}, attempts={self.attempts})>"
+
+
+class StatsCounter(Base):
+    """Incrementally maintained row counts for /admin/stats, spread over slots."""
+
+    __tablename__ = "stats_counters"
+
+    name = Column(String(100), primary_key=True)
+    # Writers pick a random slot so concurrent transactions rarely wait on one row
+    slot = Column(Integer, primary_key=True, default=0)
+    value = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        """String representation of StatsCounter."""
+        return f"<StatsCounter(name={self.name}, slot={self.slot}, value={self.value})>"
+
+
+class AnalyticsRollup(Base):
+    """Order counts and revenue per time bucket, service, status and user language."""
+
+    __tablename__ = "analytics_rollups"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    granularity = Column(String(10), nullable=False)  # "hour" or "day"
+    bucket_start = Column(DateTime, nullable=False)
+    # No foreign key: rollups keep the history of deleted services
+    service_id = Column(Integer, nullable=True)
+    status = Column(String(50), nullable=False)
+    language_code = Column(String(5), nullable=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    amount_sum = Column(DECIMAL(14, 2), nullable=False, default=0)
+    paid_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_analytics_rollups_bucket", "granularity", "bucket_start"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation of AnalyticsRollup."""
+        return f"<AnalyticsRollup(granularity={self.granularity}, bucket_start={self.bucket_start}, status={self.status}, order_count={self.order_count})>"
+
+
+class AnalyticsDirtyHour(Base):
+    """Hours whose analytics rollups must be recomputed (changed orders, backfill)."""
+
+    __tablename__ = "analytics_dirty_hours"
+
+    # Append-only: marks never update a shared row, so concurrent writers of
+    # one hour don't wait on each other. The refresh deduplicates the hours
+    # and deletes exactly the rows it read.
+    id: Mapped[int] = mapped_column(primary_key=True)
+    hour = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        """String representation of AnalyticsDirtyHour."""
+        return f"<AnalyticsDirtyHour(id={self.id}, hour={self.hour})>"
+
+
+class CacheInvalidation(Base):
+    """Cache invalidation events for the polling fallback (non-PostgreSQL)."""
+
+    __tablename__ = "cache_invalidations"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        """String representation of CacheInvalidation."""
+        return f"<CacheInvalidation(id={self.id}, payload={self.payload})>"
+
+
+class BroadcastJob(Base):
+    """Admin announcement to every Telegram user; any app worker may run or control it."""
+
+    __tablename__ = "broadcast_jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    status = Column(String(20), nullable=False, default="running")
+    texts = Column(Text, nullable=False)  # JSON: {language_code: text}
+    default_language = Column(String(5), nullable=False)
+    # Recipients are sent in users.id order; everyone up to here is done
+    last_user_id = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=True)  # counted when the job first runs
+    sent = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    languages = Column(Text, nullable=True)  # JSON: {language_code: {total, sent, failed}}
+    error = Column(Text, nullable=True)
+    # Leased by the worker sending it until then
+    locked_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Workers look for running jobs to lease
+        Index("ix_broadcast_jobs_status", "status"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation of BroadcastJob."""
+        return f"<BroadcastJob(id={self.id}, status={self.status}, last_user_id={self.last_user_id})>"
+
+
+class NotificationOutbox(Base):
+    """Order status notifications waiting to be delivered to Telegram (transactional outbox)."""
+
+    __tablename__ = "notification_outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(String(50), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    available_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Claimed by a dispatcher until then; delivered rows are deleted
+    locked_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    order = relationship("Order")
+
+    __table_args__ = (
+        # Dispatcher scans rows that are due
+        Index("ix_notification_outbox_due", "available_at"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation of NotificationOutbox."""
+        return f"<NotificationOutbox(id={self.id}, order_id={self.order_id}, status={self.status}, attempts={self.attempts})>"
+
+
+class NotificationDeadLetter(Base):
+    """Status notifications that exhausted their retries or failed permanently."""
+
+    __tablename__ = "notification_dead_letters"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String(50), nullable=False)
+    attempts = Column(Integer, nullable=False)
+    http_status = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    order = relationship("Order")
+
+    __table_args__ = (
+        # Sweeper skips (order, status) pairs that are already dead-lettered
+        Index("ix_notification_dead_letters_order_status", "order_id", "status"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation of NotificationDeadLetter."""
+        return f"<NotificationDeadLetter(id={self.id}, order_id={self.order_id}, status={self.status}, http_status={self.http_status})>"
@@ -40,3 +40,8 @@ class PaymeWebhookPayload(BaseModel):
     token: str = Field(..., description="Payment security token")
     amount: Decimal = Field(..., description="Payment amount")
     status: str = Field(..., description="Payment status: paid or failed")
+    transaction_id: str | None = Field(
+        default=None,
+        max_length=128,
+        description="Provider transaction ID; replays with the same ID return the stored result",
+    )
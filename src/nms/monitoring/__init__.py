@@ -0,0 +1 @@
+"""Runtime monitoring helpers (connection pool, queries, metrics)."""
@@ -0,0 +1,64 @@
+"""Lightweight in-process metric primitives."""
+
+import time
+from bisect import bisect_left
+from collections import deque
+
+# Default bucket upper bounds in milliseconds
+DEFAULT_BUCKETS_MS: tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    """Bucketed histogram for latency values in milliseconds (non-cumulative buckets)."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS_MS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def reset(self) -> None:
+        """Drop all recorded observations."""
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def snapshot(self) -> dict:
+        """Return a JSON-friendly view of the histogram."""
+        labels = [f"le_{b:g}" for b in self.buckets] + ["le_inf"]
+        return {
+            "count": self.count,
+            "sum_ms": round(self.total, 3),
+            "max_ms": round(self.max, 3),
+            "avg_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class RateMeter:
+    """Events per second over a sliding time window."""
+
+    def __init__(self, window: float = 10.0) -> None:
+        self.window = window
+        self._events: deque[float] = deque()
+
+    def mark(self, now: float | None = None) -> None:
+        """Record one event."""
+        self._events.append(time.monotonic() if now is None else now)
+
+    def rate(self, now: float | None = None) -> float:
+        """Events per second within the window ending now."""
+        cutoff = (time.monotonic() if now is None else now) - self.window
+        while self._events and self._events[0] < cutoff:
+            self._events.popleft()
+        return round(len(self._events) / self.window, 3)
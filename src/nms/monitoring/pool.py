@@ -0,0 +1,72 @@
+"""Instrumented connection pool for the async engine."""
+
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from nms.monitoring.metrics import Histogram
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long callers wait for a connection.
+
+    The wait time covers queueing on an exhausted pool as well as opening
+    a new (overflow) connection, i.e. everything a request pays before
+    its first statement can run.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = Histogram()
+        self.checkouts = 0
+        self.timeouts = 0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_histogram.observe((time.perf_counter() - started) * 1000)
+        self.checkouts += 1
+        return connection
+
+    def recreate(self) -> "InstrumentedAsyncPool":
+        new_pool = super().recreate()
+        # Keep collected metrics when the engine disposes/recreates the pool
+        new_pool.wait_histogram = self.wait_histogram
+        new_pool.checkouts = self.checkouts
+        new_pool.timeouts = self.timeouts
+        return new_pool
+
+
+def pool_snapshot(pool: Pool) -> dict:
+    """
+    Collect live pool counters.
+
+    Works for any pool class; wait-time metrics are only available
+    for InstrumentedAsyncPool.
+    """
+    size = pool.size() if hasattr(pool, "size") else 0
+    snapshot = {
+        "pool_class": type(pool).__name__,
+        "size": size,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else 0,
+        "idle": pool.checkedin() if hasattr(pool, "checkedin") else 0,
+        # QueuePool.overflow() starts at -size; only report real overflow connections
+        "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0,
+        "max_overflow": getattr(pool, "_max_overflow", 0),
+        "timeout": getattr(pool, "_timeout", 0.0),
+        "checkouts": 0,
+        "timeouts": 0,
+        "wait_ms": Histogram().snapshot(),
+    }
+    if isinstance(pool, InstrumentedAsyncPool):
+        snapshot["checkouts"] = pool.checkouts
+        snapshot["timeouts"] = pool.timeouts
+        snapshot["wait_ms"] = pool.wait_histogram.snapshot()
+    return snapshot
@@ -0,0 +1,105 @@
+"""SQL statement timing hooks shared by query monitors."""
+
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+log = logging.getLogger(__name__)
+
+_START_KEY = "nms_query_start"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = r"(?:\?|\$\d+|%s|%\(\w+\)s|:\w+)"
+_IN_LIST_RE = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+
+
+@dataclass(slots=True)
+class ExecutedStatement:
+    """One statement executed on a DBAPI cursor."""
+
+    statement: str
+    parameters: Any
+    executemany: bool
+    duration_ms: float
+
+
+StatementObserver = Callable[[ExecutedStatement], None]
+
+_observers: list[StatementObserver] = []
+
+
+def normalize_sql(statement: str, max_length: int = 1000) -> str:
+    """
+    Reduce a statement to its shape.
+
+    Collapses whitespace, replaces literals with '?' and folds
+    expanded IN lists, so statements differing only in values compare equal.
+    """
+    sql = _WHITESPACE_RE.sub(" ", statement).strip()
+    sql = _STRING_LITERAL_RE.sub("?", sql)
+    sql = _NUMBER_LITERAL_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(...)", sql)
+    if len(sql) > max_length:
+        sql = sql[:max_length] + "..."
+    return sql
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Describe bound parameters by type only (values are never logged)."""
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = parameter_shape(parameters[0]) if parameters else "()"
+        return f"{len(parameters)} x {first}"
+    if isinstance(parameters, dict):
+        items = ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items())
+        return "{" + items + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+def add_observer(observer: StatementObserver) -> None:
+    """Register a callback invoked after every timed statement."""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_observer(observer: StatementObserver) -> None:
+    """Unregister a statement callback."""
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+    if not _observers:
+        return
+    executed = ExecutedStatement(statement, parameters, executemany, duration_ms)
+    for observer in _observers:
+        try:
+            observer(executed)
+        except Exception as e:
+            log.error("[QUERY] Statement observer %r failed: %s", observer, e)
+
+
+def install_query_timing(engine: AsyncEngine | Engine) -> None:
+    """Attach cursor-execute timing hooks to an engine (idempotent)."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
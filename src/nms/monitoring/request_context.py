@@ -0,0 +1,39 @@
+"""Per-request context available to code running below the HTTP layer."""
+
+from contextvars import ContextVar
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_current_scope: ContextVar[Scope | None] = ContextVar("nms_current_scope", default=None)
+
+
+def current_route() -> str | None:
+    """
+    Return "METHOD /route/template" for the request being served.
+
+    Falls back to the raw path before routing has matched, and to None
+    outside of a request (startup, background tasks).
+    """
+    scope = _current_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+class RequestContextMiddleware:
+    """ASGI middleware exposing the current request scope via a context variable."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
@@ -0,0 +1,132 @@
+"""Per-request SQL round-trip accounting and N+1 detection."""
+
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from nms.monitoring.queries import ExecutedStatement, add_observer, normalize_sql
+from nms.monitoring.request_context import current_route
+
+log = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in strict mode when a route issues more statements than declared."""
+
+
+@dataclass(slots=True)
+class RequestQueryStats:
+    """SQL statements issued while serving one request."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    budget: int | None = None
+
+    def repeated_shapes(self, threshold: int) -> dict[str, int]:
+        """Statement shapes executed at least `threshold` times (likely N+1)."""
+        return {sql: n for sql, n in self.shapes.items() if n >= threshold}
+
+
+_request_stats: ContextVar[RequestQueryStats | None] = ContextVar(
+    "nms_request_query_stats", default=None
+)
+
+
+def current_query_stats() -> RequestQueryStats | None:
+    """Return statement stats for the request being served, if any."""
+    return _request_stats.get()
+
+
+def _record_statement(executed: ExecutedStatement) -> None:
+    stats = _request_stats.get()
+    if stats is None:
+        return
+    stats.count += 1
+    stats.total_ms += executed.duration_ms
+    stats.shapes[normalize_sql(executed.statement)] += 1
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Route dependency declaring the maximum number of SQL statements per request.
+
+    Usage:
+        @router.get("/x", dependencies=[Depends(query_budget(2))])
+    """
+
+    async def _declare_query_budget() -> None:
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.budget = max_queries
+
+    return _declare_query_budget
+
+
+class QueryStatsMiddleware:
+    """
+    Count statements and DB time per request.
+
+    Adds a Server-Timing header (db;dur=<ms>;desc="<n> queries"), logs
+    repeated statement shapes and checks declared query budgets. In strict
+    mode a budget overrun raises QueryBudgetExceeded so tests fail loudly.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        repeat_threshold: int = 3,
+        strict: bool = False,
+    ) -> None:
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        self.strict = strict
+        add_observer(_record_statement)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _request_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.total_ms:.2f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+
+        self._report(stats)
+
+    def _report(self, stats: RequestQueryStats) -> None:
+        if not stats.count:
+            return
+        route = current_route() or "-"
+        log.debug(
+            "[QUERY-STATS] %s: %d queries, %.1fms", route, stats.count, stats.total_ms
+        )
+
+        for sql, times in stats.repeated_shapes(self.repeat_threshold).items():
+            log.warning("[N+1] %s: statement repeated %d times: %s", route, times, sql)
+
+        if stats.budget is not None and stats.count > stats.budget:
+            message = (
+                f"{route} issued {stats.count} queries, budget is {stats.budget}"
+            )
+            if self.strict:
+                raise QueryBudgetExceeded(message)
+            log.warning("[QUERY-BUDGET] %s", message)
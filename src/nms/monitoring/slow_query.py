@@ -0,0 +1,42 @@
+"""Sampled slow-query log built on the statement timing hooks."""
+
+import logging
+import random
+
+from nms.monitoring.queries import ExecutedStatement, normalize_sql, parameter_shape
+from nms.monitoring.request_context import current_route
+
+log = logging.getLogger("nms.slow_query")
+
+
+class SlowQueryLog:
+    """
+    Log statements slower than a threshold, plus a random sample of the rest.
+
+    Register an instance with nms.monitoring.queries.add_observer().
+    """
+
+    def __init__(self, threshold_ms: float, sample_rate: float = 0.0) -> None:
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.slow_count = 0
+        self.sampled_count = 0
+
+    def __call__(self, executed: ExecutedStatement) -> None:
+        slow = self.threshold_ms > 0 and executed.duration_ms >= self.threshold_ms
+        if slow:
+            self.slow_count += 1
+        elif self.sample_rate > 0 and random.random() < self.sample_rate:
+            self.sampled_count += 1
+        else:
+            return
+
+        log.log(
+            logging.WARNING if slow else logging.INFO,
+            "[SLOW-QUERY] %s %.1fms route=%s params=%s sql=%s",
+            "slow" if slow else "sampled",
+            executed.duration_ms,
+            current_route() or "-",
+            parameter_shape(executed.parameters, executed.executemany),
+            normalize_sql(executed.statement),
+        )
@@ -0,0 +1,308 @@
+"""Hourly and daily order/revenue rollups for admin analytics."""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from sqlalchemy import DateTime, and_, case, delete, event, func, insert, inspect, literal, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from nms.config import get_settings
+from nms.models.db_models import (
+    AnalyticsDirtyHour,
+    AnalyticsRollup,
+    Order,
+    Payment,
+    PaymentStatus,
+    User,
+)
+
+log = logging.getLogger(__name__)
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+# Order columns that move an order between rollup rows
+_ROLLUP_FIELDS = ("status", "total_amount", "service_id", "user_id", "created_at")
+
+# pg_try_advisory_xact_lock key serializing refreshes across app workers
+_REFRESH_LOCK_ID = 0x414E_4C59
+
+# Rows per INSERT when marking many hours, and per DELETE of read markers
+_MARK_CHUNK = 1000
+
+
+def hour_of(moment: datetime) -> datetime:
+    """Start of the hour containing moment."""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _hour_bucket(dialect: str, column):
+    """SQL expression truncating a timestamp to the hour."""
+    if dialect == "postgresql":
+        # Inline literal: a bound 'hour' would make SELECT and GROUP BY differ
+        return func.date_trunc(literal_column("'hour'"), column)
+    return func.strftime("%Y-%m-%d %H:00:00", column)
+
+
+def _as_datetime(value) -> datetime:
+    # SQLite's strftime() buckets come back as text
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def touched_hours(session: Session) -> set[datetime]:
+    """Hours (by orders.created_at) whose rollups the pending ORM changes affect."""
+    hours = set()
+    for obj in session.new:
+        if isinstance(obj, Order):
+            if obj.created_at is None:
+                # Set now rather than by the column default, so the hour is known
+                obj.created_at = datetime.utcnow()
+            hours.add(hour_of(obj.created_at))
+    for obj in session.deleted:
+        if isinstance(obj, Order):
+            hours.add(hour_of(obj.created_at))
+    for obj in session.dirty:
+        if isinstance(obj, Order):
+            state = inspect(obj)
+            if any(state.attrs[name].history.has_changes() for name in _ROLLUP_FIELDS):
+                hours.update(hour_of(moment) for moment in state.attrs.created_at.history.deleted)
+                hours.add(hour_of(obj.created_at))
+        elif isinstance(obj, Payment) and inspect(obj).attrs.status.history.has_changes():
+            hours.add(hour_of(obj.order.created_at))
+    return hours
+
+
+def relabeled_users(session: Session) -> list[int]:
+    """IDs of users whose pending ORM changes move their orders to another language."""
+    return [
+        obj.id
+        for obj in session.dirty
+        if isinstance(obj, User)
+        and obj.id is not None
+        and inspect(obj).attrs.language_code.history.has_changes()
+    ]
+
+
+def user_hours_query(dialect: str, user_ids: Iterable[int]):
+    """Hours (by orders.created_at) with orders of the given users."""
+    return select(_hour_bucket(dialect, Order.created_at)).distinct().where(Order.user_id.in_(list(user_ids)))
+
+
+class AnalyticsRollups:
+    """
+    Maintains analytics_rollups from orders, users and payments.
+
+    Rollup rows hold order_count, amount_sum and paid_count per hour (and
+    per day) for each service, order status and user language. Changes are
+    tracked as dirty hours of orders.created_at: ORM flushes that touch an
+    order, a payment status or a user's language mark the affected hours in
+    the same transaction (see _before_flush), mark_user_orders() does so for
+    Core updates of users, and mark_range() queues a historical range.
+    Marking only appends to analytics_dirty_hours, so busy hours are not a
+    point of contention. A background refresh recomputes the newest dirty
+    hours in batches of `batch_hours`, then the days containing them from
+    the hourly rows.
+    """
+
+    def __init__(self, refresh_interval: float = 60.0, batch_hours: int = 168) -> None:
+        self.refresh_interval = refresh_interval
+        self.batch_hours = batch_hours
+        self.refreshed_hours = 0
+        self._task: asyncio.Task | None = None
+
+    @staticmethod
+    def mark(hours: Iterable[datetime]):
+        """INSERT statement queueing hours for recomputation."""
+        return insert(AnalyticsDirtyHour).values([{"hour": hour} for hour in sorted(hours)])
+
+    async def mark_user_orders(self, db: AsyncSession, user_id: int) -> None:
+        """Queue the hours with orders of a user whose language changed outside the ORM."""
+        result = await db.execute(user_hours_query(db.bind.dialect.name, [user_id]))
+        hours = {_as_datetime(hour) for hour in result.scalars()}
+        if hours:
+            await db.execute(self.mark(hours))
+
+    async def mark_range(self, db: AsyncSession, date_from: datetime | None, date_to: datetime | None) -> int:
+        """
+        Queue every hour with orders in [date_from, date_to] for recomputation (backfill).
+
+        Returns:
+            Number of hours queued
+        """
+        dialect = db.bind.dialect.name
+        query = select(_hour_bucket(dialect, Order.created_at)).distinct()
+        if date_from is not None:
+            query = query.where(Order.created_at >= date_from)
+        if date_to is not None:
+            query = query.where(Order.created_at <= date_to)
+        hours = sorted(_as_datetime(hour) for hour in (await db.execute(query)).scalars())
+        for start in range(0, len(hours), _MARK_CHUNK):
+            await db.execute(self.mark(hours[start:start + _MARK_CHUNK]))
+        await db.commit()
+        return len(hours)
+
+    async def refresh_once(self, db: AsyncSession) -> int:
+        """
+        Recompute the newest batch of dirty hours and their days.
+
+        Only the marker rows that were read are removed, so an order changed
+        while the batch runs keeps its hour queued.
+
+        Returns:
+            Number of hours recomputed
+        """
+        dialect = db.bind.dialect.name
+        if dialect == "postgresql":
+            locked = await db.execute(select(func.pg_try_advisory_xact_lock(_REFRESH_LOCK_ID)))
+            if not locked.scalar_one():
+                await db.rollback()
+                return 0  # another worker is refreshing
+
+        newest = (
+            select(AnalyticsDirtyHour.hour)
+            .distinct()
+            .order_by(AnalyticsDirtyHour.hour.desc())
+            .limit(self.batch_hours)
+        )
+        result = await db.execute(
+            select(AnalyticsDirtyHour.id, AnalyticsDirtyHour.hour).where(
+                AnalyticsDirtyHour.hour.in_(newest.scalar_subquery())
+            )
+        )
+        markers = result.all()
+        if not markers:
+            await db.rollback()
+            return 0
+        hours = sorted({hour for _, hour in markers}, reverse=True)
+
+        bucket = _hour_bucket(dialect, Order.created_at)
+        result = await db.execute(
+            select(
+                bucket,
+                Order.service_id,
+                Order.status,
+                User.language_code,
+                func.count(Order.id),
+                func.coalesce(func.sum(Order.total_amount), 0),
+                func.sum(case((Payment.status == PaymentStatus.PAID, 1), else_=0)),
+            )
+            .join(User, Order.user_id == User.id)
+            .outerjoin(Payment, Payment.order_id == Order.id)
+            .where(or_(*(and_(Order.created_at >= hour, Order.created_at < hour + HOUR) for hour in hours)))
+            .group_by(bucket, Order.service_id, Order.status, User.language_code)
+        )
+        rows = [
+            {
+                "granularity": "hour",
+                "bucket_start": _as_datetime(bucket_start),
+                "service_id": service_id,
+                "status": status,
+                "language_code": language_code,
+                "order_count": order_count,
+                "amount_sum": amount_sum,
+                "paid_count": paid_count,
+            }
+            for bucket_start, service_id, status, language_code, order_count, amount_sum, paid_count in result.all()
+        ]
+
+        await db.execute(
+            delete(AnalyticsRollup).where(
+                AnalyticsRollup.granularity == "hour", AnalyticsRollup.bucket_start.in_(hours)
+            )
+        )
+        if rows:
+            await db.execute(insert(AnalyticsRollup), rows)
+
+        days = sorted({hour.replace(hour=0) for hour in hours})
+        await db.execute(
+            delete(AnalyticsRollup).where(
+                AnalyticsRollup.granularity == "day", AnalyticsRollup.bucket_start.in_(days)
+            )
+        )
+        columns = (
+            AnalyticsRollup.service_id,
+            AnalyticsRollup.status,
+            AnalyticsRollup.language_code,
+        )
+        for day in days:
+            await db.execute(
+                insert(AnalyticsRollup).from_select(
+                    [
+                        "granularity", "bucket_start", "service_id", "status", "language_code",
+                        "order_count", "amount_sum", "paid_count",
+                    ],
+                    select(
+                        literal("day"),
+                        literal(day, DateTime),
+                        *columns,
+                        func.sum(AnalyticsRollup.order_count),
+                        func.sum(AnalyticsRollup.amount_sum),
+                        func.sum(AnalyticsRollup.paid_count),
+                    )
+                    .where(
+                        AnalyticsRollup.granularity == "hour",
+                        AnalyticsRollup.bucket_start >= day,
+                        AnalyticsRollup.bucket_start < day + DAY,
+                    )
+                    .group_by(*columns),
+                )
+            )
+
+        ids = [marker_id for marker_id, _ in markers]
+        for start in range(0, len(ids), _MARK_CHUNK):
+            await db.execute(delete(AnalyticsDirtyHour).where(AnalyticsDirtyHour.id.in_(ids[start:start + _MARK_CHUNK])))
+        await db.commit()
+        self.refreshed_hours += len(hours)
+        log.info("[ANALYTICS] Refreshed %d hours (%s .. %s)", len(hours), min(hours), max(hours))
+        return len(hours)
+
+    async def start(self, session_maker: async_sessionmaker) -> None:
+        """Start the background refresh loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(session_maker))
+
+    async def stop(self) -> None:
+        """Stop the background refresh loop; dirty hours stay queued."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self, session_maker: async_sessionmaker) -> None:
+        while True:
+            try:
+                async with session_maker() as db:
+                    refreshed = await self.refresh_once(db)
+            except Exception as e:
+                refreshed = 0
+                log.error("[ANALYTICS] Refresh failed: %s", e)
+            if refreshed >= self.batch_hours:
+                continue  # backfill in progress
+            await asyncio.sleep(self.refresh_interval)
+
+
+_settings = get_settings()
+analytics_rollups = AnalyticsRollups(
+    refresh_interval=_settings.analytics_refresh_interval,
+    batch_hours=_settings.analytics_batch_hours,
+)
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(session: Session, flush_context, instances) -> None:
+    # Marked in the flush's transaction, so a committed change is never missed
+    hours = touched_hours(session)
+    user_ids = relabeled_users(session)
+    if user_ids:
+        connection = session.connection()
+        result = connection.execute(user_hours_query(connection.dialect.name, user_ids))
+        hours.update(_as_datetime(hour) for hour in result.scalars())
+    if hours:
+        session.connection().execute(analytics_rollups.mark(hours))
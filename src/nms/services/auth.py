@@ -1,8 +1,23 @@
 """Authentication and user registration services."""
 
+from datetime import datetime
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Boolean, select, update, false, or_, literal_column
+from sqlalchemy.orm import aliased
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from nms.models.db_models import User
+from nms.services.analytics import analytics_rollups
+from nms.services.invalidation import invalidation_bus
+from nms.services.stats_counters import USERS, stats_counters
+from nms.services.user_resolver import telegram_user_resolver
+
+# Dialect-specific INSERT constructs supporting ON CONFLICT ... DO UPDATE
+_UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
 
 
 class AuthService:
@@ -38,6 +53,14 @@ class AuthService:
           then create/update user with new phone
         - Otherwise — create new user
 
+        Runs as one transaction with at most three statements: an UPDATE that
+        clears a telegram_id held by another phone, an
+        INSERT ... ON CONFLICT (phone_number) DO UPDATE ... RETURNING and, for
+        a new user, the users stats counter. SQLite needs one more, a SELECT of
+        the previous row. The conflict update only runs when telegram_id or
+        language_code differ from the stored values, so a repeated call with
+        unchanged data writes nothing (and reads the row with a SELECT).
+
         Args:
             phone: User's phone number
             db: Database session
@@ -47,59 +70,109 @@ class AuthService:
         Returns:
             User ID from database
         """
-        # 1. Check if user exists by phone (primary identifier)
-        result = await db.execute(select(User).where(User.phone_number == phone))
-        user_by_phone = result.scalar_one_or_none()
+        dialect = db.bind.dialect.name
+        insert = _UPSERT_INSERTS.get(dialect)
+        if insert is None:
+            raise NotImplementedError(f"User upsert is not supported for dialect '{dialect}'")
 
-        # 2. Check if telegram_id is already used by another user
-        user_by_telegram = None
+        # 1. telegram_id belongs to a different phone — clear it (user changed phone)
+        changed = False
         if telegram_id:
-            result = await db.execute(
-                select(User).where(User.telegram_id == telegram_id)
+            cleared = await db.execute(
+                update(User)
+                .where(User.telegram_id == telegram_id, User.phone_number != phone)
+                .values(telegram_id=None, updated_at=datetime.utcnow())
+            )
+            if cleared.rowcount:
+                changed = True
+                print(f"[DB] Cleared telegram_id {telegram_id} from previous owner (phone changed)")
+
+        # 2. Insert by phone, or update telegram_id/language_code of the existing row.
+        #    The row is only rewritten (and updated_at only moves) when a value changes.
+        now = datetime.utcnow()
+        values = {
+            "phone_number": phone,
+            "telegram_id": telegram_id,
+            "language_code": language_code,
+            "created_at": now,
+            "updated_at": now,
+        }
+        set_ = {}
+        changes = []
+        if telegram_id:
+            set_["telegram_id"] = telegram_id
+            changes.append(User.telegram_id.is_distinct_from(telegram_id))
+        if language_code:
+            set_["language_code"] = language_code
+            changes.append(User.language_code.is_distinct_from(language_code))
+        set_["updated_at"] = now
+
+        stmt = insert(User).values(**values).on_conflict_do_update(
+            index_elements=[User.phone_number], set_=set_, where=or_(*changes) if changes else false()
+        )
+        if dialect == "postgresql":
+            # xmax is 0 only for a row this statement inserted; RETURNING
+            # subqueries read the snapshot from before the statement
+            previous = aliased(User)
+            stmt = stmt.returning(
+                User,
+                literal_column("xmax = 0", Boolean),
+                select(previous.telegram_id).where(previous.phone_number == phone).scalar_subquery(),
+                select(previous.language_code).where(previous.phone_number == phone).scalar_subquery(),
             )
-            user_by_telegram = result.scalar_one_or_none()
-
-        # 3. If telegram_id belongs to a different user — clear it (user changed phone)
-        if user_by_telegram and user_by_phone and user_by_telegram.id != user_by_phone.id:
-            print(f"[DB] Clearing telegram_id {telegram_id} from user ID {user_by_telegram.id} (phone changed)")
-            user_by_telegram.telegram_id = None
-            await db.flush()
-        elif user_by_telegram and not user_by_phone:
-            # telegram_id exists but phone is new — clear old telegram_id
-            print(f"[DB] Clearing telegram_id {telegram_id} from user ID {user_by_telegram.id} (new phone)")
-            user_by_telegram.telegram_id = None
-            await db.flush()
-
-        # 4. User with this phone exists — update fields if needed
-        if user_by_phone:
-            updated = False
-            if telegram_id and user_by_phone.telegram_id != telegram_id:
-                user_by_phone.telegram_id = telegram_id
-                updated = True
-            if language_code and user_by_phone.language_code != language_code:
-                user_by_phone.language_code = language_code
-                updated = True
-            if updated:
-                await db.commit()
-                print(f"[DB] User {phone} updated: telegram_id={telegram_id}, language_code={language_code}")
+            result = await db.execute(stmt, execution_options={"populate_existing": True})
+            row = result.one_or_none()
+            if row is not None:
+                user, inserted, previous_telegram_id, previous_language_code = row
             else:
-                print(f"[DB] User {phone} already exists with ID {user_by_phone.id}")
-            return user_by_phone.id
-
-        # 5. Create new user
-        new_user = User(phone_number=phone, telegram_id=telegram_id, language_code=language_code)
-        db.add(new_user)
-        await db.commit()
-        await db.refresh(new_user)
-
-        print(f"[DB] User {phone} saved with ID {new_user.id}, telegram_id={telegram_id}, language_code={language_code}")
-        return new_user.id
+                # Nothing changed: the conflict update was skipped and returned no row
+                user = (
+                    await db.execute(
+                        select(User).where(User.phone_number == phone),
+                        execution_options={"populate_existing": True},
+                    )
+                ).scalar_one()
+                inserted = False
+                previous_telegram_id, previous_language_code = user.telegram_id, user.language_code
+        else:
+            # SQLite's RETURNING only sees new values: read the old row first
+            existing = (
+                await db.execute(
+                    select(User).where(User.phone_number == phone),
+                    execution_options={"populate_existing": True},
+                )
+            ).scalar_one_or_none()
+            inserted = existing is None
+            previous_telegram_id = existing.telegram_id if existing is not None else None
+            previous_language_code = existing.language_code if existing is not None else None
+            result = await db.execute(stmt.returning(User), execution_options={"populate_existing": True})
+            # No row when nothing changed and the conflict update was skipped
+            user = result.scalar_one_or_none() or existing
+
+        if inserted:
+            await stats_counters.add(db, {USERS: 1})
+        elif language_code and language_code != previous_language_code:
+            # The upsert bypasses the ORM flush hook: requeue the user's order hours
+            await analytics_rollups.mark_user_orders(db, user.id)
+
+        # A phone moved to a new telegram_id: the old id must stop resolving too
+        keys = [key for key in (user.telegram_id, previous_telegram_id) if key is not None]
+        # updated_at equals our timestamp only if the row was inserted or changed
+        if (changed or inserted or user.updated_at == now) and keys:
+            await invalidation_bus.commit_and_publish(db, "users", *dict.fromkeys(keys))
+        else:
+            await db.commit()
+
+        print(f"[DB] User {phone} saved with ID {user.id}, telegram_id={telegram_id}, language_code={language_code}")
+        return user.id
 
     @staticmethod
     async def get_user_by_telegram_id(telegram_id: int, db: AsyncSession) -> User | None:
         """
         Get user by Telegram ID.
 
+        Unknown telegram_ids are answered from the resolver's negative cache.
+
         Args:
             telegram_id: User's Telegram ID
             db: Database session
@@ -107,10 +180,21 @@ class AuthService:
         Returns:
             User object or None if not found
         """
+        hit, resolved = telegram_user_resolver.lookup(telegram_id)
+        if hit and resolved is None:
+            return None
+        if hit:
+            result = await db.execute(select(User).where(User.id == resolved.user_id))
+            user = result.scalar_one_or_none()
+            if user is not None and user.telegram_id == telegram_id:
+                return user
+
         result = await db.execute(
             select(User).where(User.telegram_id == telegram_id)
         )
-        return result.scalar_one_or_none()
+        user = result.scalar_one_or_none()
+        telegram_user_resolver.store(telegram_id, user)
+        return user
 
     async def register_user(
         self,
@@ -157,6 +241,9 @@ class AuthService:
             return False
 
         user.language_code = language_code
-        await db.commit()
+        if user.telegram_id is None:
+            await db.commit()
+        else:
+            await invalidation_bus.commit_and_publish(db, "users", user.telegram_id)
         print(f"[DB] User {user_id} language updated to {language_code}")
         return True
@@ -0,0 +1,355 @@
+"""Bulk localized announcements to all Telegram users."""
+
+import asyncio
+import json
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, func, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from nms.config import get_settings
+from nms.models.db_models import BroadcastJob, User
+from nms.monitoring.metrics import RateMeter
+from nms.services.telegram_notifier import TelegramNotifier
+
+log = logging.getLogger(__name__)
+
+
+class BroadcastStatus:
+    """Broadcast job lifecycle states."""
+
+    RUNNING = "running"
+    PAUSED = "paused"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+FINISHED_STATUSES = (BroadcastStatus.COMPLETED, BroadcastStatus.CANCELLED, BroadcastStatus.FAILED)
+
+
+def language_for(texts: dict[str, str], default_language: str, language_code: str | None) -> str:
+    """Text language used for a user's language_code."""
+    return language_code if language_code in texts else default_language
+
+
+class BroadcastManager:
+    """
+    Runs broadcast jobs stored in broadcast_jobs.
+
+    Jobs are rows, so any app worker can create, read, pause, resume or
+    cancel them by updating the row. Every worker runs a loop that leases
+    one running job at a time (locked_until, claimed with FOR UPDATE SKIP
+    LOCKED) and sends it in keyset batches of fetch_size recipients after
+    the job's last_user_id watermark. Each batch is read and recorded in its
+    own short transaction; no transaction or connection is held while
+    sending or while a job is paused. The status is re-read before every
+    batch, so pause and cancel take effect after the batch in flight. A job
+    whose worker stopped is picked up by another one once its lease
+    expires, from the watermark (the interrupted batch may be sent twice).
+    Sends go through the notifier, whose scheduler keeps the bot within
+    Telegram rate limits shared with order notifications.
+    """
+
+    def __init__(
+        self,
+        notifier: TelegramNotifier,
+        concurrency: int = 30,
+        fetch_size: int = 500,
+        poll_interval: float = 5.0,
+        lease: float = 300.0,
+    ) -> None:
+        self.notifier = notifier
+        self.concurrency = concurrency
+        self.fetch_size = fetch_size
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.session_maker: async_sessionmaker | None = None
+        # Send rates of the jobs this worker is sending, per language
+        self._rates: dict[int, dict[str, RateMeter]] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self, session_maker: async_sessionmaker) -> None:
+        """Start the background loop that runs jobs (not without a bot token: jobs stay queued)."""
+        self.session_maker = session_maker
+        if not self.notifier.is_configured:
+            log.warning("[BROADCAST] Bot token not configured, broadcast loop not started")
+            return
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the loop; a job in progress is resumed by another worker after its lease."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wakeup = None
+
+    def wake(self) -> None:
+        """Look for runnable jobs now instead of at the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def create(self, db: AsyncSession, texts: dict[str, str], default_language: str) -> BroadcastJob:
+        """Store a new running job; a worker picks it up in the background."""
+        job = BroadcastJob(
+            status=BroadcastStatus.RUNNING,
+            texts=json.dumps(texts, ensure_ascii=False),
+            default_language=default_language,
+        )
+        db.add(job)
+        await db.commit()
+        self.wake()
+        log.info("[BROADCAST] Job #%s created (%s languages)", job.id, len(texts))
+        return job
+
+    @staticmethod
+    async def get(db: AsyncSession, job_id: int) -> BroadcastJob | None:
+        """Job by ID, or None."""
+        return await db.get(BroadcastJob, job_id, populate_existing=True)
+
+    @staticmethod
+    async def jobs(db: AsyncSession, limit: int = 50) -> list[BroadcastJob]:
+        """Latest jobs, newest first."""
+        result = await db.execute(select(BroadcastJob).order_by(BroadcastJob.id.desc()).limit(limit))
+        return list(result.scalars().all())
+
+    async def pause(self, db: AsyncSession, job_id: int) -> BroadcastJob | None:
+        """Pause a running job."""
+        return await self._transition(db, job_id, (BroadcastStatus.RUNNING,), BroadcastStatus.PAUSED)
+
+    async def resume(self, db: AsyncSession, job_id: int) -> BroadcastJob | None:
+        """Resume a paused job."""
+        job = await self._transition(db, job_id, (BroadcastStatus.PAUSED,), BroadcastStatus.RUNNING)
+        self.wake()
+        return job
+
+    async def cancel(self, db: AsyncSession, job_id: int) -> BroadcastJob | None:
+        """Stop a job; users not reached yet are skipped."""
+        return await self._transition(
+            db,
+            job_id,
+            (BroadcastStatus.RUNNING, BroadcastStatus.PAUSED),
+            BroadcastStatus.CANCELLED,
+            finished_at=datetime.utcnow(),
+        )
+
+    async def _transition(
+        self, db: AsyncSession, job_id: int, from_statuses: tuple[str, ...], status: str, **values
+    ) -> BroadcastJob | None:
+        """Change the status of a job in one of from_statuses (other jobs are left alone)."""
+        await db.execute(
+            update(BroadcastJob)
+            .where(BroadcastJob.id == job_id, BroadcastJob.status.in_(from_statuses))
+            .values(status=status, **values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return await self.get(db, job_id)
+
+    def snapshot(self, job: BroadcastJob) -> dict:
+        """JSON-friendly progress view; send_rate is known on the worker sending the job."""
+        total = job.total or 0
+        rates = self._rates.get(job.id, {})
+        languages = json.loads(job.languages) if job.languages else {}
+        return {
+            "id": job.id,
+            "status": job.status,
+            "total": total,
+            "sent": job.sent,
+            "failed": job.failed,
+            "progress": round((job.sent + job.failed) / total, 4) if total else 0.0,
+            "languages": {
+                lang: {**counts, "send_rate": rates[lang].rate() if lang in rates else 0.0}
+                for lang, counts in languages.items()
+            },
+            "error": job.error,
+            "created_at": job.created_at,
+            "finished_at": job.finished_at,
+        }
+
+    async def run_once(self) -> bool:
+        """Lease one runnable job and send it until it finishes, pauses or is lost; False if none."""
+        now = datetime.utcnow()
+        lease = now + timedelta(seconds=self.lease)
+        async with self.session_maker() as db:
+            runnable = (
+                select(BroadcastJob.id)
+                .where(
+                    BroadcastJob.status == BroadcastStatus.RUNNING,
+                    or_(BroadcastJob.locked_until.is_(None), BroadcastJob.locked_until <= now),
+                )
+                .order_by(BroadcastJob.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(
+                update(BroadcastJob)
+                .where(BroadcastJob.id.in_(runnable.scalar_subquery()))
+                .values(locked_until=lease)
+                .returning(BroadcastJob.id)
+                .execution_options(synchronize_session=False)
+            )
+            job_id = result.scalar_one_or_none()
+            await db.commit()
+        if job_id is None:
+            return False
+
+        try:
+            while lease is not None:
+                lease = await self._run_batch(job_id, lease)
+        except Exception as e:
+            log.error("[BROADCAST] Job #%s failed: %s", job_id, e)
+            async with self.session_maker() as db:
+                await db.execute(
+                    update(BroadcastJob)
+                    .where(BroadcastJob.id == job_id, BroadcastJob.status == BroadcastStatus.RUNNING)
+                    .values(
+                        status=BroadcastStatus.FAILED,
+                        error=str(e),
+                        finished_at=datetime.utcnow(),
+                        locked_until=None,
+                    )
+                )
+                await db.commit()
+        finally:
+            self._rates.pop(job_id, None)
+        return True
+
+    async def _run_batch(self, job_id: int, lease: datetime) -> datetime | None:
+        """Send the next batch of a leased job; returns the renewed lease, or None to stop."""
+        async with self.session_maker() as db:
+            job = await self._locked(db, job_id, lease)
+            if job is None:
+                return None
+            if job.status != BroadcastStatus.RUNNING:
+                # Paused or cancelled: give the job up until it is resumed
+                job.locked_until = None
+                await db.commit()
+                return None
+
+            texts = json.loads(job.texts)
+            default_language = job.default_language
+            if job.total is None:
+                await self._count_recipients(db, job, texts)
+
+            result = await db.execute(
+                select(User.id, User.telegram_id, User.language_code)
+                .where(User.telegram_id.is_not(None), User.id > job.last_user_id)
+                .order_by(User.id)
+                .limit(self.fetch_size)
+            )
+            recipients = result.all()
+            if not recipients:
+                job.status = BroadcastStatus.COMPLETED
+                job.finished_at = datetime.utcnow()
+                job.locked_until = None
+                log.info("[BROADCAST] Job #%s completed: %s sent, %s failed", job.id, job.sent, job.failed)
+                await db.commit()
+                return None
+
+            lease = datetime.utcnow() + timedelta(seconds=self.lease)
+            job.locked_until = lease
+            await db.commit()
+
+        sent, failed = await self._send_batch(job_id, recipients, texts, default_language)
+
+        async with self.session_maker() as db:
+            job = await self._locked(db, job_id, lease)
+            if job is None:
+                return None
+            languages = json.loads(job.languages) if job.languages else {}
+            for lang in sent.keys() | failed.keys():
+                counts = languages.setdefault(lang, {"total": 0, "sent": 0, "failed": 0})
+                counts["sent"] += sent[lang]
+                counts["failed"] += failed[lang]
+            job.languages = json.dumps(languages, ensure_ascii=False)
+            job.sent += sum(sent.values())
+            job.failed += sum(failed.values())
+            job.last_user_id = recipients[-1].id
+            await db.commit()
+        return lease
+
+    async def _locked(self, db: AsyncSession, job_id: int, lease: datetime) -> BroadcastJob | None:
+        """The job row, locked for this transaction, if our lease on it still holds."""
+        result = await db.execute(
+            select(BroadcastJob).where(BroadcastJob.id == job_id).with_for_update()
+        )
+        job = result.scalar_one_or_none()
+        if job is None or job.locked_until != lease:
+            log.warning("[BROADCAST] Job #%s lease lost, leaving it to another worker", job_id)
+            await db.rollback()
+            return None
+        return job
+
+    @staticmethod
+    async def _count_recipients(db: AsyncSession, job: BroadcastJob, texts: dict[str, str]) -> None:
+        result = await db.execute(
+            select(User.language_code, func.count(User.id))
+            .where(User.telegram_id.is_not(None))
+            .group_by(User.language_code)
+        )
+        languages: dict[str, dict] = {}
+        for language_code, count in result.all():
+            lang = language_for(texts, job.default_language, language_code)
+            languages.setdefault(lang, {"total": 0, "sent": 0, "failed": 0})["total"] += count
+        job.languages = json.dumps(languages, ensure_ascii=False)
+        job.total = sum(counts["total"] for counts in languages.values())
+
+    async def _send_batch(
+        self, job_id: int, recipients: list, texts: dict[str, str], default_language: str
+    ) -> tuple[Counter, Counter]:
+        """Send one batch concurrently; returns sent and failed counts per language."""
+        slots = asyncio.Semaphore(self.concurrency)
+        rates = self._rates.setdefault(job_id, {})
+        sent: Counter = Counter()
+        failed: Counter = Counter()
+
+        async def send(telegram_id: int, lang: str) -> None:
+            async with slots:
+                result = await self.notifier.deliver(telegram_id, texts[lang])
+            if result.delivered:
+                sent[lang] += 1
+                rates.setdefault(lang, RateMeter()).mark()
+            else:
+                failed[lang] += 1
+
+        await asyncio.gather(*(
+            send(telegram_id, language_for(texts, default_language, language_code))
+            for _, telegram_id, language_code in recipients
+        ))
+        return sent, failed
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                ran = await self.run_once()
+            except Exception as e:
+                ran = False
+                log.error("[BROADCAST] Run failed: %s", e)
+            if ran:
+                continue  # another job may be waiting
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+_settings = get_settings()
+broadcast_manager = BroadcastManager(
+    TelegramNotifier(_settings.telegram_bot_token),
+    concurrency=_settings.broadcast_concurrency,
+    fetch_size=_settings.broadcast_fetch_size,
+    poll_interval=_settings.broadcast_poll_interval,
+    lease=_settings.broadcast_lease,
+)
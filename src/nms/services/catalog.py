@@ -0,0 +1,112 @@
+"""In-process cache of the service catalog."""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.api.caching import make_etag
+from nms.models.db_models import Service
+from nms.models.service import ServiceResponse, ServiceListResponse
+from nms.services.invalidation import invalidation_bus
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    """Precomputed JSON body with its strong ETag."""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_model(cls, model) -> "CachedResponse":
+        body = model.model_dump_json().encode()
+        return cls(body=body, etag=make_etag(body))
+
+
+class ServiceCatalog:
+    """
+    Versioned in-memory copy of the services table.
+
+    The catalog is small and changes only through the admin API, so bot
+    reads are served from memory. Admin writes publish a "services" event
+    on the invalidation bus (this worker and all others call invalidate());
+    the next read reloads the whole table in one query and bumps the version.
+    Serialized list/item responses and their ETags are precomputed on load.
+    """
+
+    def __init__(self) -> None:
+        self.version = 0
+        self._stale = True
+        self._invalidations = 0
+        self._lock = asyncio.Lock()
+        self._by_id: dict[int, ServiceResponse] = {}
+        self._items: dict[int, CachedResponse] = {}
+        self._lists: dict[bool, CachedResponse] = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        return not self._stale
+
+    def invalidate(self) -> None:
+        """Mark the catalog stale; it is reloaded on the next read."""
+        self._invalidations += 1
+        self._stale = True
+
+    async def load(self, db: AsyncSession) -> None:
+        """Load all services from the database and precompute responses."""
+        seen_invalidations = self._invalidations
+        result = await db.execute(select(Service).order_by(Service.name))
+        services = [ServiceResponse.model_validate(s) for s in result.scalars().all()]
+        active = [s for s in services if s.is_active]
+
+        self._by_id = {s.id: s for s in services}
+        self._items = {s.id: CachedResponse.from_model(s) for s in services}
+        self._lists = {
+            True: CachedResponse.from_model(
+                ServiceListResponse(services=services, total=len(services))
+            ),
+            False: CachedResponse.from_model(
+                ServiceListResponse(services=active, total=len(active))
+            ),
+        }
+        self.version += 1
+        # An invalidation that arrived while loading keeps the catalog stale
+        self._stale = self._invalidations != seen_invalidations
+        log.info("[CATALOG] Loaded %d services (version %d)", len(services), self.version)
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """Reload the catalog if it is stale (single reload under concurrency)."""
+        if not self._stale:
+            return
+        async with self._lock:
+            if self._stale:
+                await self.load(db)
+
+    async def get(self, service_id: int, db: AsyncSession) -> ServiceResponse | None:
+        """Get a service by ID (active or not)."""
+        await self.ensure_loaded(db)
+        return self._by_id.get(service_id)
+
+    async def get_active(self, service_id: int, db: AsyncSession) -> ServiceResponse | None:
+        """Get a service by ID if it is active."""
+        service = await self.get(service_id, db)
+        return service if service and service.is_active else None
+
+    async def item_response(self, service_id: int, db: AsyncSession) -> CachedResponse | None:
+        """Serialized ServiceResponse for a service, or None if not found."""
+        await self.ensure_loaded(db)
+        return self._items.get(service_id)
+
+    async def list_response(self, db: AsyncSession, include_inactive: bool = False) -> CachedResponse:
+        """Serialized ServiceListResponse, ordered by name."""
+        await self.ensure_loaded(db)
+        return self._lists[include_inactive]
+
+
+service_catalog = ServiceCatalog()
+invalidation_bus.subscribe("services", lambda _key: service_catalog.invalidate())
@@ -0,0 +1,208 @@
+"""Cross-worker cache invalidation bus (PostgreSQL LISTEN/NOTIFY)."""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+import asyncpg
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from nms.config import get_settings
+from nms.models.db_models import CacheInvalidation
+from nms.monitoring.metrics import Histogram
+
+log = logging.getLogger(__name__)
+
+InvalidationHandler = Callable[[Any], None]
+
+
+class InvalidationBus:
+    """
+    Publishes cache invalidation events and applies events from other workers.
+
+    On PostgreSQL events travel through pg_notify() and every worker holds
+    one dedicated asyncpg connection that LISTENs on the channel. Other
+    dialects (SQLite test runs) fall back to polling the cache_invalidations
+    table. Handlers receive the event key, or None for "invalidate everything".
+    """
+
+    def __init__(self, channel: str = "nms_invalidation") -> None:
+        self.channel = channel
+        self.origin = f"{socket.gethostname()}:{os.getpid()}"
+        self.mode = "disabled"
+        self.connected = False
+        self.published = 0
+        self.received = 0
+        self.propagation_ms = Histogram()
+        self._handlers: dict[str, list[InvalidationHandler]] = {}
+        self._task: asyncio.Task | None = None
+        self._last_seen_id = 0
+
+    def subscribe(self, topic: str, handler: InvalidationHandler) -> None:
+        """Register a handler for a topic (e.g. "services", "users")."""
+        self._handlers.setdefault(topic, []).append(handler)
+
+    def _dispatch(self, topic: str, key: Any) -> None:
+        for handler in self._handlers.get(topic, []):
+            try:
+                handler(key)
+            except Exception as e:
+                log.error("[INVALIDATION] Handler for '%s' failed: %s", topic, e)
+
+    def _dispatch_all(self) -> None:
+        for topic in self._handlers:
+            self._dispatch(topic, None)
+
+    def _payload(self, topic: str, key: Any) -> str:
+        return json.dumps(
+            {"topic": topic, "key": key, "origin": self.origin, "ts": time.time()}
+        )
+
+    def _receive(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except (TypeError, ValueError):
+            log.warning("[INVALIDATION] Malformed payload: %r", payload)
+            return
+        if event.get("origin") == self.origin:
+            return  # already applied locally on commit
+        self.received += 1
+        self.propagation_ms.observe(max(time.time() - event.get("ts", time.time()), 0) * 1000)
+        self._dispatch(event.get("topic"), event.get("key"))
+
+    async def commit_and_publish(self, db: AsyncSession, topic: str, *keys: Any) -> None:
+        """
+        Commit the session together with invalidation events.
+
+        One event is published per key; without keys, a single event with key
+        None invalidates the whole topic. Events are written in the same
+        transaction as the change, so other workers only see them once the
+        change is visible. Local handlers run right after the commit.
+        """
+        keys = keys or (None,)
+        payloads = [self._payload(topic, key) for key in keys]
+        if db.bind.dialect.name == "postgresql":
+            # One statement however many keys
+            notify = ", ".join(f"pg_notify(:channel, :payload_{i})" for i in range(len(payloads)))
+            await db.execute(
+                text(f"SELECT {notify}"),
+                {"channel": self.channel, **{f"payload_{i}": payload for i, payload in enumerate(payloads)}},
+            )
+        else:
+            db.add_all([CacheInvalidation(payload=payload) for payload in payloads])
+        await db.commit()
+        self.published += len(keys)
+        for key in keys:
+            self._dispatch(topic, key)
+
+    async def poll_once(self, db: AsyncSession) -> int:
+        """Apply events newer than the last seen one (polling fallback)."""
+        result = await db.execute(
+            select(CacheInvalidation)
+            .where(CacheInvalidation.id > self._last_seen_id)
+            .order_by(CacheInvalidation.id)
+        )
+        events = result.scalars().all()
+        for event in events:
+            self._last_seen_id = event.id
+            self._receive(event.payload)
+        return len(events)
+
+    async def start(self, session_maker: async_sessionmaker, database_url: str, poll_interval: float = 2.0) -> None:
+        """Start the listener (PostgreSQL) or poller (other dialects) task."""
+        if self._task is not None:
+            return
+        url = make_url(database_url)
+        if url.get_backend_name() == "postgresql":
+            self.mode = "listen"
+            dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+            self._task = asyncio.create_task(self._listen_forever(dsn))
+        else:
+            self.mode = "poll"
+            self._task = asyncio.create_task(self._poll_forever(session_maker, poll_interval))
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.connected = False
+
+    async def _listen_forever(self, dsn: str) -> None:
+        backoff = 1.0
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(dsn)
+                await conn.add_listener(
+                    self.channel, lambda _conn, _pid, _channel, payload: self._receive(payload)
+                )
+                self.connected = True
+                backoff = 1.0
+                log.info("[INVALIDATION] Listening on channel '%s'", self.channel)
+                # Events sent while we were disconnected are lost: drop everything
+                self._dispatch_all()
+                while not conn.is_closed():
+                    await asyncio.sleep(30)
+                    await conn.execute("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning("[INVALIDATION] Listener connection failed: %s", e)
+            finally:
+                self.connected = False
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def _poll_forever(self, session_maker: async_sessionmaker, interval: float) -> None:
+        initialized = False
+        while True:
+            try:
+                async with session_maker() as db:
+                    if not initialized:
+                        # Only events published after startup are relevant
+                        result = await db.execute(select(func.max(CacheInvalidation.id)))
+                        self._last_seen_id = result.scalar_one() or 0
+                        initialized = True
+                    else:
+                        await self.poll_once(db)
+                        await db.execute(
+                            delete(CacheInvalidation).where(
+                                CacheInvalidation.created_at < datetime.utcnow() - timedelta(hours=1)
+                            )
+                        )
+                        await db.commit()
+                self.connected = True
+            except Exception as e:
+                self.connected = False
+                log.warning("[INVALIDATION] Poll failed: %s", e)
+            await asyncio.sleep(interval)
+
+    def snapshot(self) -> dict:
+        """Metrics for the admin monitoring endpoint."""
+        return {
+            "mode": self.mode,
+            "channel": self.channel,
+            "origin": self.origin,
+            "connected": self.connected,
+            "published": self.published,
+            "received": self.received,
+            "propagation_ms": self.propagation_ms.snapshot(),
+        }
+
+
+invalidation_bus = InvalidationBus(channel=get_settings().invalidation_channel)
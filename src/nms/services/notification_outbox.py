@@ -0,0 +1,402 @@
+"""Transactional outbox for order status notifications."""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Callable, Sequence
+from datetime import datetime, timedelta
+
+from sqlalchemy import ColumnElement, Row, delete, exists, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from nms.models.db_models import (
+    NotificationDeadLetter,
+    NotificationOutbox,
+    Order,
+    User,
+    Service,
+    UNNOTIFIED_ORDER,
+)
+from nms.config import get_settings
+from nms.services.telegram_notifier import (
+    DeliveryResult,
+    NOTIFIABLE_STATUSES,
+    TelegramNotifier,
+    has_status_template,
+)
+
+log = logging.getLogger(__name__)
+
+
+def enqueue_status_notification(db: AsyncSession, order: Order) -> None:
+    """
+    Queue a notification about the order's current status.
+
+    The row is added to the caller's session, so it commits (or rolls back)
+    together with the status change itself.
+    """
+    db.add(NotificationOutbox(order_id=order.id, status=order.status))
+
+
+def backoff_delay(
+    attempt: int,
+    base: float,
+    cap: float,
+    rand: Callable[[], float] = random.random,
+) -> float:
+    """
+    Exponential backoff with jitter for the given (1-based) attempt.
+
+    The delay doubles per attempt up to cap; half of it is randomized so
+    retries of a burst of failures spread out instead of arriving together.
+    """
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay / 2 + rand() * delay / 2
+
+
+class OutboxDispatcher:
+    """
+    Drains notification_outbox in the background.
+
+    A batch is claimed in one short transaction: due rows are picked with
+    SELECT ... FOR UPDATE SKIP LOCKED and leased by setting locked_until, so
+    several workers or nodes can drain in parallel without sending a row
+    twice. No transaction or pooled connection is held while sending. The
+    outcomes are recorded in a second transaction, only for rows whose lease
+    is still ours: delivered and skipped rows are deleted and the order's
+    notified_status is updated. Failures are retried with jittered
+    exponential backoff; after max_attempts (or a permanent API error) the
+    row moves to notification_dead_letters. Rows of a worker that died
+    mid-batch become due again when their lease expires. A periodic sweep
+    re-queues orders whose notified_status fell behind without an outbox row.
+    """
+
+    def __init__(
+        self,
+        notifier: TelegramNotifier,
+        batch_size: int = 50,
+        poll_interval: float = 1.0,
+        lease: float = 300.0,
+        retry_delay: float = 5.0,
+        retry_max_delay: float = 3600.0,
+        max_attempts: int = 8,
+        sweep_interval: float = 300.0,
+        sweep_batch_size: int = 100,
+        sweep_grace: float = 300.0,
+        sweep_max_age: float = 86400.0,
+    ) -> None:
+        self.notifier = notifier
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.retry_delay = retry_delay
+        self.retry_max_delay = retry_max_delay
+        self.max_attempts = max_attempts
+        self.sweep_interval = sweep_interval
+        self.sweep_batch_size = sweep_batch_size
+        self.sweep_grace = sweep_grace
+        self.sweep_max_age = sweep_max_age
+        self.sent = 0
+        self.failed = 0
+        self.skipped = 0
+        self.dead_lettered = 0
+        self.swept = 0
+        self.lease_lost = 0
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def wake(self) -> None:
+        """Drain now instead of waiting for the next poll (after a local enqueue)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def drain_once(self, db: AsyncSession) -> int:
+        """Claim, send and settle one batch; returns the number of rows handled."""
+        lease = datetime.utcnow() + timedelta(seconds=self.lease)
+        rows = await self._claim(db, lease)
+        if not rows:
+            return 0
+
+        # Sends run concurrently; the notifier's scheduler enforces Bot API limits
+        results = await asyncio.gather(*(self._process(row) for row in rows))
+
+        await self._settle(db, rows, results, lease)
+        return len(rows)
+
+    async def _claim(self, db: AsyncSession, lease: datetime) -> Sequence[Row]:
+        """Lease a batch of due rows and load what their messages need."""
+        now = datetime.utcnow()
+        due = (
+            select(NotificationOutbox.id)
+            .where(
+                NotificationOutbox.available_at <= now,
+                or_(NotificationOutbox.locked_until.is_(None), NotificationOutbox.locked_until <= now),
+            )
+            .order_by(NotificationOutbox.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(due.scalar_subquery()))
+            .values(locked_until=lease, attempts=NotificationOutbox.attempts + 1)
+            .returning(NotificationOutbox.id)
+            .execution_options(synchronize_session=False)
+        )
+        ids = result.scalars().all()
+        if not ids:
+            await db.rollback()
+            return []
+
+        result = await db.execute(
+            select(
+                NotificationOutbox.id,
+                NotificationOutbox.status,
+                NotificationOutbox.attempts,
+                Order.id.label("order_id"),
+                Order.status.label("order_status"),
+                Order.notified_status,
+                Order.total_amount,
+                User.telegram_id,
+                User.language_code,
+                Service.name.label("service_name"),
+            )
+            .join(Order, NotificationOutbox.order_id == Order.id)
+            .join(User, Order.user_id == User.id)
+            .outerjoin(Service, Order.service_id == Service.id)
+            .where(NotificationOutbox.id.in_(ids))
+            .order_by(NotificationOutbox.id)
+        )
+        rows = result.all()
+        await db.commit()
+        return rows
+
+    async def _process(self, row: Row) -> DeliveryResult | None:
+        """Send one claimed row; None if it needs no message."""
+        # Superseded by a newer status, already seen in the bot, silent status or no chat
+        if (
+            row.status != row.order_status
+            or row.notified_status == row.order_status
+            or not has_status_template(row.order_status)
+            or not row.telegram_id
+        ):
+            return None
+
+        return await self.notifier.deliver_order_status(
+            telegram_id=row.telegram_id,
+            order_id=row.order_id,
+            service_name=row.service_name or "—",
+            total_amount=row.total_amount,
+            new_status=row.order_status,
+            language_code=row.language_code,
+        )
+
+    async def _settle(
+        self,
+        db: AsyncSession,
+        rows: Sequence[Row],
+        results: Sequence[DeliveryResult | None],
+        lease: datetime,
+    ) -> None:
+        """Record the outcomes of a batch in one transaction."""
+        now = datetime.utcnow()
+        # Rows whose lease expired meanwhile belong to another dispatcher now
+        leased = NotificationOutbox.locked_until == lease
+        done = []
+        for row, result in zip(rows, results):
+            if result is None:
+                self.skipped += 1
+                done.append(row.id)
+                continue
+
+            if result.delivered:
+                self.sent += 1
+                done.append(row.id)
+                await db.execute(
+                    update(Order)
+                    .where(Order.id == row.order_id, Order.status == row.order_status)
+                    .values(notified_status=row.order_status)
+                )
+                continue
+
+            self.failed += 1
+            if not result.retryable or row.attempts >= self.max_attempts:
+                await self._dead_letter(db, row, result, leased)
+                continue
+
+            delay = backoff_delay(row.attempts, self.retry_delay, self.retry_max_delay)
+            updated = await db.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.id == row.id, leased)
+                .values(
+                    available_at=now + timedelta(seconds=delay),
+                    locked_until=None,
+                    last_error=_describe(result),
+                )
+            )
+            self.lease_lost += 1 - updated.rowcount
+            log.info(
+                "[OUTBOX] Push failed for order #%s (attempt %s), retry in %.0fs",
+                row.order_id,
+                row.attempts,
+                delay,
+            )
+
+        if done:
+            deleted = await db.execute(
+                delete(NotificationOutbox).where(NotificationOutbox.id.in_(done), leased)
+            )
+            self.lease_lost += len(done) - deleted.rowcount
+        await db.commit()
+
+    async def _dead_letter(
+        self, db: AsyncSession, row: Row, failure: DeliveryResult, leased: ColumnElement[bool]
+    ) -> None:
+        """Move an undeliverable row to notification_dead_letters."""
+        deleted = await db.execute(
+            delete(NotificationOutbox).where(NotificationOutbox.id == row.id, leased)
+        )
+        if not deleted.rowcount:
+            self.lease_lost += 1
+            return
+        db.add(
+            NotificationDeadLetter(
+                order_id=row.order_id,
+                status=row.status,
+                attempts=row.attempts,
+                http_status=failure.http_status,
+                error=failure.error,
+            )
+        )
+        self.dead_lettered += 1
+        log.warning(
+            "[OUTBOX] Order #%s notification dead-lettered after %s attempts: %s",
+            row.order_id,
+            row.attempts,
+            _describe(failure),
+        )
+
+    async def sweep_once(self, db: AsyncSession) -> int:
+        """
+        Re-queue orders whose notification fell behind.
+
+        Picks at most sweep_batch_size of the oldest orders with
+        notified_status != status that have no outbox row and were
+        not dead-lettered for that status. Orders changed within sweep_grace
+        are left to the outbox; orders changed more than sweep_max_age ago
+        are not worth a push any more. Returns the number of rows queued.
+        """
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=self.sweep_grace)
+        oldest = now - timedelta(seconds=self.sweep_max_age)
+        pending = exists().where(NotificationOutbox.order_id == Order.id)
+        dead = exists().where(
+            NotificationDeadLetter.order_id == Order.id,
+            NotificationDeadLetter.status == Order.status,
+        )
+        result = await db.execute(
+            select(Order.id, Order.status)
+            .join(User, Order.user_id == User.id)
+            .where(
+                UNNOTIFIED_ORDER,
+                Order.updated_at < cutoff,
+                Order.updated_at >= oldest,
+                Order.status.in_(NOTIFIABLE_STATUSES),
+                User.telegram_id.is_not(None),
+                ~pending,
+                ~dead,
+            )
+            .order_by(Order.updated_at)
+            .limit(self.sweep_batch_size)
+        )
+        rows = result.all()
+        for order_id, order_status in rows:
+            db.add(NotificationOutbox(order_id=order_id, status=order_status))
+
+        if rows:
+            await db.commit()
+            self.swept += len(rows)
+            log.info("[OUTBOX] Sweeper re-queued %s stale notifications", len(rows))
+        return len(rows)
+
+    async def start(self, session_maker: async_sessionmaker) -> None:
+        """Start the background drain loop (not without a bot token: rows stay queued)."""
+        if not self.notifier.is_configured:
+            log.warning("[OUTBOX] Bot token not configured, dispatcher not started")
+            return
+        if self._task is None:
+            # Created here so the event binds to the serving event loop
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(session_maker))
+
+    async def stop(self) -> None:
+        """Stop the background drain loop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wakeup = None
+
+    async def _run(self, session_maker: async_sessionmaker) -> None:
+        next_sweep = time.monotonic() + self.sweep_interval
+        while True:
+            if time.monotonic() >= next_sweep:
+                next_sweep = time.monotonic() + self.sweep_interval
+                try:
+                    async with session_maker() as db:
+                        await self.sweep_once(db)
+                except Exception as e:
+                    log.error("[OUTBOX] Sweep failed: %s", e)
+            try:
+                async with session_maker() as db:
+                    handled = await self.drain_once(db)
+            except Exception as e:
+                handled = 0
+                log.error("[OUTBOX] Drain failed: %s", e)
+            if handled >= self.batch_size:
+                continue  # more work is likely waiting
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def snapshot(self) -> dict:
+        """Delivery counters for monitoring."""
+        return {
+            "running": self._task is not None,
+            "sent": self.sent,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "dead_lettered": self.dead_lettered,
+            "swept": self.swept,
+            "lease_lost": self.lease_lost,
+        }
+
+
+def _describe(result: DeliveryResult) -> str:
+    """Short error text for outbox.last_error."""
+    if result.http_status is not None:
+        return f"HTTP {result.http_status}: {result.error or ''}".strip()
+    return result.error or "delivery failed"
+
+
+_settings = get_settings()
+outbox_dispatcher = OutboxDispatcher(
+    TelegramNotifier(_settings.telegram_bot_token),
+    batch_size=_settings.outbox_batch_size,
+    poll_interval=_settings.outbox_poll_interval,
+    lease=_settings.outbox_lease,
+    retry_delay=_settings.outbox_retry_delay,
+    retry_max_delay=_settings.outbox_retry_max_delay,
+    max_attempts=_settings.outbox_max_attempts,
+    sweep_interval=_settings.notification_sweep_interval,
+    sweep_batch_size=_settings.notification_sweep_batch_size,
+    sweep_grace=_settings.notification_sweep_grace,
+    sweep_max_age=_settings.notification_sweep_max_age,
+)
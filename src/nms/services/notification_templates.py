@@ -0,0 +1,157 @@
+"""Precompiled localized notification templates."""
+
+import json
+import logging
+from decimal import Decimal
+from operator import itemgetter
+from pathlib import Path
+from string import Formatter
+
+log = logging.getLogger(__name__)
+
+# One JSON file per language: templates/notifications/<language>.json = {status: template}
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates" / "notifications"
+
+DEFAULT_LANGUAGE = "ru"
+
+# Placeholders a status template may use, in CompiledTemplate.render_args() order
+TEMPLATE_FIELDS = ("order_id", "service_name", "amount")
+
+
+def format_amount(raw: Decimal | int | str | None) -> str:
+    """
+    Format an amount as whole sums with space-grouped thousands: 150000.00 → '150 000'.
+
+    Ints, Decimals and plain decimal strings are converted with int() directly;
+    only unusual strings (e.g. exponent notation) go through Decimal. Values
+    that cannot be formatted (e.g. Decimal('Infinity')) are returned as is.
+    """
+    if raw is None:
+        return "—"
+    try:
+        if isinstance(raw, str):
+            whole, _, fraction = raw.partition(".")
+            if fraction and not fraction.isdigit():
+                raise ValueError(raw)
+            value = int(whole or "0")
+        else:
+            value = int(raw)
+    except Exception:
+        try:
+            value = int(Decimal(str(raw)))
+        except Exception:
+            return str(raw)
+    return f"{value:,}".replace(",", " ")
+
+
+class CompiledTemplate:
+    """
+    A status template parsed once into a %-style format string.
+
+    The placeholders become positions in the TEMPLATE_FIELDS argument tuple,
+    picked by a prebuilt itemgetter, so rendering is one C-level tuple pick
+    and one '%' substitution; no per-message parsing of the '{field}' syntax
+    and no keyword dict.
+    """
+
+    __slots__ = ("source", "fields", "_format", "_pick")
+
+    def __init__(self, source: str) -> None:
+        literals, fields = [], []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            literals.append(literal.replace("%", "%%"))
+            if field is None:
+                continue
+            if field not in TEMPLATE_FIELDS:
+                raise ValueError(f"Unknown template field '{field}'")
+            if spec or conversion:
+                raise ValueError(f"Format specs are not supported: '{{{field}}}'")
+            literals.append("%s")
+            fields.append(field)
+        self.source = source
+        self.fields = tuple(fields)
+        self._format = "".join(literals)
+        positions = [TEMPLATE_FIELDS.index(field) for field in fields]
+        if len(positions) == 1:
+            # A single-item itemgetter returns the item, not a 1-tuple
+            self._pick = lambda args, pick=itemgetter(positions[0]): (pick(args),)
+        elif positions:
+            self._pick = itemgetter(*positions)
+        else:
+            self._pick = lambda args: ()
+
+    def render_args(self, args: tuple) -> str:
+        """Render from values given in TEMPLATE_FIELDS order."""
+        return self._format % self._pick(args)
+
+    def render(self, **values) -> str:
+        """Substitute the placeholders; every field used by the template must be given."""
+        return self._format % tuple(values[field] for field in self.fields)
+
+
+class TemplateRegistry:
+    """
+    Compiled status templates by language.
+
+    Unknown languages fall back to the default one. Templates are compiled
+    on construction, so a malformed data file fails at startup rather than
+    on the first notification.
+    """
+
+    def __init__(
+        self,
+        templates: dict[str, dict[str, str]],
+        default_language: str = DEFAULT_LANGUAGE,
+    ) -> None:
+        if default_language not in templates:
+            raise ValueError(f"No templates for default language '{default_language}'")
+        self.default_language = default_language
+        self._templates: dict[str, dict[str, CompiledTemplate]] = {
+            lang: {status: CompiledTemplate(text) for status, text in by_status.items()}
+            for lang, by_status in templates.items()
+        }
+
+    @classmethod
+    def from_directory(
+        cls, path: Path = TEMPLATES_DIR, default_language: str = DEFAULT_LANGUAGE
+    ) -> "TemplateRegistry":
+        """Load every <language>.json file in the directory."""
+        templates = {
+            file.stem: json.loads(file.read_text(encoding="utf-8"))
+            for file in sorted(path.glob("*.json"))
+        }
+        log.debug("[TEMPLATES] Loaded notification languages: %s", ", ".join(templates))
+        return cls(templates, default_language)
+
+    @property
+    def languages(self) -> tuple[str, ...]:
+        return tuple(self._templates)
+
+    @property
+    def statuses(self) -> tuple[str, ...]:
+        """Statuses with a template in the default language."""
+        return tuple(self._templates[self.default_language])
+
+    def get(self, status: str, language_code: str | None = None) -> CompiledTemplate | None:
+        """Template for the status in the user's language (or the default), None if absent."""
+        templates = self._templates.get(language_code or self.default_language)
+        if templates is None:
+            templates = self._templates[self.default_language]
+        return templates.get(status)
+
+    def render_order_status(
+        self,
+        status: str,
+        language_code: str | None,
+        order_id: int,
+        service_name: str | None,
+        total_amount: Decimal | int | str | None,
+    ) -> str | None:
+        """Render an order status message, or None if the status has no template."""
+        template = self.get(status, language_code)
+        if template is None:
+            return None
+        return template.render_args((order_id, service_name or "—", format_amount(total_amount)))
+
+
+template_registry = TemplateRegistry.from_directory()
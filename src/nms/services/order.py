@@ -5,7 +5,9 @@ from datetime import datetime
 from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from nms.models.db_models import Order, User, Service
+from nms.models.db_models import Order, User
+from nms.models.service import ServiceResponse
+from nms.services.catalog import service_catalog
 
 log = logging.getLogger(__name__)
 
@@ -32,21 +34,18 @@ class OrderService:
         return True
 
     @staticmethod
-    async def get_service(service_id: int, db: AsyncSession) -> Service | None:
+    async def get_service(service_id: int, db: AsyncSession) -> ServiceResponse | None:
         """
-        Get service by ID.
+        Get service by ID from the service catalog cache.
 
         Args:
             service_id: Service ID
-            db: Database session
+            db: Database session (used only if the catalog is stale)
 
         Returns:
             Service if found and active, None otherwise
         """
-        result = await db.execute(
-            select(Service).where(Service.id == service_id, Service.is_active == True)
-        )
-        return result.scalar_one_or_none()
+        return await service_catalog.get_active(service_id, db)
 
     @staticmethod
     async def save_order(
@@ -2,15 +2,28 @@
 
 import logging
 import secrets
+from dataclasses import dataclass
 from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from nms.models.db_models import Payment, PaymentStatus, Order, OrderStatus
+from nms.models.db_models import Payment, PaymentStatus, PaymentWebhookDelivery, Order, OrderStatus
+from nms.services.notification_outbox import enqueue_status_notification
+from nms.services.invalidation import invalidation_bus
+from nms.services.payment_events import PAYMENT_TOPIC
 
 log = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class WebhookResult:
+    """Outcome of a payment webhook."""
+
+    payment_id: int
+    payment_status: str
+    replayed: bool = False
+
+
 class PaymentService:
     """Service for payment processing and management."""
 
@@ -93,11 +106,21 @@ class PaymentService:
         amount: Decimal,
         status: str,
         db: AsyncSession,
-    ) -> Payment:
+        transaction_id: str | None = None,
+        provider: str = "payme_demo",
+    ) -> WebhookResult:
         """
-        Process a payment webhook callback.
-
-        Validates the token, updates payment status, and updates order status.
+        Process a payment webhook callback idempotently.
+
+        A callback already recorded under its provider transaction ID (the
+        payment token plus status when the provider sends none) for the same
+        order, token and amount returns the stored result in one round trip.
+        Otherwise payment and order are locked together with SELECT ... FOR
+        UPDATE, so concurrent duplicates serialize and the loser sees the
+        finished transition instead of repeating it. The Telegram push is
+        queued in the notification outbox and the delivery recorded within
+        the same transaction; the commit publishes a payment event that wakes
+        status long-polls.
 
         Args:
             order_id: Order ID
@@ -105,20 +128,57 @@ class PaymentService:
             amount: Payment amount (for verification)
             status: New payment status (paid/failed)
             db: Database session
+            transaction_id: Provider transaction ID used for replay dedupe
+            provider: Payment provider name
 
         Returns:
-            Updated Payment object
+            Resulting payment ID and status; replayed is True for duplicates
 
         Raises:
             ValueError: If validation fails
         """
-        # Find payment by order_id
+        transaction_id = transaction_id or f"{token}:{status}"
+
+        # Replayed callback: answer from the dedupe table, but only for the
+        # payment it was recorded for; anything else is validated as usual
+        replay = await db.execute(
+            select(PaymentWebhookDelivery.payment_id, PaymentWebhookDelivery.payment_status)
+            .join(Payment, Payment.id == PaymentWebhookDelivery.payment_id)
+            .where(
+                PaymentWebhookDelivery.provider == provider,
+                PaymentWebhookDelivery.transaction_id == transaction_id,
+                Payment.order_id == order_id,
+                Payment.token == token,
+                Payment.amount == amount,
+            )
+        )
+        stored = replay.one_or_none()
+        if stored:
+            log.info(
+                "[PAYMENT] Replayed webhook for order #%s (transaction %s), returning stored result",
+                order_id, transaction_id,
+            )
+            return WebhookResult(stored.payment_id, stored.payment_status, replayed=True)
+
+        if status == "paid":
+            payment_status, order_status = PaymentStatus.PAID, OrderStatus.CONFIRMED
+        elif status == "failed":
+            payment_status, order_status = PaymentStatus.FAILED, OrderStatus.CANCELLED
+        else:
+            raise ValueError(f"Invalid payment status: {status}")
+
+        # Lock payment and order together; duplicates wait here
         result = await db.execute(
-            select(Payment).where(Payment.order_id == order_id)
+            select(Payment, Order)
+            .join(Order, Order.id == Payment.order_id)
+            .where(Payment.order_id == order_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
         )
-        payment = result.scalar_one_or_none()
-        if not payment:
+        row = result.one_or_none()
+        if not row:
             raise ValueError(f"Payment not found for order {order_id}")
+        payment, order = row
 
         # Validate token
         if payment.token != token:
@@ -130,43 +190,42 @@ class PaymentService:
                 f"Amount mismatch: expected {payment.amount}, got {amount}"
             )
 
+        # A concurrent duplicate already made this transition
+        if payment.status == payment_status:
+            await db.rollback()
+            log.info(
+                "[PAYMENT] Duplicate webhook for order #%s, payment already %s",
+                order_id, payment_status.value,
+            )
+            return WebhookResult(payment.id, payment.status, replayed=True)
+
         # Check that payment is still pending
         if payment.status not in (PaymentStatus.PENDING, PaymentStatus.PROCESSING):
             raise ValueError(f"Payment is already in status: {payment.status}")
 
-        # Update payment status
-        if status == "paid":
-            payment.status = PaymentStatus.PAID
-        elif status == "failed":
-            payment.status = PaymentStatus.FAILED
-        else:
-            raise ValueError(f"Invalid payment status: {status}")
-
-        # Update order status based on payment result
-        order_result = await db.execute(
-            select(Order).where(Order.id == order_id)
+        payment.status = payment_status
+        order.status = order_status
+        log.info(
+            "[PAYMENT] Order #%s %s after %s payment",
+            order_id, order_status.value, payment_status.value,
         )
-        order = order_result.scalar_one_or_none()
-        if order:
-            if status == "paid":
-                order.status = OrderStatus.CONFIRMED
-                log.info(
-                    "[PAYMENT] Order #%s confirmed after successful payment", order_id
-                )
-            elif status == "failed":
-                order.status = OrderStatus.CANCELLED
-                log.info(
-                    "[PAYMENT] Order #%s cancelled after failed payment", order_id
-                )
+        enqueue_status_notification(db, order)
+        db.add(PaymentWebhookDelivery(
+            provider=provider,
+            transaction_id=transaction_id,
+            payment_id=payment.id,
+            payment_status=payment_status.value,
+        ))
 
-        await db.commit()
-        await db.refresh(payment)
+        payment_id = payment.id
+        # Wakes /payment/status/{id}/wait long-polls on every worker
+        await invalidation_bus.commit_and_publish(db, PAYMENT_TOPIC, payment_id)
 
         log.info(
             "[PAYMENT] Webhook processed: payment #%s, order #%s, status: %s",
-            payment.id, order_id, status,
+            payment_id, order_id, status,
         )
-        return payment
+        return WebhookResult(payment_id, payment_status.value)
 
     @staticmethod
     async def get_payment_status(payment_id: int, db: AsyncSession) -> Payment | None:
@@ -0,0 +1,78 @@
+"""In-process wake-ups for clients waiting on a payment status change."""
+
+import asyncio
+import logging
+
+from nms.services.invalidation import invalidation_bus
+
+log = logging.getLogger(__name__)
+
+# Invalidation bus topic carrying the changed payment ID
+PAYMENT_TOPIC = "payments"
+
+
+class PaymentStatusWatcher:
+    """
+    Lets long-poll requests sleep until their payment changes.
+
+    Waiters register an asyncio.Event per payment ID; nothing touches the
+    database while they sleep. Changes arrive through the invalidation bus:
+    directly after a local commit, or from other workers over LISTEN/NOTIFY
+    (polling on non-PostgreSQL). A None key (listener reconnected, events may
+    be lost) wakes every waiter so it re-reads its payment.
+    """
+
+    def __init__(self) -> None:
+        self._waiters: dict[int, set[asyncio.Event]] = {}
+        self.notified = 0
+
+    def register(self, payment_id: int) -> asyncio.Event:
+        """
+        Start watching a payment.
+
+        Register before reading the current status, so a change committed
+        in between still wakes the waiter.
+        """
+        event = asyncio.Event()
+        self._waiters.setdefault(payment_id, set()).add(event)
+        return event
+
+    def unregister(self, payment_id: int, event: asyncio.Event) -> None:
+        """Stop watching (always call once the request is done)."""
+        waiters = self._waiters.get(payment_id)
+        if waiters is not None:
+            waiters.discard(event)
+            if not waiters:
+                del self._waiters[payment_id]
+
+    def notify(self, payment_id: int | None) -> None:
+        """Wake waiters of one payment, or of all payments for None."""
+        if payment_id is None:
+            groups = list(self._waiters.values())
+        else:
+            groups = [self._waiters.get(int(payment_id), ())]
+        for waiters in groups:
+            for event in waiters:
+                event.set()
+                self.notified += 1
+
+    @staticmethod
+    async def wait(event: asyncio.Event, timeout: float) -> bool:
+        """Sleep until woken or timeout; returns True if woken."""
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def snapshot(self) -> dict:
+        """Waiter counts for monitoring."""
+        return {
+            "payments": len(self._waiters),
+            "waiters": sum(len(waiters) for waiters in self._waiters.values()),
+            "notified": self.notified,
+        }
+
+
+payment_status_watcher = PaymentStatusWatcher()
+invalidation_bus.subscribe(PAYMENT_TOPIC, payment_status_watcher.notify)
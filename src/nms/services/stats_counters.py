@@ -0,0 +1,221 @@
+"""Incrementally maintained row counts behind /admin/stats."""
+
+import asyncio
+import logging
+import random
+from collections import Counter
+from collections.abc import Mapping
+
+from sqlalchemy import event, func, inspect, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from nms.config import get_settings
+from nms.models.db_models import Order, OrderStatus, Service, StatsCounter, User
+
+log = logging.getLogger(__name__)
+
+# Counter names
+USERS = "users"
+ORDERS = "orders"
+ACTIVE_SERVICES = "services_active"
+ORDER_STATUS_PREFIX = "orders_status:"
+
+# Dialect-specific INSERT constructs supporting ON CONFLICT ... DO UPDATE
+_UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
+# pg_try_advisory_xact_lock key serializing reconciliation across app workers
+_RECONCILE_LOCK_ID = 0x5747_5354
+
+
+def _status(value) -> str:
+    return getattr(value, "value", value)
+
+
+def _committed(session: Session, obj, attr: str):
+    """Database value of an attribute before this flush."""
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    if not history.added:
+        return getattr(obj, attr)  # expired: loads the stored value
+    # Overwritten without being loaded first
+    model = type(obj)
+    return session.connection().execute(
+        select(getattr(model, attr)).where(model.id == obj.id)
+    ).scalar_one()
+
+
+def _current(obj, attr: str):
+    history = inspect(obj).attrs[attr].history
+    return history.added[0] if history.added else None
+
+
+def flush_deltas(session: Session) -> Counter:
+    """Counter changes caused by the pending ORM changes of a session."""
+    deltas: Counter = Counter()
+    for obj in session.new:
+        if isinstance(obj, User):
+            deltas[USERS] += 1
+        elif isinstance(obj, Order):
+            deltas[ORDERS] += 1
+            deltas[ORDER_STATUS_PREFIX + _status(obj.status or OrderStatus.PENDING)] += 1
+        elif isinstance(obj, Service) and obj.is_active is not False:
+            deltas[ACTIVE_SERVICES] += 1
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            deltas[USERS] -= 1
+        elif isinstance(obj, Order):
+            deltas[ORDERS] -= 1
+            deltas[ORDER_STATUS_PREFIX + _status(_committed(session, obj, "status"))] -= 1
+        elif isinstance(obj, Service) and _committed(session, obj, "is_active"):
+            deltas[ACTIVE_SERVICES] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, Order) and _current(obj, "status") is not None:
+            old, new = _status(_committed(session, obj, "status")), _status(obj.status)
+            if old != new:
+                deltas[ORDER_STATUS_PREFIX + old] -= 1
+                deltas[ORDER_STATUS_PREFIX + new] += 1
+        elif isinstance(obj, Service) and _current(obj, "is_active") is not None:
+            old, new = bool(_committed(session, obj, "is_active")), bool(obj.is_active)
+            if old != new:
+                deltas[ACTIVE_SERVICES] += 1 if new else -1
+    return Counter({name: delta for name, delta in deltas.items() if delta})
+
+
+class StatsCounters:
+    """
+    Row counts kept in stats_counters by the transactions that change them.
+
+    Every ORM flush that inserts or deletes users, orders or services, or
+    changes an order's status or a service's is_active, upserts the matching
+    counters in the same transaction (see _before_flush). Code that changes
+    these tables with Core statements calls add() itself. Each counter is
+    spread over `slots` rows, so concurrent writers rarely queue on one row
+    lock; readers sum the slots.
+
+    A periodic reconcile() repairs drift from writes that bypassed the
+    session (db_cli, manual SQL, ON DELETE CASCADE).
+    """
+
+    def __init__(self, slots: int = 8, reconcile_interval: float = 600.0) -> None:
+        self.slots = slots
+        self.reconcile_interval = reconcile_interval
+        self.reconciled = 0
+        self.repaired = 0
+        self._task: asyncio.Task | None = None
+
+    def upsert(self, dialect: str, deltas: Mapping[str, int]):
+        """One INSERT ... ON CONFLICT statement adding deltas to a random slot."""
+        insert = _UPSERT_INSERTS.get(dialect)
+        if insert is None:
+            raise NotImplementedError(f"Stats counters are not supported for dialect '{dialect}'")
+        slot = random.randrange(self.slots)
+        stmt = insert(StatsCounter).values(
+            # Sorted, so concurrent writers lock counter rows in the same order
+            [{"name": name, "slot": slot, "value": deltas[name]} for name in sorted(deltas)]
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[StatsCounter.name, StatsCounter.slot],
+            set_={"value": StatsCounter.value + stmt.excluded.value},
+        )
+
+    async def add(self, db: AsyncSession, deltas: Mapping[str, int]) -> None:
+        """Add deltas in the caller's transaction (for Core inserts, updates and deletes)."""
+        if deltas:
+            await db.execute(self.upsert(db.bind.dialect.name, deltas))
+
+    @staticmethod
+    async def read(db: AsyncSession) -> dict[str, int]:
+        """Current value of every counter."""
+        result = await db.execute(
+            select(StatsCounter.name, func.sum(StatsCounter.value)).group_by(StatsCounter.name)
+        )
+        return {name: int(value) for name, value in result.all()}
+
+    async def reconcile(self, db: AsyncSession) -> dict[str, int]:
+        """
+        Recount the tables and add the difference to the counters.
+
+        Counts and counter sums are read in one statement, so they come from
+        one snapshot: a transaction in flight is missing from both. Applying
+        the difference as a delta keeps writes committed meanwhile intact.
+
+        Returns:
+            The drift that was repaired (empty if the counters were right)
+        """
+        if db.bind.dialect.name == "postgresql":
+            locked = await db.execute(select(func.pg_try_advisory_xact_lock(_RECONCILE_LOCK_ID)))
+            if not locked.scalar_one():
+                await db.rollback()
+                return {}  # another worker is reconciling
+
+        counts = union_all(
+            select(literal(USERS).label("name"), func.count().label("value")).select_from(User),
+            select(literal(ORDERS), func.count()).select_from(Order),
+            select(literal(ACTIVE_SERVICES), func.count()).select_from(Service).where(Service.is_active == True),
+            select(literal(ORDER_STATUS_PREFIX).concat(Order.status), func.count()).group_by(Order.status),
+            select(StatsCounter.name, -func.sum(StatsCounter.value)).group_by(StatsCounter.name),
+        ).subquery()
+        result = await db.execute(
+            select(counts.c.name, func.sum(counts.c.value))
+            .group_by(counts.c.name)
+            .having(func.sum(counts.c.value) != 0)
+        )
+        drift = {name: int(value) for name, value in result.all()}
+
+        await self.add(db, drift)
+        await db.commit()
+        self.reconciled += 1
+        if drift:
+            self.repaired += 1
+            log.warning("[STATS] Repaired counter drift: %s", drift)
+        return drift
+
+    async def start(self, session_maker: async_sessionmaker) -> None:
+        """Start the periodic reconciliation loop (the first run is immediate)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(session_maker))
+
+    async def stop(self) -> None:
+        """Stop the reconciliation loop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self, session_maker: async_sessionmaker) -> None:
+        while True:
+            try:
+                async with session_maker() as db:
+                    await self.reconcile(db)
+            except Exception as e:
+                log.error("[STATS] Reconciliation failed: %s", e)
+            await asyncio.sleep(self.reconcile_interval)
+
+
+_settings = get_settings()
+stats_counters = StatsCounters(
+    slots=_settings.stats_counter_slots,
+    reconcile_interval=_settings.stats_reconcile_interval,
+)
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(session: Session, flush_context, instances) -> None:
+    # Runs inside the flush's transaction; committed values are still loadable here
+    deltas = flush_deltas(session)
+    if deltas:
+        connection = session.connection()
+        connection.execute(stats_counters.upsert(connection.dialect.name, deltas))
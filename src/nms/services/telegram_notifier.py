@@ -1,137 +1,345 @@
 """Telegram notification service for sending order status updates to users."""
 
+import asyncio
+import importlib.util
 import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from decimal import Decimal
 
 import httpx
 
+from nms.config import Settings, get_settings
+from nms.monitoring.metrics import Histogram, RateMeter
+from nms.services.notification_templates import format_amount, template_registry
+
 log = logging.getLogger(__name__)
 
-# Localized status notification templates: {language: {status: template}}
-_STATUS_TEMPLATES: dict[str, dict[str, str]] = {
-    "ru": {
-        "confirmed": (
-            "Заказ #{order_id} подтверждён.\n"
-            "Услуга: {service_name}\n"
-            "Стоимость: {amount} сум\n"
-            "Мастер скоро свяжется с вами."
-        ),
-        "in_progress": (
-            "Заказ #{order_id}: мастер в пути.\n"
-            "Услуга: {service_name}\n"
-            "Стоимость: {amount} сум"
-        ),
-        "completed": (
-            "Заказ #{order_id} выполнен!\n"
-            "Услуга: {service_name}\n"
-            "Стоимость: {amount} сум\n"
-            "Спасибо за использование NoMus!"
-        ),
-        "cancelled": (
-            "Заказ #{order_id} отменён.\n"
-            "Услуга: {service_name}\n"
-            "Стоимость: {amount} сум"
-        ),
-    },
-    "en": {
-        "confirmed": (
-            "Order #{order_id} confirmed.\n"
-            "Service: {service_name}\n"
-            "Price: {amount} sum\n"
-            "The specialist will contact you shortly."
-        ),
-        "in_progress": (
-            "Order #{order_id}: specialist is on the way.\n"
-            "Service: {service_name}\n"
-            "Price: {amount} sum"
-        ),
-        "completed": (
-            "Order #{order_id} completed!\n"
-            "Service: {service_name}\n"
-            "Price: {amount} sum\n"
-            "Thank you for using NoMus!"
-        ),
-        "cancelled": (
-            "Order #{order_id} cancelled.\n"
-            "Service: {service_name}\n"
-            "Price: {amount} sum"
-        ),
-    },
-    "uz": {
-        "confirmed": (
-            "Buyurtma #{order_id} tasdiqlandi.\n"
-            "Xizmat: {service_name}\n"
-            "Narxi: {amount} so'm\n"
-            "Usta tez orada siz bilan bog'lanadi."
-        ),
-        "in_progress": (
-            "Buyurtma #{order_id}: usta yo'lda.\n"
-            "Xizmat: {service_name}\n"
-            "Narxi: {amount} so'm"
-        ),
-        "completed": (
-            "Buyurtma #{order_id} bajarildi!\n"
-            "Xizmat: {service_name}\n"
-            "Narxi: {amount} so'm\n"
-            "NoMus dan foydalanganingiz uchun rahmat!"
+# Statuses users are notified about at all
+NOTIFIABLE_STATUSES: tuple[str, ...] = template_registry.statuses
+
+
+def has_status_template(status: str) -> bool:
+    """Whether users are notified about this status at all."""
+    return status in NOTIFIABLE_STATUSES
+
+
+# Kept for callers formatting prices outside status templates
+format_price = format_amount
+
+
+# ─── Shared HTTP client ──────────────────────────────────────────────
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """
+    Build a pooled keep-alive client for the Bot API.
+
+    HTTP/2 is used when enabled and the optional 'h2' package is installed;
+    otherwise the client falls back to HTTP/1.1 keep-alive.
+    """
+    http2 = settings.telegram_http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        log.warning("[TG-NOTIFY] HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.telegram_max_connections,
+            max_keepalive_connections=settings.telegram_max_keepalive,
+            keepalive_expiry=settings.telegram_keepalive_expiry,
         ),
-        "cancelled": (
-            "Buyurtma #{order_id} bekor qilindi.\n"
-            "Xizmat: {service_name}\n"
-            "Narxi: {amount} so'm"
+        timeout=httpx.Timeout(
+            connect=settings.telegram_connect_timeout,
+            read=settings.telegram_read_timeout,
+            write=settings.telegram_write_timeout,
+            pool=settings.telegram_pool_timeout,
         ),
-    },
-}
+    )
+
+
+def open_http_client(client: httpx.AsyncClient | None = None) -> httpx.AsyncClient:
+    """
+    Install the process-wide client (called from the app lifespan).
+
+    Pass a client to inject a custom transport, e.g. a local stub server in tests.
+    """
+    global _http_client
+    _http_client = client or create_http_client(get_settings())
+    return _http_client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide client, creating it lazily outside the app lifespan."""
+    if _http_client is None or _http_client.is_closed:
+        return open_http_client()
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the process-wide client (called on shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+# ─── Send scheduler ──────────────────────────────────────────────────
+
+
+class TokenBucket:
+    """
+    Token bucket limiting the global Bot API send rate.
+
+    Tokens are reserved synchronously (the balance may go negative), so
+    concurrent callers queue up in arrival order without holding a lock.
+    The default capacity of one token paces sends evenly at `rate`: a
+    bucket holding `rate` tokens would allow a full bucket plus a second of
+    refill, about twice the limit, within the first second.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take one token; returns how many seconds to wait before using it."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        """Wait until a token is available."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# Idle chat slots are pruned once the table grows past this size
+_CHAT_SLOTS_PRUNE_AT = 1024
+
+
+class _ChatSlot:
+    """Per-chat serialization state."""
+
+    __slots__ = ("lock", "next_at", "users")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.next_at = 0.0
+        self.users = 0
+
+
+class SendScheduler:
+    """
+    Throttles Bot API sends to Telegram's limits.
 
+    Sends to different chats run concurrently within the global token bucket;
+    sends to the same chat are serialized and spaced by chat_interval.
+    A 429 response blocks the chat for its retry_after and the send is retried.
+    """
 
-def format_price(raw: Decimal | str | None) -> str:
-    """Format price: 150000.00 → '150 000'."""
-    if raw is None:
-        return "—"
+    def __init__(
+        self,
+        global_rate: float = 30.0,
+        chat_interval: float = 1.0,
+        max_retries: int = 3,
+    ) -> None:
+        self.bucket = TokenBucket(global_rate)
+        self.chat_interval = chat_interval
+        self.max_retries = max_retries
+        self._chats: dict[int, _ChatSlot] = {}
+        self.queued = 0
+        self.in_flight = 0
+        self.sent = 0
+        self.throttled = 0
+        self.send_rate = RateMeter()
+        self.wait_ms = Histogram()
+
+    async def run(
+        self, chat_id: int, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """
+        Run one send for chat_id under the global and per-chat limits.
+
+        Args:
+            chat_id: Telegram chat the message goes to
+            send: Coroutine factory performing the HTTP request
+
+        Returns:
+            The final Bot API response (a 429 only if retries ran out)
+        """
+        if len(self._chats) >= _CHAT_SLOTS_PRUNE_AT:
+            self._prune()
+        slot = self._chats.setdefault(chat_id, _ChatSlot())
+        if slot.users == 0:
+            # An unused lock is free; a fresh one is bound to the current loop
+            slot.lock = asyncio.Lock()
+        slot.users += 1
+        self.queued += 1
+        waiting = True
+        started = time.monotonic()
+        try:
+            async with slot.lock:
+                for _ in range(self.max_retries + 1):
+                    delay = slot.next_at - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    await self.bucket.acquire()
+                    if waiting:
+                        waiting = False
+                        self.queued -= 1
+                        self.wait_ms.observe((time.monotonic() - started) * 1000)
+
+                    self.in_flight += 1
+                    try:
+                        response = await send()
+                    finally:
+                        self.in_flight -= 1
+                        self.sent += 1
+                        self.send_rate.mark()
+                    slot.next_at = time.monotonic() + self.chat_interval
+
+                    if response.status_code != 429:
+                        return response
+                    self.throttled += 1
+                    retry_after = _retry_after(response)
+                    slot.next_at = time.monotonic() + retry_after
+                    log.warning(
+                        "[TG-NOTIFY] Rate limited for chat_id=%s, retry after %ss", chat_id, retry_after
+                    )
+                return response
+        finally:
+            if waiting:
+                self.queued -= 1
+            slot.users -= 1
+
+    def _prune(self) -> None:
+        """Forget chats with no pending sends whose spacing window has passed."""
+        now = time.monotonic()
+        for chat_id, slot in list(self._chats.items()):
+            if slot.users == 0 and slot.next_at <= now:
+                del self._chats[chat_id]
+
+    def snapshot(self) -> dict:
+        """Queue depth, concurrency and throughput for monitoring."""
+        return {
+            "queue_depth": self.queued,
+            "in_flight": self.in_flight,
+            "active_chats": sum(1 for slot in self._chats.values() if slot.users),
+            "sent": self.sent,
+            "throttled": self.throttled,
+            "send_rate": self.send_rate.rate(),
+            "global_rate": self.bucket.rate,
+            "wait_ms": self.wait_ms.snapshot(),
+        }
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """Seconds Telegram asked us to wait (parameters.retry_after), 1s if absent."""
     try:
-        value = int(Decimal(str(raw)))
-        return f"{value:,}".replace(",", " ")
+        return float(response.json().get("parameters", {}).get("retry_after", 1))
     except Exception:
-        return str(raw)
+        return 1.0
+
+
+_settings = get_settings()
+send_scheduler = SendScheduler(
+    global_rate=_settings.telegram_global_rate,
+    chat_interval=_settings.telegram_chat_interval,
+    max_retries=_settings.telegram_max_retries,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DeliveryResult:
+    """Outcome of one Bot API send."""
+
+    delivered: bool
+    http_status: int | None = None
+    error: str | None = None
+    # Failed before reaching the API for a reason a retry cannot fix
+    permanent: bool = False
+
+    @property
+    def retryable(self) -> bool:
+        """
+        Whether sending again may succeed.
+
+        Network errors, 429 and 5xx are transient; other 4xx (chat not found,
+        bot blocked by the user) and permanent local failures (no bot token,
+        no template) will fail the same way every time.
+        """
+        if self.delivered or self.permanent:
+            return False
+        return self.http_status is None or self.http_status == 429 or self.http_status >= 500
 
 
 class TelegramNotifier:
     """Sends order status notifications to Telegram users via Bot API."""
 
-    def __init__(self, bot_token: str) -> None:
+    def __init__(
+        self,
+        bot_token: str,
+        client: httpx.AsyncClient | None = None,
+        api_base_url: str | None = None,
+        scheduler: SendScheduler | None = None,
+    ) -> None:
         self.bot_token = bot_token
-        self.api_url = f"https://api.telegram.org/bot{bot_token}"
+        api_base_url = api_base_url or get_settings().telegram_api_base_url
+        self.api_url = f"{api_base_url.rstrip('/')}/bot{bot_token}"
+        self._client = client
+        self.scheduler = scheduler or send_scheduler
 
     @property
     def is_configured(self) -> bool:
         return bool(self.bot_token)
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Injected client, or the shared process-wide one."""
+        return self._client or get_http_client()
+
     async def send_message(self, chat_id: int, text: str) -> bool:
-        """Send a plain text message via Telegram Bot API."""
+        """Send a plain text message via Telegram Bot API, throttled by the scheduler."""
+        return (await self.deliver(chat_id, text)).delivered
+
+    async def deliver(self, chat_id: int, text: str) -> DeliveryResult:
+        """Send a plain text message and report the HTTP status and error on failure."""
         if not self.is_configured:
             log.warning("[TG-NOTIFY] Bot token not configured, skipping notification")
-            return False
+            return DeliveryResult(False, error="bot token not configured", permanent=True)
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
+            response = await self.scheduler.run(
+                chat_id,
+                lambda: self.client.post(
                     f"{self.api_url}/sendMessage",
                     json={"chat_id": chat_id, "text": text},
-                )
+                ),
+            )
             if response.status_code == 200:
                 data = response.json()
                 if data.get("ok"):
-                    return True
+                    return DeliveryResult(True, http_status=200)
             log.warning(
                 "[TG-NOTIFY] API error for chat_id=%s: %s %s",
                 chat_id,
                 response.status_code,
                 response.text[:200],
             )
-            return False
+            return DeliveryResult(False, http_status=response.status_code, error=response.text[:200])
         except Exception as e:
             log.error("[TG-NOTIFY] Failed to send message to chat_id=%s: %s", chat_id, e)
-            return False
+            return DeliveryResult(False, error=str(e) or type(e).__name__)
 
     async def notify_order_status(
         self,
@@ -147,30 +355,38 @@ class TelegramNotifier:
 
         Returns True if the message was delivered, False otherwise.
         """
-        lang = language_code or "ru"
-        templates = _STATUS_TEMPLATES.get(lang, _STATUS_TEMPLATES["ru"])
-        template = templates.get(new_status)
+        result = await self.deliver_order_status(
+            telegram_id, order_id, service_name, total_amount, new_status, language_code
+        )
+        return result.delivered
 
-        if not template:
+    async def deliver_order_status(
+        self,
+        telegram_id: int,
+        order_id: int,
+        service_name: str,
+        total_amount: Decimal | str | None,
+        new_status: str,
+        language_code: str | None = None,
+    ) -> DeliveryResult:
+        """Send an order status notification and return the detailed delivery result."""
+        text = template_registry.render_order_status(
+            new_status, language_code, order_id, service_name, total_amount
+        )
+        if text is None:
             log.info(
                 "[TG-NOTIFY] No template for status '%s', skipping notification for order #%s",
                 new_status,
                 order_id,
             )
-            return False
-
-        text = template.format(
-            order_id=order_id,
-            service_name=service_name or "—",
-            amount=format_price(total_amount),
-        )
+            return DeliveryResult(False, error=f"no template for status '{new_status}'", permanent=True)
 
-        delivered = await self.send_message(telegram_id, text)
-        if delivered:
+        result = await self.deliver(telegram_id, text)
+        if result.delivered:
             log.info(
                 "[TG-NOTIFY] Notification sent: order #%s → telegram_id=%s (status=%s)",
                 order_id,
                 telegram_id,
                 new_status,
             )
-        return delivered
+        return result
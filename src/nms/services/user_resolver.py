@@ -0,0 +1,90 @@
+"""Telegram ID → user resolution cache shared by bot-facing routes."""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.config import get_settings
+from nms.models.db_models import User
+from nms.services.invalidation import invalidation_bus
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedUser:
+    """Minimal user identity needed by bot-facing routes."""
+
+    user_id: int
+    language_code: str | None
+
+
+class TelegramUserResolver:
+    """
+    LRU + TTL cache mapping telegram_id to (user_id, language_code).
+
+    Unknown telegram_ids are cached negatively for a shorter time, so bots
+    polling for unregistered users do not hit the database either.
+    Entries are evicted through the "users" invalidation topic.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300.0, negative_ttl: float = 30.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, tuple[ResolvedUser | None, float]] = OrderedDict()
+
+    def lookup(self, telegram_id: int) -> tuple[bool, ResolvedUser | None]:
+        """Return (hit, value) without touching the database."""
+        entry = self._entries.get(telegram_id)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[telegram_id]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(telegram_id)
+        self.hits += 1
+        return True, value
+
+    def store(self, telegram_id: int, user: User | None) -> ResolvedUser | None:
+        """Cache the resolution result for a telegram_id (None = unknown)."""
+        value = ResolvedUser(user.id, user.language_code) if user is not None else None
+        ttl = self.ttl if value is not None else self.negative_ttl
+        self._entries[telegram_id] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(telegram_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, telegram_id: int | None = None) -> None:
+        """Evict one telegram_id, or everything when telegram_id is None."""
+        if telegram_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(telegram_id, None)
+
+    async def resolve(self, telegram_id: int, db: AsyncSession) -> ResolvedUser | None:
+        """Resolve a telegram_id, querying the database only on a cache miss."""
+        hit, value = self.lookup(telegram_id)
+        if hit:
+            return value
+        result = await db.execute(select(User).where(User.telegram_id == telegram_id))
+        return self.store(telegram_id, result.scalar_one_or_none())
+
+
+_settings = get_settings()
+telegram_user_resolver = TelegramUserResolver(
+    max_size=_settings.user_cache_size,
+    ttl=_settings.user_cache_ttl,
+    negative_ttl=_settings.user_cache_negative_ttl,
+)
+invalidation_bus.subscribe("users", telegram_user_resolver.invalidate)
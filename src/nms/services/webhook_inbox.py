@@ -0,0 +1,221 @@
+"""Payment webhook ingestion queue: persist fast, process in the background."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from pydantic import ValidationError
+from sqlalchemy import exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import aliased
+
+from nms.config import get_settings
+from nms.models.db_models import PaymentWebhookInbox
+from nms.models.payment import PaymeWebhookPayload
+from nms.monitoring.metrics import Histogram
+from nms.services.notification_outbox import backoff_delay, outbox_dispatcher
+from nms.services.payment import PaymentService
+
+log = logging.getLogger(__name__)
+
+
+def enqueue_webhook(db: AsyncSession, provider: str, order_id: int, body: bytes) -> PaymentWebhookInbox:
+    """
+    Persist a raw webhook body for background processing.
+
+    The row is added to the caller's session; commit it before acknowledging
+    the provider so the callback is durable.
+    """
+    row = PaymentWebhookInbox(provider=provider, order_id=order_id, payload=body.decode("utf-8"))
+    db.add(row)
+    return row
+
+
+class WebhookInbox:
+    """
+    Processes payment_webhook_inbox with a pool of background workers.
+
+    Only the oldest unprocessed webhook of each order is eligible, and it is
+    claimed with SELECT ... FOR UPDATE SKIP LOCKED, so webhooks of one order
+    run in arrival order while different orders run in parallel (also across
+    app workers). Processing goes through the idempotent
+    PaymentService.process_webhook, so a webhook picked up twice after a
+    crash is answered from the dedupe table. Validation errors are final;
+    other errors are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        poll_interval: float = 1.0,
+        retry_delay: float = 2.0,
+        retry_max_delay: float = 300.0,
+        max_attempts: int = 5,
+    ) -> None:
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.retry_max_delay = retry_max_delay
+        self.max_attempts = max_attempts
+        self.processed = 0
+        self.rejected = 0
+        self.retried = 0
+        self.given_up = 0
+        self.lag_ms = Histogram()
+        self._wakeup: asyncio.Event | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    def wake(self) -> None:
+        """Process now instead of waiting for the next poll (after a local enqueue)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def process_one(self, db: AsyncSession) -> bool:
+        """Claim and process the next eligible webhook; returns False when none is due."""
+        now = datetime.utcnow()
+        earlier = aliased(PaymentWebhookInbox)
+        result = await db.execute(
+            select(PaymentWebhookInbox)
+            .where(
+                PaymentWebhookInbox.processed_at.is_(None),
+                PaymentWebhookInbox.available_at <= now,
+                ~exists().where(
+                    earlier.order_id == PaymentWebhookInbox.order_id,
+                    earlier.processed_at.is_(None),
+                    earlier.id < PaymentWebhookInbox.id,
+                ),
+            )
+            .order_by(PaymentWebhookInbox.id)
+            .limit(1)
+            .with_for_update(skip_locked=True, of=PaymentWebhookInbox)
+        )
+        row = result.scalar_one_or_none()
+        if row is None:
+            return False
+        row_id, provider, received_at, attempts = row.id, row.provider, row.received_at, row.attempts
+
+        try:
+            payload = PaymeWebhookPayload.model_validate_json(row.payload)
+            # Marked here so a normal transition commits it atomically
+            row.processed_at = now
+            webhook = await PaymentService.process_webhook(
+                order_id=payload.order_id,
+                token=payload.token,
+                amount=payload.amount,
+                status=payload.status,
+                db=db,
+                transaction_id=payload.transaction_id,
+                provider=provider,
+            )
+        except (ValueError, ValidationError) as e:
+            await db.rollback()
+            self.rejected += 1
+            log.warning("[WEBHOOK-QUEUE] Webhook #%s rejected: %s", row_id, e)
+            await self._finish(db, row_id, received_at, error=str(e))
+            return True
+        except Exception as e:
+            await db.rollback()
+            attempts += 1
+            if attempts >= self.max_attempts:
+                self.given_up += 1
+                log.error("[WEBHOOK-QUEUE] Webhook #%s given up after %s attempts: %s", row_id, attempts, e)
+                await self._finish(db, row_id, received_at, error=str(e), attempts=attempts)
+            else:
+                self.retried += 1
+                delay = backoff_delay(attempts, self.retry_delay, self.retry_max_delay)
+                await db.execute(
+                    update(PaymentWebhookInbox)
+                    .where(PaymentWebhookInbox.id == row_id)
+                    .values(
+                        attempts=attempts,
+                        last_error=str(e) or type(e).__name__,
+                        available_at=datetime.utcnow() + timedelta(seconds=delay),
+                    )
+                )
+                await db.commit()
+                log.warning("[WEBHOOK-QUEUE] Webhook #%s failed, retry in %.1fs: %s", row_id, delay, e)
+            return True
+
+        if webhook.replayed:
+            # Replays commit nothing, so the claim mark must be written separately
+            await self._finish(db, row_id, received_at)
+        else:
+            self._observe(received_at)
+            outbox_dispatcher.wake()
+        self.processed += 1
+        return True
+
+    async def _finish(
+        self,
+        db: AsyncSession,
+        row_id: int,
+        received_at: datetime,
+        error: str | None = None,
+        attempts: int | None = None,
+    ) -> None:
+        values = {"processed_at": datetime.utcnow(), "last_error": error}
+        if attempts is not None:
+            values["attempts"] = attempts
+        await db.execute(
+            update(PaymentWebhookInbox)
+            .where(PaymentWebhookInbox.id == row_id, PaymentWebhookInbox.processed_at.is_(None))
+            .values(**values)
+        )
+        await db.commit()
+        self._observe(received_at)
+
+    def _observe(self, received_at: datetime) -> None:
+        """Record ingest-to-processed lag."""
+        self.lag_ms.observe((datetime.utcnow() - received_at).total_seconds() * 1000)
+
+    async def start(self, session_maker: async_sessionmaker) -> None:
+        """Start the worker pool."""
+        if not self._tasks:
+            # Created here so the event binds to the serving event loop
+            self._wakeup = asyncio.Event()
+            self._tasks = [asyncio.create_task(self._run(session_maker)) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Stop the worker pool; unfinished webhooks stay queued."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+
+    async def _run(self, session_maker: async_sessionmaker) -> None:
+        while True:
+            try:
+                async with session_maker() as db:
+                    handled = await self.process_one(db)
+            except Exception as e:
+                handled = False
+                log.error("[WEBHOOK-QUEUE] Worker failed: %s", e)
+            if handled:
+                continue  # more work is likely waiting
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def snapshot(self) -> dict:
+        """Processing counters and ingest-to-processed lag for monitoring."""
+        return {
+            "running": bool(self._tasks),
+            "workers": len(self._tasks),
+            "processed": self.processed,
+            "rejected": self.rejected,
+            "retried": self.retried,
+            "given_up": self.given_up,
+            "lag_ms": self.lag_ms.snapshot(),
+        }
+
+
+_settings = get_settings()
+webhook_inbox = WebhookInbox(
+    workers=_settings.webhook_workers,
+    poll_interval=_settings.webhook_poll_interval,
+    retry_delay=_settings.webhook_retry_delay,
+    max_attempts=_settings.webhook_max_attempts,
+)
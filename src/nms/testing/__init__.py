@@ -0,0 +1 @@
+"""Test doubles for running the service without external dependencies."""
@@ -0,0 +1,258 @@
+"""
+Local stand-in for the Telegram Bot API sendMessage endpoint.
+
+Point TELEGRAM_API_BASE_URL at it to load-test notifications without
+touching real Telegram:
+
+    python -m nms.testing.telegram_stub --port 8081 --latency exp:40 --error-rate 0.01
+
+The server speaks plain HTTP/1.1 with keep-alive on top of asyncio streams,
+so it needs no extra dependencies.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+log = logging.getLogger(__name__)
+
+# Seconds of simulated Bot API latency for one request
+LatencyFn = Callable[[random.Random], float]
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+def parse_latency(spec: str) -> LatencyFn:
+    """
+    Build a latency distribution from a spec (values in milliseconds).
+
+    Supported specs: 'fixed:20', 'uniform:10,50', 'exp:40' (mean),
+    'lognormal:30,0.5' (median, sigma).
+    """
+    kind, _, args = spec.partition(":")
+    try:
+        values = [float(v) for v in args.split(",")] if args else []
+    except ValueError:
+        raise ValueError(f"Invalid latency spec '{spec}'") from None
+    if kind == "fixed" and len(values) == 1:
+        seconds = values[0] / 1000
+        return lambda rng: seconds
+    if kind == "uniform" and len(values) == 2:
+        low, high = values[0] / 1000, values[1] / 1000
+        return lambda rng: rng.uniform(low, high)
+    if kind == "exp" and len(values) == 1 and values[0] > 0:
+        mean = values[0] / 1000
+        return lambda rng: rng.expovariate(1 / mean)
+    if kind == "lognormal" and len(values) == 2 and values[0] > 0:
+        mu, sigma = math.log(values[0] / 1000), values[1]
+        return lambda rng: rng.lognormvariate(mu, sigma)
+    raise ValueError(f"Invalid latency spec '{spec}'")
+
+
+@dataclass
+class StubConfig:
+    """Fault and latency injection for the stub server."""
+
+    latency: LatencyFn = field(default=lambda rng: 0.0)
+    # Share of requests answered with 429 and retry_after
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    # Share of requests answered with 500
+    error_rate: float = 0.0
+    # Minimum seconds between two messages to one chat; faster sends get 429
+    chat_interval: float = 0.0
+    seed: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Delivery:
+    """A message the stub accepted."""
+
+    chat_id: int
+    text: str
+    at: float
+
+
+class TelegramStubServer:
+    """
+    asyncio server answering POST /bot<token>/sendMessage like the Bot API.
+
+    Accepted messages are recorded in `deliveries`; counters in `snapshot()`.
+    """
+
+    def __init__(self, config: StubConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config or StubConfig()
+        self.host = host
+        self.port = port
+        self.deliveries: list[Delivery] = []
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self._rng = random.Random(self.config.seed)
+        self._chat_next_at: dict[int, float] = {}
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.Task] = set()
+        self._message_id = 0
+
+    @property
+    def base_url(self) -> str:
+        """Value for TELEGRAM_API_BASE_URL / TelegramNotifier(api_base_url=...)."""
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        log.info("[TG-STUB] Listening on %s", self.base_url)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Keep-alive connections would otherwise outlive the server
+            for task in self._connections:
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "TelegramStubServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    def reset(self) -> None:
+        """Forget recorded deliveries, counters and per-chat state."""
+        self.deliveries.clear()
+        self._chat_next_at.clear()
+        self.requests = self.throttled = self.errors = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "delivered": len(self.deliveries),
+            "throttled": self.throttled,
+            "errors": self.errors,
+        }
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self._respond(method, path, body)
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: keep-alive\r\n\r\n".encode()
+                    + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _respond(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        self.requests += 1
+        config = self.config
+        latency = config.latency(self._rng)
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+        if method != "POST" or not path.endswith("/sendMessage"):
+            return 404, {"ok": False, "error_code": 404, "description": "Not Found"}
+        try:
+            message = json.loads(body)
+            chat_id, text = int(message["chat_id"]), str(message["text"])
+        except (ValueError, KeyError, TypeError):
+            return 400, {"ok": False, "error_code": 400, "description": "Bad Request: chat_id and text are required"}
+
+        if config.error_rate and self._rng.random() < config.error_rate:
+            self.errors += 1
+            return 500, {"ok": False, "error_code": 500, "description": "Internal Server Error"}
+
+        now = time.monotonic()
+        retry_after = None
+        if config.rate_limit_rate and self._rng.random() < config.rate_limit_rate:
+            retry_after = config.retry_after
+        elif self._chat_next_at.get(chat_id, 0.0) > now:
+            retry_after = self._chat_next_at[chat_id] - now
+        if retry_after is not None:
+            self.throttled += 1
+            return 429, {
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {retry_after:.3f}",
+                "parameters": {"retry_after": round(retry_after, 3)},
+            }
+
+        if config.chat_interval:
+            self._chat_next_at[chat_id] = now + config.chat_interval
+        self.deliveries.append(Delivery(chat_id, text, now))
+        self._message_id += 1
+        return 200, {
+            "ok": True,
+            "result": {"message_id": self._message_id, "chat": {"id": chat_id}, "date": int(time.time()), "text": text},
+        }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Local Telegram Bot API sendMessage stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", default="fixed:0", help="fixed:MS | uniform:MIN,MAX | exp:MEAN | lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="retry_after seconds for injected 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 500")
+    parser.add_argument("--chat-interval", type=float, default=0.0, help="Per-chat minimum seconds between messages")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    config = StubConfig(
+        latency=parse_latency(args.latency),
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        error_rate=args.error_rate,
+        chat_interval=args.chat_interval,
+        seed=args.seed,
+    )
+    async with TelegramStubServer(config, args.host, args.port) as server:
+        print(f"Telegram stub on {server.base_url} (set TELEGRAM_API_BASE_URL={server.base_url})")
+        try:
+            while True:
+                await asyncio.sleep(10)
+                print(f"[TG-STUB] {server.snapshot()}")
+        except asyncio.CancelledError:
+            pass
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve(_parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -1,5 +1,14 @@
 """Pytest configuration and fixtures for tests."""
 
+import os
+
+# Fail tests when a route exceeds its declared query budget
+os.environ.setdefault("QUERY_BUDGET_STRICT", "true")
+# Tests reuse the same chat ids; per-chat spacing is tested with its own scheduler
+os.environ.setdefault("TELEGRAM_CHAT_INTERVAL", "0")
+# The app lifespan must not preload from or run workers against DATABASE_URL
+os.environ.setdefault("BACKGROUND_SERVICES", "false")
+
 import pytest
 import pytest_asyncio
 from typing import AsyncGenerator
@@ -9,6 +18,9 @@ from fastapi.testclient import TestClient
 from nms.main import app
 from nms.database import get_db, Base
 from nms.config import get_settings
+from nms.monitoring.queries import install_query_timing
+from nms.services.catalog import service_catalog
+from nms.services.user_resolver import telegram_user_resolver
 
 settings = get_settings()
 
@@ -22,6 +34,9 @@ test_engine = create_async_engine(
     future=True,
 )
 
+# Time statements like the production engine does
+install_query_timing(test_engine)
+
 # Create test session factory
 test_async_session_maker = async_sessionmaker(
     test_engine,
@@ -41,6 +56,10 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+    # In-process caches must not leak rows between test databases
+    service_catalog.invalidate()
+    telegram_user_resolver.invalidate()
+
     # Provide session
     async with test_async_session_maker() as session:
         yield session
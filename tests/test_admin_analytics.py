@@ -0,0 +1,171 @@
+"""Tests for analytics rollups and /admin/analytics."""
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.models.db_models import AnalyticsDirtyHour, AnalyticsRollup, Order, Payment, Service, User
+from nms.services.analytics import AnalyticsRollups
+
+RANGE = {"date_from": "2026-03-01T00:00:00", "date_to": "2026-03-02T23:59:59"}
+
+
+@pytest_asyncio.fixture
+async def march_orders(db_session: AsyncSession) -> dict:
+    """Orders over two days, two services and two languages; one paid."""
+    ru = User(phone_number="+998901200001", language_code="ru")
+    en = User(phone_number="+998901200002", language_code="en")
+    massage, spa = Service(name="Massage"), Service(name="Spa")
+    db_session.add_all([ru, en, massage, spa])
+    await db_session.flush()
+    orders = [
+        Order(user_id=ru.id, service_id=massage.id, total_amount=Decimal("100"), created_at=datetime(2026, 3, 1, 9, 15)),
+        Order(user_id=ru.id, service_id=massage.id, total_amount=Decimal("150"), created_at=datetime(2026, 3, 1, 9, 45)),
+        Order(user_id=en.id, service_id=spa.id, total_amount=Decimal("300"), created_at=datetime(2026, 3, 1, 17, 0)),
+        Order(user_id=en.id, service_id=massage.id, total_amount=None, created_at=datetime(2026, 3, 2, 8, 30)),
+    ]
+    db_session.add_all(orders)
+    await db_session.flush()
+    db_session.add(Payment(order_id=orders[2].id, amount=Decimal("300"), status="paid", token="analytics-paid"))
+    await db_session.commit()
+    return {"orders": [o.id for o in orders], "massage": massage.id, "spa": spa.id}
+
+
+async def _refresh(db_session: AsyncSession) -> None:
+    rollups = AnalyticsRollups(batch_hours=2)
+    while await rollups.refresh_once(db_session):
+        pass
+
+
+async def test_timeseries_from_rollups(
+    client: TestClient, db_session: AsyncSession, valid_admin_key: str, march_orders: dict
+):
+    """Flushes queue their hours; the refresh fills day and hour rollups in batches."""
+    headers = {"X-Admin-Key": valid_admin_key}
+    stale = client.get("/admin/analytics/timeseries", params=RANGE, headers=headers).json()
+    assert (stale["points"], stale["stale_hours"]) == ([], 3)
+
+    await _refresh(db_session)
+
+    daily = client.get("/admin/analytics/timeseries", params=RANGE, headers=headers).json()
+    assert daily["stale_hours"] == 0
+    assert [(p["bucket_start"], p["order_count"], Decimal(p["amount_sum"]), p["paid_count"]) for p in daily["points"]] == [
+        ("2026-03-01T00:00:00", 3, Decimal("550"), 1),
+        ("2026-03-02T00:00:00", 1, Decimal("0"), 0),
+    ]
+
+    by_language = client.get(
+        "/admin/analytics/timeseries",
+        params={**RANGE, "granularity": "hour", "group_by": "language", "service_id": march_orders["massage"]},
+        headers=headers,
+    ).json()
+    assert [(p["bucket_start"], p["language_code"], p["order_count"]) for p in by_language["points"]] == [
+        ("2026-03-01T09:00:00", "ru", 2),
+        ("2026-03-02T08:00:00", "en", 1),
+    ]
+
+
+async def test_order_changes_requeue_their_hour(
+    client: TestClient, db_session: AsyncSession, valid_admin_key: str, march_orders: dict
+):
+    """Status changes and deletes move the affected rollup rows after the next refresh."""
+    headers = {"X-Admin-Key": valid_admin_key}
+    await _refresh(db_session)
+    first, *_, last = march_orders["orders"]
+
+    client.patch(f"/admin/orders/{first}", json={"status": "completed"}, headers=headers)
+    client.delete(f"/admin/orders/{last}", headers=headers)
+    await _refresh(db_session)
+
+    by_status = client.get(
+        "/admin/analytics/timeseries", params={**RANGE, "group_by": "status"}, headers=headers
+    ).json()
+    assert [(p["bucket_start"][:10], p["status"], p["order_count"]) for p in by_status["points"]] == [
+        ("2026-03-01", "completed", 1),
+        ("2026-03-01", "pending", 2),
+    ]
+
+
+async def test_marks_are_appended_and_deduplicated(db_session: AsyncSession, march_orders: dict):
+    """Every flush appends its own marker; one refresh clears all markers of an hour."""
+    await _refresh(db_session)
+    first = await db_session.get(Order, march_orders["orders"][0])
+    second = await db_session.get(Order, march_orders["orders"][1])
+    first.status = "completed"
+    await db_session.commit()
+    second.status = "cancelled"
+    await db_session.commit()
+
+    hours = (await db_session.execute(select(AnalyticsDirtyHour.hour))).scalars().all()
+    assert hours == [datetime(2026, 3, 1, 9), datetime(2026, 3, 1, 9)]
+
+    assert await AnalyticsRollups().refresh_once(db_session) == 1
+    assert (await db_session.execute(select(AnalyticsDirtyHour))).first() is None
+
+
+async def test_language_change_requeues_user_hours(
+    client: TestClient, db_session: AsyncSession, valid_admin_key: str, valid_api_key: str, march_orders: dict
+):
+    """Orders move to the user's new language, through the ORM and through registration."""
+    headers = {"X-Admin-Key": valid_admin_key}
+    await _refresh(db_session)
+    ru = (await db_session.execute(select(User).where(User.phone_number == "+998901200001"))).scalar_one()
+    ru.language_code = "uz"
+    await db_session.commit()
+    await _refresh(db_session)
+
+    params = {**RANGE, "group_by": "language"}
+    by_language = client.get("/admin/analytics/timeseries", params=params, headers=headers).json()
+    assert sorted((p["bucket_start"][:10], p["language_code"], p["order_count"]) for p in by_language["points"]) == [
+        ("2026-03-01", "en", 1), ("2026-03-01", "uz", 2), ("2026-03-02", "en", 1),
+    ]
+
+    response = client.post(
+        "/users/register",
+        json={"phone_number": "+998901200002", "language_code": "ru"},
+        headers={"X-API-Key": valid_api_key},
+    )
+    assert response.status_code == 200
+    await _refresh(db_session)
+
+    by_language = client.get("/admin/analytics/timeseries", params=params, headers=headers).json()
+    assert sorted((p["bucket_start"][:10], p["language_code"], p["order_count"]) for p in by_language["points"]) == [
+        ("2026-03-01", "ru", 1), ("2026-03-01", "uz", 2), ("2026-03-02", "ru", 1),
+    ]
+
+
+async def test_backfill_rebuilds_lost_rollups(
+    client: TestClient, db_session: AsyncSession, valid_admin_key: str, march_orders: dict
+):
+    """A backfill queues every order hour in the range and the refresh rebuilds it."""
+    headers = {"X-Admin-Key": valid_admin_key}
+    await _refresh(db_session)
+    await db_session.execute(delete(AnalyticsRollup))
+    await db_session.commit()
+
+    response = client.post(
+        "/admin/analytics/backfill", params={"date_from": "2026-03-01T00:00:00"}, headers=headers
+    )
+    assert response.status_code == 202
+    assert response.json()["queued_hours"] == 3
+
+    await _refresh(db_session)
+    assert (await db_session.execute(select(AnalyticsDirtyHour))).first() is None
+    hourly = (await db_session.execute(
+        select(AnalyticsRollup).where(AnalyticsRollup.granularity == "hour")
+    )).scalars().all()
+    assert sum(row.order_count for row in hourly) == 4
+
+
+def test_hourly_range_is_limited(client: TestClient, valid_admin_key: str):
+    """Hourly series over more than 31 days are rejected."""
+    response = client.get(
+        "/admin/analytics/timeseries",
+        params={"granularity": "hour", "date_from": "2026-01-01T00:00:00", "date_to": "2026-03-01T00:00:00"},
+        headers={"X-Admin-Key": valid_admin_key},
+    )
+    assert response.status_code == 400
@@ -0,0 +1,173 @@
+"""Tests for admin broadcast jobs."""
+
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from nms.models.db_models import User
+from nms.services.broadcast import BroadcastManager, BroadcastStatus, broadcast_manager
+from nms.services.telegram_notifier import SendScheduler, TelegramNotifier
+
+
+def _recording_notifier(deliveries: list) -> TelegramNotifier:
+    def handler(request: httpx.Request) -> httpx.Response:
+        deliveries.append(json.loads(request.content))
+        return httpx.Response(200, json={"ok": True, "result": {}})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return TelegramNotifier("TOKEN", client=client, scheduler=SendScheduler(global_rate=1000, chat_interval=0))
+
+
+@pytest_asyncio.fixture
+async def recipients(db_session: AsyncSession) -> None:
+    """Three Telegram users (ru, uz, no language) and one user without Telegram."""
+    db_session.add_all([
+        User(phone_number="+998900000001", telegram_id=101, language_code="ru"),
+        User(phone_number="+998900000002", telegram_id=102, language_code="uz"),
+        User(phone_number="+998900000003", telegram_id=103),
+        User(phone_number="+998900000004"),
+    ])
+    await db_session.commit()
+
+
+@pytest.fixture
+def broadcast_client(client: TestClient, db_session: AsyncSession, monkeypatch) -> tuple[TestClient, list]:
+    """Test client whose broadcasts read the test DB and record deliveries."""
+    deliveries = []
+    monkeypatch.setattr(broadcast_manager, "session_maker", async_sessionmaker(db_session.bind))
+    monkeypatch.setattr(broadcast_manager, "notifier", _recording_notifier(deliveries))
+    return client, deliveries
+
+
+async def test_broadcast_sends_localized_texts(
+    broadcast_client: tuple[TestClient, list], valid_admin_key: str, recipients: None
+):
+    """Every Telegram user gets the text in their language, falling back to the default."""
+    client, deliveries = broadcast_client
+    headers = {"X-Admin-Key": valid_admin_key}
+
+    response = client.post(
+        "/admin/broadcasts",
+        json={"texts": {"ru": "Привет", "uz": "Salom"}, "default_language": "ru"},
+        headers=headers,
+    )
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    # The background loop is off in tests; run the job as a worker would
+    assert await broadcast_manager.run_once() is True
+    job = client.get(f"/admin/broadcasts/{job_id}", headers=headers).json()
+
+    assert job["status"] == "completed"
+    assert (job["total"], job["sent"], job["failed"], job["progress"]) == (3, 3, 0, 1.0)
+    assert job["languages"]["ru"]["total"] == 2
+    assert job["languages"]["uz"]["sent"] == 1
+    assert sorted((d["chat_id"], d["text"]) for d in deliveries) == [
+        (101, "Привет"), (102, "Salom"), (103, "Привет"),
+    ]
+
+
+def test_broadcast_validation(client: TestClient, valid_admin_key: str):
+    """The default language needs a text; unknown jobs are 404."""
+    headers = {"X-Admin-Key": valid_admin_key}
+
+    response = client.post(
+        "/admin/broadcasts", json={"texts": {"uz": "Salom"}, "default_language": "ru"}, headers=headers
+    )
+    assert response.status_code == 400
+    assert client.get("/admin/broadcasts/9999", headers=headers).status_code == 404
+    assert client.get("/admin/broadcasts").status_code == 403
+
+
+async def test_broadcast_pause_and_resume(db_session: AsyncSession, recipients: None):
+    """A paused job sends nothing until resumed, and is not leased meanwhile."""
+    deliveries = []
+    manager = BroadcastManager(_recording_notifier(deliveries))
+    manager.session_maker = async_sessionmaker(db_session.bind)
+
+    job = await manager.create(db_session, {"ru": "Привет"}, "ru")
+    await manager.pause(db_session, job.id)
+    assert await manager.run_once() is False
+    assert deliveries == []
+
+    await manager.resume(db_session, job.id)
+    assert await manager.run_once() is True
+    job = await manager.get(db_session, job.id)
+    assert job.status == BroadcastStatus.COMPLETED
+    assert job.locked_until is None
+    assert len(deliveries) == 3
+
+
+async def test_broadcast_runs_on_any_worker_in_batches(db_session: AsyncSession, recipients: None):
+    """A job created on one worker is sent by another, batch by batch after the watermark."""
+    deliveries = []
+    session_maker = async_sessionmaker(db_session.bind)
+    accepting = BroadcastManager(_recording_notifier([]))
+    sending = BroadcastManager(_recording_notifier(deliveries), fetch_size=2)
+    accepting.session_maker = sending.session_maker = session_maker
+
+    job = await accepting.create(db_session, {"ru": "Привет"}, "ru")
+    assert await sending.run_once() is True
+
+    job = await accepting.get(db_session, job.id)
+    assert job.status == BroadcastStatus.COMPLETED
+    assert (job.total, job.sent, job.failed) == (3, 3, 0)
+    assert job.last_user_id == 3
+    assert accepting.snapshot(job)["languages"]["ru"]["sent"] == 3
+    assert sorted(d["chat_id"] for d in deliveries) == [101, 102, 103]
+
+
+async def test_broadcast_cancel_from_another_worker(db_session: AsyncSession, recipients: None):
+    """Cancelling the row stops the sending worker after the batch in flight."""
+    deliveries = []
+    session_maker = async_sessionmaker(db_session.bind)
+    sending = BroadcastManager(_recording_notifier(deliveries), fetch_size=1)
+    sending.session_maker = session_maker
+    job = await sending.create(db_session, {"ru": "Привет"}, "ru")
+
+    other = BroadcastManager(_recording_notifier([]))
+    deliver = sending.notifier.deliver
+
+    async def deliver_then_cancel(chat_id: int, text: str):
+        result = await deliver(chat_id, text)
+        async with session_maker() as db:
+            await other.cancel(db, job.id)
+        return result
+
+    sending.notifier.deliver = deliver_then_cancel
+    assert await sending.run_once() is True
+
+    job = await other.get(db_session, job.id)
+    assert job.status == BroadcastStatus.CANCELLED
+    assert job.finished_at is not None
+    assert (job.sent, job.last_user_id) == (1, 1)
+    assert len(deliveries) == 1
+
+
+async def test_broadcast_resumes_from_watermark_after_lease_expiry(db_session: AsyncSession, recipients: None):
+    """A job whose worker stopped is taken over once its lease expires, without resending earlier batches."""
+    deliveries = []
+    manager = BroadcastManager(_recording_notifier(deliveries), fetch_size=1)
+    manager.session_maker = async_sessionmaker(db_session.bind)
+    job = await manager.create(db_session, {"ru": "Привет"}, "ru")
+    job.last_user_id = 1
+    job.sent = 1
+    job.total = 3
+    job.locked_until = datetime.utcnow() + timedelta(minutes=5)
+    await db_session.commit()
+
+    assert await manager.run_once() is False  # still leased by the stopped worker
+
+    job.locked_until = datetime.utcnow() - timedelta(seconds=1)
+    await db_session.commit()
+    assert await manager.run_once() is True
+
+    job = await manager.get(db_session, job.id)
+    assert job.status == BroadcastStatus.COMPLETED
+    assert (job.sent, job.last_user_id) == (3, 3)
+    assert sorted(d["chat_id"] for d in deliveries) == [102, 103]
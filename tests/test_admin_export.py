@@ -0,0 +1,101 @@
+"""Tests for streaming admin exports (/admin/export)."""
+
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.api.admin import export
+from nms.models.db_models import Order, Payment, User
+
+
+@pytest_asyncio.fixture
+async def export_orders(db_session: AsyncSession) -> list[int]:
+    """Three orders of one user, the second one paid."""
+    user = User(phone_number="+998901300001", language_code="uz")
+    db_session.add(user)
+    await db_session.flush()
+    orders = [
+        Order(user_id=user.id, status=status, total_amount=Decimal("120.50"), notes="line1\nline2, quoted \"x\"",
+              created_at=datetime(2026, 5, day))
+        for day, status in ((1, "pending"), (2, "completed"), (3, "pending"))
+    ]
+    db_session.add_all(orders)
+    await db_session.flush()
+    db_session.add(Payment(order_id=orders[1].id, amount=Decimal("120.50"), status="paid", token="export-token"))
+    await db_session.commit()
+    return [order.id for order in orders]
+
+
+def test_export_orders_ndjson(client: TestClient, valid_admin_key: str, export_orders: list[int]):
+    """NDJSON rows carry the list fields, in ID order, with the list filters applied."""
+    response = client.get(
+        "/admin/export/orders", params={"status_filter": "pending"}, headers={"X-Admin-Key": valid_admin_key}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"].endswith('.ndjson"')
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [export_orders[0], export_orders[2]]
+    assert rows[0]["total_amount"] == "120.50"
+    assert rows[0]["created_at"] == "2026-05-01T00:00:00"
+    assert rows[0]["payment_status"] is None
+
+
+def test_export_orders_csv_gzip(client: TestClient, valid_admin_key: str, export_orders: list[int]):
+    """Gzipped CSV decompresses to a header row plus one quoted row per order."""
+    response = client.get(
+        "/admin/export/orders", params={"format": "csv", "gzip": True}, headers={"X-Admin-Key": valid_admin_key}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert response.headers["content-disposition"].endswith('.csv.gz"')
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.content).decode())))
+    assert [int(row["id"]) for row in rows] == export_orders
+    assert rows[1]["payment_status"] == "paid"
+    assert rows[0]["payment_status"] == ""
+    assert rows[0]["notes"] == "line1\nline2, quoted \"x\""
+
+
+@pytest.mark.parametrize("compress", [False, True])
+async def test_export_streams_in_chunks(
+    db_session: AsyncSession, export_orders: list[int], monkeypatch, compress: bool
+):
+    """Rows are flushed chunk by chunk; the concatenated chunks are one valid file."""
+    monkeypatch.setattr(export, "_CHUNK_SIZE", 16)
+    query = select(Order.id, Order.status).order_by(Order.id)
+
+    chunks = [chunk async for chunk in export._encode(db_session, query, "ndjson", compress, fetch_size=2)]
+
+    body = b"".join(chunks)
+    lines = (gzip.decompress(body) if compress else body).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == export_orders
+    if not compress:
+        assert len(chunks) == len(export_orders)
+
+
+def test_export_users_and_payments(client: TestClient, valid_admin_key: str, export_orders: list[int]):
+    """Users and payments export their own columns; checkout tokens are left out."""
+    headers = {"X-Admin-Key": valid_admin_key}
+
+    users = client.get("/admin/export/users", headers=headers).text.splitlines()
+    payments = [json.loads(line) for line in client.get("/admin/export/payments", headers=headers).text.splitlines()]
+
+    assert [json.loads(line)["language_code"] for line in users] == ["uz"]
+    assert [(p["order_id"], p["status"]) for p in payments] == [(export_orders[1], "paid")]
+    assert "token" not in payments[0]
+
+
+def test_export_requires_admin_key(client: TestClient):
+    """Exports require X-Admin-Key."""
+    assert client.get("/admin/export/orders").status_code == 403
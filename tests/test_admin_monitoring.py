@@ -0,0 +1,47 @@
+"""Tests for Admin Monitoring API endpoints (/admin/monitoring)."""
+
+from fastapi.testclient import TestClient
+
+from nms.monitoring.metrics import Histogram
+
+
+# --- Auth Tests ---
+
+
+def test_db_pool_stats_no_auth(client: TestClient):
+    """Pool stats require X-Admin-Key."""
+    response = client.get("/admin/monitoring/db-pool")
+    assert response.status_code == 403
+
+
+# --- GET /admin/monitoring/db-pool ---
+
+
+def test_db_pool_stats_success(client: TestClient, valid_admin_key: str):
+    """Pool stats expose live counters and wait-time histogram."""
+    headers = {"X-Admin-Key": valid_admin_key}
+    response = client.get("/admin/monitoring/db-pool", headers=headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pool_class"] == "InstrumentedAsyncPool"
+    assert data["size"] >= 1
+    assert data["checked_out"] >= 0
+    assert data["overflow"] >= 0
+    assert "le_inf" in data["wait_ms"]["buckets"]
+
+
+# --- Histogram ---
+
+
+def test_histogram_buckets():
+    """Observations land in the first bucket whose bound is >= value."""
+    histogram = Histogram(buckets=(1, 10))
+    histogram.observe(0.5)
+    histogram.observe(10)
+    histogram.observe(50)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 3
+    assert snapshot["max_ms"] == 50
+    assert snapshot["buckets"] == {"le_1": 1, "le_10": 1, "le_inf": 1}
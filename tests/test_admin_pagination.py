@@ -0,0 +1,70 @@
+"""Tests for keyset (cursor) pagination of admin list endpoints."""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.models.db_models import Order, User
+
+
+@pytest_asyncio.fixture
+async def many_orders(db_session: AsyncSession) -> list[int]:
+    """Seven orders with duplicate and NULL amounts and equal timestamps."""
+    user = User(phone_number="+998901110000")
+    db_session.add(user)
+    await db_session.flush()
+    created = datetime(2026, 1, 1)
+    amounts = [Decimal("100"), None, Decimal("100"), Decimal("50"), None, Decimal("200"), Decimal("100")]
+    orders = [
+        Order(user_id=user.id, total_amount=amount, created_at=created + timedelta(hours=i // 2))
+        for i, amount in enumerate(amounts)
+    ]
+    db_session.add_all(orders)
+    await db_session.commit()
+    return [order.id for order in orders]
+
+
+def _walk(client: TestClient, headers: dict, params: dict) -> list[int]:
+    """Follow next_cursor to the end, collecting order ids."""
+    ids, cursor = [], None
+    while True:
+        page = client.get(
+            "/admin/orders", params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers
+        ).json()
+        ids += [o["id"] for o in page["orders"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("sort_by", ["id", "total_amount", "created_at"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_cursor_pages_match_offset_listing(
+    client: TestClient, valid_admin_key: str, many_orders: list[int], sort_by: str, order: str
+):
+    """Walking cursors yields the same rows in the same order as one big offset page."""
+    headers = {"X-Admin-Key": valid_admin_key}
+    params = {"sort_by": sort_by, "order": order}
+
+    expected = [o["id"] for o in client.get(
+        "/admin/orders", params={**params, "limit": 100}, headers=headers
+    ).json()["orders"]]
+
+    assert sorted(expected) == sorted(many_orders)
+    assert _walk(client, headers, {**params, "limit": 2}) == expected
+
+
+def test_invalid_cursor_is_rejected(client: TestClient, valid_admin_key: str, many_orders: list[int]):
+    """Garbage cursors and cursors issued for another sort are 400."""
+    headers = {"X-Admin-Key": valid_admin_key}
+    first = client.get("/admin/users", params={"limit": 1}, headers=headers).json()
+
+    assert client.get("/admin/users", params={"cursor": "nope"}, headers=headers).status_code == 400
+    response = client.get(
+        "/admin/users", params={"cursor": first["next_cursor"], "sort_by": "created_at"}, headers=headers
+    )
+    assert response.status_code == 400
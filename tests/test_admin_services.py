@@ -162,6 +162,24 @@ def test_admin_update_service_success(client: TestClient, valid_admin_key: str,
     assert float(data["base_price"]) == 180000.00
 
 
+def test_admin_update_service_refreshes_catalog(
+    client: TestClient, valid_admin_key: str, valid_api_key: str, test_service: int
+):
+    """Bot endpoints see admin updates immediately (catalog cache invalidated)."""
+    api_headers = {"X-API-Key": valid_api_key}
+    assert client.get("/services", headers=api_headers).json()["services"][0]["name"] == "Test Massage"
+
+    headers = {"X-Admin-Key": valid_admin_key}
+    client.patch(f"/admin/services/{test_service}", json={"name": "Renamed"}, headers=headers)
+
+    response = client.get("/services", headers=api_headers)
+    assert response.json()["services"][0]["name"] == "Renamed"
+
+    # Warm catalog: served without touching the database
+    response = client.get("/services", headers=api_headers)
+    assert 'desc="0 queries"' in response.headers["Server-Timing"]
+
+
 def test_admin_update_service_not_found(client: TestClient, valid_admin_key: str):
     """Update non-existent service via admin endpoint."""
     headers = {"X-Admin-Key": valid_admin_key}
@@ -0,0 +1,79 @@
+"""Tests for the incrementally maintained /admin/stats counters."""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.models.db_models import Order, User
+from nms.services.stats_counters import stats_counters
+
+
+def _stats(client: TestClient, headers: dict) -> dict:
+    response = client.get("/admin/stats", headers=headers)
+    assert response.status_code == 200
+    assert 'desc="1 queries"' in response.headers["Server-Timing"]
+    return response.json()
+
+
+async def test_counters_follow_mutations(
+    client: TestClient, db_session: AsyncSession, valid_api_key: str, valid_admin_key: str, test_service: int
+):
+    """Registrations, order and service changes keep the counters exact."""
+    headers = {"X-Admin-Key": valid_admin_key}
+    api_headers = {"X-API-Key": valid_api_key}
+
+    client.post("/users/register", json={"phone_number": "+998901000001"}, headers=api_headers)
+    # Re-registering an existing phone is an update, not a new user
+    client.post("/users/register", json={"phone_number": "+998901000001", "language_code": "en"}, headers=api_headers)
+    user_id = client.post("/admin/users", json={"phone_number": "+998901000002"}, headers=headers).json()["id"]
+    order_ids = [
+        client.post("/admin/orders", json={"user_id": user_id, "service_id": test_service}, headers=headers).json()["id"]
+        for _ in range(3)
+    ]
+    client.patch(f"/admin/orders/{order_ids[0]}", json={"status": "confirmed"}, headers=headers)
+    client.patch(f"/admin/orders/{order_ids[1]}", json={"status": "confirmed"}, headers=headers)
+    client.delete(f"/admin/orders/{order_ids[2]}", headers=headers)
+
+    assert _stats(client, headers) == {
+        "total_users": 2,
+        "total_orders": 2,
+        "total_services": 1,
+        "orders_by_status": {"confirmed": 2},
+    }
+
+    # Deleting a user cascades to their orders; deactivating a service drops it
+    client.delete(f"/admin/users/{user_id}", headers=headers)
+    client.delete(f"/admin/services/{test_service}", headers=headers)
+
+    assert _stats(client, headers) == {
+        "total_users": 1,
+        "total_orders": 0,
+        "total_services": 0,
+        "orders_by_status": {},
+    }
+    assert await stats_counters.reconcile(db_session) == {}
+
+
+async def test_reconcile_repairs_drift(
+    client: TestClient, db_session: AsyncSession, valid_admin_key: str, test_user: int
+):
+    """Writes that bypass the session are picked up by reconciliation."""
+    headers = {"X-Admin-Key": valid_admin_key}
+    await db_session.execute(insert(Order).values(user_id=test_user, status="pending"))
+    await db_session.execute(insert(User).values(phone_number="+998901000003"))
+    await db_session.commit()
+    await db_session.execute(update(Order).values(status="completed"))
+    await db_session.commit()
+
+    assert _stats(client, headers)["total_orders"] == 0
+
+    drift = await stats_counters.reconcile(db_session)
+
+    assert drift == {"users": 1, "orders": 1, "orders_status:completed": 1}
+    assert _stats(client, headers) == {
+        "total_users": 2,
+        "total_orders": 1,
+        "total_services": 0,
+        "orders_by_status": {"completed": 1},
+    }
+    assert await stats_counters.reconcile(db_session) == {}
@@ -0,0 +1,106 @@
+"""Tests for the total-count strategies of admin list endpoints."""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.api.admin.totals import ListTotals, list_totals
+from nms.models.db_models import User
+
+
+@pytest.fixture(autouse=True)
+def _clear_totals_cache():
+    list_totals.clear()
+    yield
+    list_totals.clear()
+
+
+@pytest.mark.parametrize("mode", ["auto", "exact", "estimate"])
+def test_totals_are_exact_without_planner_estimates(
+    client: TestClient, valid_admin_key: str, test_user: int, mode: str
+):
+    """SQLite has no planner estimate, so every mode falls back to counting."""
+    response = client.get("/admin/users", params={"total_mode": mode}, headers={"X-Admin-Key": valid_admin_key})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["total"], data["total_exact"]) == (1, True)
+
+
+def test_cached_total_is_reused_per_filter_set(
+    client: TestClient, valid_admin_key: str, test_user: int
+):
+    """A cached count is served again (flagged inexact) until its TTL runs out."""
+    headers = {"X-Admin-Key": valid_admin_key}
+    params = {"total_mode": "cached"}
+
+    first = client.get("/admin/users", params=params, headers=headers).json()
+    client.post("/admin/users", json={"phone_number": "+998901112233"}, headers=headers)
+    second = client.get("/admin/users", params=params, headers=headers).json()
+    filtered = client.get("/admin/users", params={**params, "q": "2"}, headers=headers).json()
+
+    assert (first["total"], first["total_exact"]) == (1, True)
+    assert (second["total"], second["total_exact"]) == (1, False)
+    assert len(second["users"]) == 2
+    # Another filter set has its own entry
+    assert (filtered["total"], filtered["total_exact"]) == (1, True)
+
+
+async def test_cached_totals_expire_and_stay_bounded(db_session: AsyncSession):
+    """Entries past their TTL are recounted; the cache never exceeds max_entries."""
+    totals = ListTotals(mode="cached", ttl=0, max_entries=2)
+    db_session.add(User(phone_number="+998901112244"))
+    await db_session.commit()
+
+    for phone in ("+1", "+2", "+3"):
+        total = await totals.count(db_session, User, [User.phone_number != phone])
+        assert (total.value, total.exact) == (1, True)
+    assert len(totals._cache) <= 2
+
+    again = await totals.count(db_session, User, [User.phone_number != "+3"])
+    assert again.exact
+
+
+@asynccontextmanager
+async def nullcontext_async():
+    yield
+
+
+class _PostgresStub:
+    """Session stand-in answering the reltuples query; records what was executed."""
+
+    def __init__(self, reltuples: int) -> None:
+        self.bind = SimpleNamespace(dialect=postgresql.dialect())
+        self.reltuples = reltuples
+        self.statements: list[str] = []
+
+    def begin_nested(self):
+        return nullcontext_async()
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        value = self.reltuples if "reltuples" in str(statement) else 7
+        return SimpleNamespace(scalar_one_or_none=lambda: value, scalar_one=lambda: value)
+
+    async def connection(self):
+        raise AssertionError("EXPLAIN must not run for a small table")
+
+
+async def test_auto_counts_small_tables_without_explain():
+    """Below the threshold, auto goes from reltuples straight to count(*)."""
+    db = _PostgresStub(reltuples=500)
+
+    total = await ListTotals(mode="auto", exact_threshold=10_000).count(db, User, [User.phone_number != "+1"])
+
+    assert (total.value, total.exact) == (7, True)
+    assert len(db.statements) == 2
+    assert "reltuples" in db.statements[0] and "count" in db.statements[1]
+
+
+def test_exact_is_the_default_mode():
+    """Estimates are opt-in through ADMIN_TOTAL_MODE."""
+    assert ListTotals().mode == list_totals.mode == "exact"
@@ -0,0 +1,52 @@
+"""Tests for the cross-worker cache invalidation bus (polling fallback)."""
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.services.invalidation import InvalidationBus, invalidation_bus
+
+
+async def test_publish_reaches_other_worker(db_session: AsyncSession):
+    """An event committed by one worker is applied by another on poll."""
+    publisher = InvalidationBus()
+    listener = InvalidationBus()
+    listener.origin = "other-worker:1"
+
+    local_keys, remote_keys = [], []
+    publisher.subscribe("services", local_keys.append)
+    listener.subscribe("services", remote_keys.append)
+
+    await publisher.commit_and_publish(db_session, "services", 42)
+    assert local_keys == [42]
+
+    applied = await listener.poll_once(db_session)
+    assert applied == 1
+    assert remote_keys == [42]
+    assert listener.received == 1
+    assert listener.propagation_ms.count == 1
+
+
+async def test_own_events_are_not_applied_twice(db_session: AsyncSession):
+    """A worker skips its own events when polling (already applied on commit)."""
+    bus = InvalidationBus()
+    keys = []
+    bus.subscribe("users", keys.append)
+
+    await bus.commit_and_publish(db_session, "users", 7)
+    await bus.poll_once(db_session)
+
+    assert keys == [7]
+    assert bus.received == 0
+
+
+def test_admin_user_without_telegram_id_publishes_nothing(client: TestClient, valid_admin_key: str):
+    """A user without a telegram_id has no cache entry; None would flush them all."""
+    headers = {"X-Admin-Key": valid_admin_key}
+    published = invalidation_bus.published
+
+    created = client.post("/admin/users", json={"phone_number": "+998900000001"}, headers=headers)
+    assert created.status_code == 200
+    deleted = client.delete(f"/admin/users/{created.json()['id']}", headers=headers)
+    assert deleted.status_code == 200
+
+    assert invalidation_bus.published == published
@@ -2,6 +2,9 @@
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.services.user_resolver import telegram_user_resolver
 
 
 # --- 1. Тест доступности сервера (Public) ---
@@ -197,6 +200,20 @@ def test_get_user_by_telegram_id_found(
     assert "updated_at" in data
 
 
+def test_get_user_by_telegram_id_etag(
+    client: TestClient, valid_api_key: str, test_user_with_telegram: dict
+):
+    """Повторный запрос с If-None-Match возвращает 304 без тела"""
+    headers = {"X-API-Key": valid_api_key}
+    url = f"/users/by-telegram/{test_user_with_telegram['telegram_id']}"
+
+    etag = client.get(url, headers=headers).headers["ETag"]
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
 def test_get_user_by_telegram_id_not_found(client: TestClient, valid_api_key: str):
     """Поиск пользователя по telegram_id — не найден (404)"""
     headers = {"X-API-Key": valid_api_key}
@@ -232,3 +249,109 @@ def test_register_new_phone_with_existing_telegram_id_creates_new_user(
     assert data["status"] == "ok"
     # Должен создать НОВОГО пользователя (телефон — первичный идентификатор)
     assert data["user_id"] != test_user_with_telegram["user_id"]
+
+
+def test_register_existing_phone_updates_language(
+    client: TestClient, valid_api_key: str, test_user_with_telegram: dict
+):
+    """Повторная регистрация по тому же телефону обновляет язык и возвращает тот же ID"""
+    headers = {"X-API-Key": valid_api_key}
+    payload = {"phone_number": "+998909876543", "language_code": "uz"}
+
+    response = client.post("/users/register", json=payload, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["user_id"] == test_user_with_telegram["user_id"]
+
+    user = client.get(
+        f"/users/by-telegram/{test_user_with_telegram['telegram_id']}", headers=headers
+    ).json()
+    assert user["language_code"] == "uz"
+    assert user["telegram_id"] == test_user_with_telegram["telegram_id"]
+
+
+def test_register_unchanged_user_keeps_updated_at_and_etag(
+    client: TestClient, valid_api_key: str, test_user_with_telegram: dict
+):
+    """Повторный /start с теми же данными ничего не пишет: updated_at и ETag не меняются"""
+    headers = {"X-API-Key": valid_api_key}
+    url = f"/users/by-telegram/{test_user_with_telegram['telegram_id']}"
+    payload = {"phone_number": "+998909876543", "telegram_id": test_user_with_telegram["telegram_id"]}
+
+    before = client.get(url, headers=headers)
+    response = client.post("/users/register", json=payload, headers=headers)
+    after = client.get(url, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["user_id"] == test_user_with_telegram["user_id"]
+    assert after.json()["updated_at"] == before.json()["updated_at"]
+    assert after.headers["ETag"] == before.headers["ETag"]
+
+
+def test_register_moves_telegram_id_to_new_phone(
+    client: TestClient, valid_api_key: str, test_user_with_telegram: dict
+):
+    """telegram_id переносится к новому телефону, старый пользователь его теряет"""
+    headers = {"X-API-Key": valid_api_key}
+    telegram_id = test_user_with_telegram["telegram_id"]
+    payload = {"phone_number": "+998901118888", "telegram_id": telegram_id}
+
+    response = client.post("/users/register", json=payload, headers=headers)
+    new_user_id = response.json()["user_id"]
+
+    user = client.get(f"/users/by-telegram/{telegram_id}", headers=headers).json()
+    assert user["id"] == new_user_id
+    assert user["phone_number"] == "+998901118888"
+
+
+def test_unknown_telegram_id_cached_until_registration(client: TestClient, valid_api_key: str):
+    """Неизвестный telegram_id кэшируется негативно, регистрация сбрасывает кэш"""
+    headers = {"X-API-Key": valid_api_key}
+    url = "/users/by-telegram/555000111"
+
+    assert client.get(url, headers=headers).status_code == 404
+    response = client.get(url, headers=headers)
+    assert response.status_code == 404
+    assert 'desc="0 queries"' in response.headers["Server-Timing"]
+
+    client.post(
+        "/users/register",
+        json={"phone_number": "+998901117777", "telegram_id": 555000111},
+        headers=headers,
+    )
+    assert client.get(url, headers=headers).status_code == 200
+
+
+async def test_register_with_new_telegram_id_evicts_the_old_one(
+    client: TestClient, valid_api_key: str, test_user_with_telegram: dict, db_session: AsyncSession
+):
+    """Старый telegram_id перестаёт резолвиться, когда телефон регистрируется с новым"""
+    headers = {"X-API-Key": valid_api_key}
+    old_telegram_id = test_user_with_telegram["telegram_id"]
+    assert await telegram_user_resolver.resolve(old_telegram_id, db_session) is not None
+
+    client.post(
+        "/users/register",
+        json={"phone_number": "+998909876543", "telegram_id": 192496999},
+        headers=headers,
+    )
+
+    assert telegram_user_resolver.lookup(old_telegram_id) == (False, None)
+    assert await telegram_user_resolver.resolve(old_telegram_id, db_session) is None
+
+
+def test_active_orders_single_query(
+    client: TestClient, valid_api_key: str, test_user_with_telegram: dict, test_service: int
+):
+    """Активные заказы находятся по telegram_id одним запросом"""
+    headers = {"X-API-Key": valid_api_key}
+    client.post(
+        "/orders",
+        json={"user_id": test_user_with_telegram["user_id"], "service_id": test_service},
+        headers=headers,
+    )
+    url = f"/orders/active?telegram_id={test_user_with_telegram['telegram_id']}"
+
+    response = client.get(url, headers=headers)
+    assert len(response.json()["orders"]) == 1
+    assert 'desc="1 queries"' in response.headers["Server-Timing"]
@@ -0,0 +1,233 @@
+"""Tests for the transactional notification outbox and its dispatcher."""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import httpx
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.models.db_models import NotificationDeadLetter, NotificationOutbox, Order, Service, User
+from nms.services.notification_outbox import (
+    OutboxDispatcher,
+    backoff_delay,
+    enqueue_status_notification,
+)
+from nms.services.telegram_notifier import TelegramNotifier
+
+
+def _dispatcher(status_code: int, sent: list, **options) -> OutboxDispatcher:
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        return httpx.Response(status_code, json={"ok": status_code == 200})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    options.setdefault("retry_delay", 30)
+    return OutboxDispatcher(TelegramNotifier("TOKEN", client=client), **options)
+
+
+@pytest_asyncio.fixture
+async def queued_order(db_session: AsyncSession) -> Order:
+    """Confirmed order with its status push waiting in the outbox."""
+    user = User(phone_number="+998901112233", telegram_id=555, language_code="en")
+    service = Service(name="Test Massage", base_price=Decimal("150000.00"), is_active=True)
+    db_session.add_all([user, service])
+    await db_session.flush()
+    order = Order(user_id=user.id, service_id=service.id, status="confirmed",
+                  total_amount=Decimal("150000.00"))
+    db_session.add(order)
+    await db_session.flush()
+    enqueue_status_notification(db_session, order)
+    await db_session.commit()
+    return order
+
+
+def test_admin_status_change_enqueues_notification(
+    client: TestClient, valid_api_key: str, valid_admin_key: str,
+    test_user_with_telegram: dict, test_service: int,
+):
+    """Status changes are queued, not sent inline; other edits queue nothing."""
+    admin = {"X-Admin-Key": valid_admin_key}
+    response = client.post(
+        "/orders",
+        json={"user_id": test_user_with_telegram["user_id"], "service_id": test_service},
+        headers={"X-API-Key": valid_api_key},
+    )
+    order_id = response.json()["order_id"]
+
+    client.patch(f"/admin/orders/{order_id}", json={"notes": "call first"}, headers=admin)
+    assert client.get("/admin/monitoring/outbox", headers=admin).json()["pending"] == 0
+
+    client.patch(f"/admin/orders/{order_id}", json={"status": "confirmed"}, headers=admin)
+    assert client.get("/admin/monitoring/outbox", headers=admin).json()["pending"] == 1
+
+
+async def test_drain_delivers_and_marks_order_notified(db_session: AsyncSession, queued_order: Order):
+    """A delivered push removes the outbox row and marks the order notified."""
+    sent = []
+    dispatcher = _dispatcher(200, sent)
+
+    assert await dispatcher.drain_once(db_session) == 1
+    assert await dispatcher.drain_once(db_session) == 0
+
+    await db_session.refresh(queued_order)
+    assert (await db_session.execute(select(NotificationOutbox))).scalars().all() == []
+    assert queued_order.notified_status == "confirmed"
+    assert len(sent) == 1
+    assert dispatcher.snapshot()["sent"] == 1
+
+
+async def test_drain_failure_schedules_retry(db_session: AsyncSession, queued_order: Order):
+    """A failed push stays in the outbox and is not retried before its delay."""
+    sent = []
+    dispatcher = _dispatcher(500, sent)
+
+    assert await dispatcher.drain_once(db_session) == 1
+
+    entry = (await db_session.execute(select(NotificationOutbox))).scalar_one()
+    assert entry.locked_until is None
+    assert entry.attempts == 1
+    assert entry.available_at > datetime.utcnow()
+    assert await dispatcher.drain_once(db_session) == 0
+    assert dispatcher.snapshot()["failed"] == 1
+
+
+async def test_send_runs_outside_any_transaction(db_session: AsyncSession, queued_order: Order):
+    """The claim commits before sending, so no row lock or pooled connection is held meanwhile."""
+    in_transaction = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        in_transaction.append(db_session.in_transaction())
+        return httpx.Response(200, json={"ok": True})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    dispatcher = OutboxDispatcher(TelegramNotifier("TOKEN", client=client))
+
+    assert await dispatcher.drain_once(db_session) == 1
+    assert in_transaction == [False]
+
+
+async def test_leased_rows_are_claimed_again_only_after_expiry(db_session: AsyncSession, queued_order: Order):
+    """A row leased by another dispatcher is skipped until its lease runs out."""
+    entry = (await db_session.execute(select(NotificationOutbox))).scalar_one()
+    entry.locked_until = datetime.utcnow() + timedelta(minutes=5)
+    await db_session.commit()
+    sent = []
+    dispatcher = _dispatcher(200, sent)
+
+    assert await dispatcher.drain_once(db_session) == 0
+
+    # The other dispatcher died mid-batch
+    entry.locked_until = datetime.utcnow() - timedelta(seconds=1)
+    await db_session.commit()
+    assert await dispatcher.drain_once(db_session) == 1
+    assert len(sent) == 1
+    assert dispatcher.snapshot()["lease_lost"] == 0
+
+
+async def test_drain_skips_superseded_status(db_session: AsyncSession, queued_order: Order):
+    """A queued push for a status the order has already left is dropped unsent."""
+    queued_order.status = "cancelled"
+    await db_session.commit()
+    sent = []
+    dispatcher = _dispatcher(200, sent)
+
+    assert await dispatcher.drain_once(db_session) == 1
+
+    assert sent == []
+    assert dispatcher.snapshot()["skipped"] == 1
+
+
+async def test_permanent_failure_is_dead_lettered(db_session: AsyncSession, queued_order: Order):
+    """A non-retryable API error (e.g. bot blocked) goes straight to the dead-letter table."""
+    dispatcher = _dispatcher(403, [])
+
+    assert await dispatcher.drain_once(db_session) == 1
+
+    assert (await db_session.execute(select(NotificationOutbox))).scalars().all() == []
+    dead = (await db_session.execute(select(NotificationDeadLetter))).scalar_one()
+    assert (dead.order_id, dead.status, dead.attempts, dead.http_status) == (
+        queued_order.id, "confirmed", 1, 403
+    )
+    assert dispatcher.snapshot()["dead_lettered"] == 1
+
+
+async def test_retries_stop_at_max_attempts(db_session: AsyncSession, queued_order: Order):
+    """Transient failures are retried until max_attempts, then dead-lettered."""
+    sent = []
+    dispatcher = _dispatcher(500, sent, retry_delay=0, max_attempts=3)
+
+    for _ in range(3):
+        assert await dispatcher.drain_once(db_session) == 1
+    assert await dispatcher.drain_once(db_session) == 0
+
+    assert len(sent) == 3
+    dead = (await db_session.execute(select(NotificationDeadLetter))).scalar_one()
+    assert dead.attempts == 3
+    assert dead.http_status == 500
+
+
+def test_backoff_delay_grows_with_jitter_and_cap():
+    """Delay doubles per attempt, is jittered within its upper half and capped."""
+    assert backoff_delay(1, base=5, cap=3600, rand=lambda: 0.0) == 2.5
+    assert backoff_delay(1, base=5, cap=3600, rand=lambda: 1.0) == 5
+    assert backoff_delay(4, base=5, cap=3600, rand=lambda: 1.0) == 40
+    assert backoff_delay(20, base=5, cap=3600, rand=lambda: 1.0) == 3600
+
+
+async def test_sweep_requeues_stale_orders(db_session: AsyncSession, queued_order: Order):
+    """Stale orders without a pending row are re-queued; dead-lettered and recent ones are not."""
+    dispatcher = _dispatcher(200, [], sweep_grace=60)
+    old = datetime.utcnow() - timedelta(hours=1)
+
+    # Pending outbox row exists: nothing to sweep
+    queued_order.updated_at = old
+    await db_session.commit()
+    assert await dispatcher.sweep_once(db_session) == 0
+
+    # Outbox row was consumed without updating the order (e.g. skipped by a crash)
+    entry = (await db_session.execute(select(NotificationOutbox))).scalar_one()
+    await db_session.delete(entry)
+    await db_session.commit()
+    assert await dispatcher.sweep_once(db_session) == 1
+    assert await dispatcher.sweep_once(db_session) == 0
+
+    # Dead-lettered for the current status: the sweeper leaves it alone
+    await dispatcher.drain_once(db_session)
+    await db_session.refresh(queued_order)
+    assert queued_order.notified_status == "confirmed"
+
+    queued_order.status = "completed"
+    await db_session.commit()
+    queued_order.updated_at = old
+    db_session.add(NotificationDeadLetter(order_id=queued_order.id, status="completed", attempts=8))
+    await db_session.commit()
+    assert await dispatcher.sweep_once(db_session) == 0
+
+
+async def test_sweep_ignores_orders_older_than_max_age(db_session: AsyncSession, queued_order: Order):
+    """Historical unacknowledged orders are not re-pushed (e.g. on the first deploy)."""
+    dispatcher = _dispatcher(200, [], sweep_grace=60, sweep_max_age=86400)
+    await db_session.delete((await db_session.execute(select(NotificationOutbox))).scalar_one())
+    queued_order.updated_at = datetime.utcnow() - timedelta(days=2)
+    await db_session.commit()
+
+    assert await dispatcher.sweep_once(db_session) == 0
+
+    queued_order.updated_at = datetime.utcnow() - timedelta(hours=1)
+    await db_session.commit()
+    assert await dispatcher.sweep_once(db_session) == 1
+
+
+async def test_missing_bot_token_is_not_retried(db_session: AsyncSession, queued_order: Order):
+    """Without a token every attempt would fail alike: dead-letter at once, never start the loop."""
+    dispatcher = OutboxDispatcher(TelegramNotifier(""))
+
+    assert await dispatcher.drain_once(db_session) == 1
+
+    dead = (await db_session.execute(select(NotificationDeadLetter))).scalar_one()
+    assert (dead.attempts, dead.http_status, dead.error) == (1, None, "bot token not configured")
+    await dispatcher.start(None)
+    assert dispatcher.snapshot()["running"] is False
@@ -0,0 +1,77 @@
+"""Tests for precompiled notification templates."""
+
+import json
+from decimal import Decimal
+
+import pytest
+
+from nms.services.notification_templates import (
+    CompiledTemplate,
+    TemplateRegistry,
+    format_amount,
+    template_registry,
+)
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        (Decimal("150000.00"), "150 000"),
+        ("1250000.50", "1 250 000"),
+        (999, "999"),
+        ("1.5E+5", "150 000"),
+        (None, "—"),
+        ("n/a", "n/a"),
+        (Decimal("Infinity"), "Infinity"),
+        (Decimal("NaN"), "NaN"),
+    ],
+)
+def test_format_amount(raw, expected):
+    """Amounts render as whole sums with space-grouped thousands."""
+    assert format_amount(raw) == expected
+
+
+def test_compiled_template_matches_str_format():
+    """Compiled rendering equals str.format, including literal percent signs."""
+    source = "Order #{order_id}: {service_name} -10% = {amount}"
+    values = {"order_id": 7, "service_name": "Massage", "amount": "150 000"}
+
+    assert CompiledTemplate(source).render(**values) == source.format(**values)
+
+
+def test_compiled_template_renders_positional_args():
+    """render_args() picks fields by TEMPLATE_FIELDS position, for any number of placeholders."""
+    args = (7, "Massage", "150 000")
+
+    assert CompiledTemplate("{amount} / #{order_id}").render_args(args) == "150 000 / #7"
+    assert CompiledTemplate("Order #{order_id}").render_args(args) == "Order #7"
+    assert CompiledTemplate("Thanks! 100%").render_args(args) == "Thanks! 100%"
+
+
+def test_compiled_template_rejects_unknown_fields():
+    """Typos in data files fail at load time, not on the first notification."""
+    with pytest.raises(ValueError):
+        CompiledTemplate("Order #{order}")
+    with pytest.raises(ValueError):
+        CompiledTemplate("Price: {amount:>10}")
+
+
+def test_registry_falls_back_to_default_language():
+    """Unknown or missing languages use the default; unknown statuses have no template."""
+    ru = template_registry.render_order_status("confirmed", "ru", 7, "Массаж", "150000.00")
+
+    assert ru.startswith("Заказ #7 подтверждён.")
+    assert template_registry.render_order_status("confirmed", "de", 7, "Массаж", "150000.00") == ru
+    assert template_registry.render_order_status("confirmed", None, 7, "Массаж", "150000.00") == ru
+    assert template_registry.render_order_status("pending", "ru", 7, "Массаж", None) is None
+
+
+def test_registry_loads_language_files(tmp_path):
+    """A new language is just another <language>.json file."""
+    (tmp_path / "ru.json").write_text(json.dumps({"confirmed": "Заказ #{order_id}"}), encoding="utf-8")
+    (tmp_path / "kk.json").write_text(json.dumps({"confirmed": "Тапсырыс #{order_id}"}), encoding="utf-8")
+
+    registry = TemplateRegistry.from_directory(tmp_path)
+
+    assert registry.languages == ("kk", "ru")
+    assert registry.get("confirmed", "kk").render(order_id=3) == "Тапсырыс #3"
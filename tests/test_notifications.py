@@ -0,0 +1,83 @@
+"""Tests for order status notification endpoints (pending / ack)."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from nms.models.db_models import Order, UNNOTIFIED_ORDER
+
+
+@pytest.fixture
+def confirmed_order(
+    client: TestClient,
+    valid_api_key: str,
+    valid_admin_key: str,
+    test_user_with_telegram: dict,
+    test_service: int,
+) -> int:
+    """Order whose status changed to 'confirmed' without the user being notified."""
+    response = client.post(
+        "/orders",
+        json={"user_id": test_user_with_telegram["user_id"], "service_id": test_service},
+        headers={"X-API-Key": valid_api_key},
+    )
+    order_id = response.json()["order_id"]
+    client.patch(
+        f"/admin/orders/{order_id}",
+        json={"status": "confirmed"},
+        headers={"X-Admin-Key": valid_admin_key},
+    )
+    return order_id
+
+
+def test_pending_notifications_lists_changed_orders(
+    client: TestClient, valid_api_key: str, test_user_with_telegram: dict, confirmed_order: int
+):
+    """Orders with an undelivered status change are returned."""
+    headers = {"X-API-Key": valid_api_key}
+    telegram_id = test_user_with_telegram["telegram_id"]
+
+    response = client.get(f"/orders/pending-notifications?telegram_id={telegram_id}", headers=headers)
+
+    assert response.status_code == 200
+    notifications = response.json()["notifications"]
+    assert [n["order_id"] for n in notifications] == [confirmed_order]
+    assert notifications[0]["status"] == "confirmed"
+    assert notifications[0]["notified_status"] == "pending"
+
+
+def test_ack_notifications(
+    client: TestClient, valid_api_key: str, test_user_with_telegram: dict, confirmed_order: int
+):
+    """Ack marks orders delivered once; repeated acks are no-ops."""
+    headers = {"X-API-Key": valid_api_key}
+    telegram_id = test_user_with_telegram["telegram_id"]
+    payload = {"telegram_id": telegram_id, "order_ids": [confirmed_order, 99999]}
+
+    response = client.post("/orders/notifications/ack", json=payload, headers=headers)
+    assert response.json() == {"status": "ok", "acknowledged": 1}
+
+    response = client.post("/orders/notifications/ack", json=payload, headers=headers)
+    assert response.json() == {"status": "ok", "acknowledged": 0}
+
+    pending = client.get(f"/orders/pending-notifications?telegram_id={telegram_id}", headers=headers)
+    assert pending.json()["notifications"] == []
+
+
+def test_ack_notifications_ignores_other_users_orders(
+    client: TestClient, valid_api_key: str, confirmed_order: int
+):
+    """Orders of another user are not acknowledged; unknown users get 404."""
+    headers = {"X-API-Key": valid_api_key}
+    payload = {"telegram_id": 123123123, "order_ids": [confirmed_order]}
+
+    response = client.post("/orders/notifications/ack", json=payload, headers=headers)
+    assert response.status_code == 404
+
+
+def test_unnotified_predicate_has_no_bind_parameters():
+    """The partial-index predicate is rendered inline, so generic prepared plans can use the index."""
+    compiled = select(Order.id).where(UNNOTIFIED_ORDER).compile(dialect=postgresql.asyncpg.dialect())
+    assert compiled.params == {}
+    assert "'pending'" in str(compiled)
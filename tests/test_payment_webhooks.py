@@ -0,0 +1,164 @@
+"""Tests for payment webhook processing, the ingestion queue and status long-polls."""
+
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.config import get_settings
+from nms.models.db_models import (
+    NotificationOutbox,
+    Order,
+    Payment,
+    PaymentWebhookDelivery,
+    PaymentWebhookInbox,
+    User,
+)
+from nms.services.payment_events import PaymentStatusWatcher
+from nms.services.webhook_inbox import WebhookInbox
+
+
+@pytest_asyncio.fixture
+async def pending_payment(db_session: AsyncSession) -> Payment:
+    """Pending payment for a fresh order."""
+    user = User(phone_number="+998901112244", telegram_id=777)
+    db_session.add(user)
+    await db_session.flush()
+    order = Order(user_id=user.id, status="pending", total_amount=Decimal("150000.00"))
+    db_session.add(order)
+    await db_session.flush()
+    payment = Payment(order_id=order.id, amount=Decimal("150000.00"), token="tok-123")
+    db_session.add(payment)
+    await db_session.commit()
+    return payment
+
+
+def _payload(payment: Payment, status: str = "paid", **extra) -> dict:
+    return {"order_id": payment.order_id, "token": payment.token, "amount": "150000.00", "status": status, **extra}
+
+
+async def _count(db: AsyncSession, model) -> int:
+    return (await db.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+async def test_replayed_webhook_returns_stored_result(
+    client: TestClient, db_session: AsyncSession, pending_payment: Payment
+):
+    """A replay answers from the dedupe table in one query and queues nothing new."""
+    payload = _payload(pending_payment, transaction_id="payme-tx-1")
+
+    first = client.post("/webhooks/payme", json=payload)
+    replay = client.post("/webhooks/payme", json=payload)
+
+    assert first.status_code == replay.status_code == 200
+    assert replay.json() == first.json() == {
+        "status": "ok", "payment_id": pending_payment.id, "payment_status": "paid",
+    }
+    assert 'desc="1 queries"' in replay.headers["Server-Timing"]
+    assert await _count(db_session, NotificationOutbox) == 1
+    assert await _count(db_session, PaymentWebhookDelivery) == 1
+
+
+def test_replay_with_wrong_token_or_order_is_rejected(client: TestClient, pending_payment: Payment):
+    """A known transaction ID does not bypass token, order and amount validation."""
+    payload = _payload(pending_payment, transaction_id="payme-tx-1")
+    assert client.post("/webhooks/payme", json=payload).status_code == 200
+
+    forged = client.post("/webhooks/payme", json={**payload, "token": "forged"})
+    other_order = client.post("/webhooks/payme", json={**payload, "order_id": pending_payment.order_id + 1})
+    wrong_amount = client.post("/webhooks/payme", json={**payload, "amount": "1.00"})
+
+    assert forged.status_code == other_order.status_code == wrong_amount.status_code == 400
+    assert "Invalid payment token" in forged.json()["detail"]
+    assert "Payment not found" in other_order.json()["detail"]
+    assert "Amount mismatch" in wrong_amount.json()["detail"]
+
+
+async def test_duplicate_without_transaction_id_is_idempotent(
+    client: TestClient, db_session: AsyncSession, pending_payment: Payment
+):
+    """Double-clicks on the checkout page are deduplicated by token and status."""
+    assert client.post("/webhooks/payme", json=_payload(pending_payment)).status_code == 200
+    assert client.post("/webhooks/payme", json=_payload(pending_payment)).status_code == 200
+
+    order = await db_session.get(Order, pending_payment.order_id, populate_existing=True)
+    assert order.status == "confirmed"
+    assert await _count(db_session, NotificationOutbox) == 1
+
+
+def test_conflicting_webhook_is_rejected(client: TestClient, pending_payment: Payment):
+    """A different outcome for a finished payment is still an error."""
+    assert client.post("/webhooks/payme", json=_payload(pending_payment, "failed")).status_code == 200
+
+    response = client.post("/webhooks/payme", json=_payload(pending_payment, "paid"))
+
+    assert response.status_code == 400
+    assert "already in status" in response.json()["detail"]
+
+
+@pytest.fixture
+def queue_mode(monkeypatch) -> None:
+    """Acknowledge webhooks from the ingestion queue instead of processing inline."""
+    monkeypatch.setattr(get_settings(), "webhook_queue", True)
+
+
+async def test_queued_webhooks_are_acknowledged_then_processed_in_order(
+    client: TestClient, db_session: AsyncSession, pending_payment: Payment, queue_mode: None
+):
+    """Webhooks are only stored on ingest; workers apply them oldest first per order."""
+    order_id = pending_payment.order_id
+    first = client.post("/webhooks/payme", json=_payload(pending_payment, "paid", transaction_id="tx-1"))
+    second = client.post("/webhooks/payme", json=_payload(pending_payment, "failed", transaction_id="tx-2"))
+
+    assert first.json()["status"] == second.json()["status"] == "accepted"
+    order = await db_session.get(Order, order_id)
+    assert order.status == "pending"
+
+    inbox = WebhookInbox()
+    while await inbox.process_one(db_session):
+        pass
+
+    order = await db_session.get(Order, order_id, populate_existing=True)
+    rows = (await db_session.execute(select(PaymentWebhookInbox).order_by(PaymentWebhookInbox.id))).scalars().all()
+    assert order.status == "confirmed"
+    assert all(row.processed_at is not None for row in rows)
+    assert rows[0].last_error is None
+    assert "already in status" in rows[1].last_error
+    assert (inbox.processed, inbox.rejected, inbox.lag_ms.count) == (1, 1, 2)
+
+
+def test_status_wait_returns_on_change_or_timeout(
+    client: TestClient, valid_api_key: str, pending_payment: Payment
+):
+    """The long-poll holds a pending payment until timeout and returns a changed one at once."""
+    headers = {"X-API-Key": valid_api_key}
+    url = f"/payment/status/{pending_payment.id}/wait"
+
+    response = client.get(url, params={"timeout": 0.05}, headers=headers)
+    assert response.json()["status"] == "pending"
+    assert 'desc="1 queries"' in response.headers["Server-Timing"]
+
+    client.post("/webhooks/payme", json=_payload(pending_payment))
+    response = client.get(url, params={"status": "pending", "timeout": 30}, headers=headers)
+    assert response.json()["status"] == "paid"
+
+    assert client.get("/payment/status/9999/wait", headers=headers).status_code == 404
+
+
+async def test_watcher_wakes_waiters_of_one_payment():
+    """Notifications wake only that payment's waiters; None wakes everyone."""
+    watcher = PaymentStatusWatcher()
+    first, other = watcher.register(1), watcher.register(2)
+
+    watcher.notify(1)
+    assert await watcher.wait(first, timeout=1) is True
+    assert await watcher.wait(other, timeout=0.01) is False
+
+    watcher.notify(None)
+    assert other.is_set()
+    watcher.unregister(1, first)
+    watcher.unregister(2, other)
+    assert watcher.snapshot()["waiters"] == 0
@@ -0,0 +1,95 @@
+"""Tests for SQL statement monitoring (timing hooks, slow-query log)."""
+
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from nms.monitoring.queries import (
+    add_observer,
+    remove_observer,
+    normalize_sql,
+    parameter_shape,
+)
+from nms.monitoring.slow_query import SlowQueryLog
+
+
+def test_normalize_sql_folds_literals_and_in_lists():
+    """Statements differing only in values normalize to the same shape."""
+    a = normalize_sql("SELECT *\n  FROM orders WHERE id IN (?, ?, ?) AND note = 'x' LIMIT 10")
+    b = normalize_sql("SELECT * FROM orders WHERE id IN ($1, $2) AND note = 'yy' LIMIT 20")
+    assert a == "SELECT * FROM orders WHERE id IN (...) AND note = ? LIMIT ?"
+    assert a == b
+
+
+def test_parameter_shape_hides_values():
+    """Only parameter types are reported."""
+    assert parameter_shape((1, "secret", None)) == "(int, str, NoneType)"
+    assert parameter_shape({"phone": "+998"}) == "{phone: str}"
+    assert parameter_shape([(1,), (2,)], executemany=True) == "2 x (int)"
+
+
+async def test_slow_query_log_threshold(db_session: AsyncSession, caplog):
+    """Statements over the threshold are logged with their shape."""
+    slow_log = SlowQueryLog(threshold_ms=0.000001)
+    add_observer(slow_log)
+    try:
+        with caplog.at_level(logging.WARNING, logger="nms.slow_query"):
+            await db_session.execute(text("SELECT 1 WHERE 1 = :x"), {"x": 1})
+    finally:
+        remove_observer(slow_log)
+
+    assert slow_log.slow_count >= 1
+    assert any("[SLOW-QUERY] slow" in r.getMessage() for r in caplog.records)
+
+
+async def test_slow_query_log_quiet_below_threshold(db_session: AsyncSession):
+    """Fast statements are not logged when sampling is disabled."""
+    slow_log = SlowQueryLog(threshold_ms=60_000, sample_rate=0.0)
+    add_observer(slow_log)
+    try:
+        await db_session.execute(text("SELECT 1"))
+    finally:
+        remove_observer(slow_log)
+
+    assert slow_log.slow_count == 0
+    assert slow_log.sampled_count == 0
+
+
+# --- Per-request query stats ---
+
+
+def test_server_timing_header(client, valid_api_key: str, test_service: int):
+    """Responses report statement count and DB time in Server-Timing."""
+    headers = {"X-API-Key": valid_api_key}
+    response = client.get("/services", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert 'desc="1 queries"' in response.headers["Server-Timing"]
+
+
+def test_query_budget_strict_mode(db_session: AsyncSession):
+    """Strict mode fails the request when a route exceeds its query budget."""
+    from fastapi import Depends, FastAPI
+    from fastapi.testclient import TestClient
+
+    from nms.monitoring.request_queries import (
+        QueryBudgetExceeded,
+        QueryStatsMiddleware,
+        query_budget,
+    )
+
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, strict=True)
+
+    @app.get("/greedy", dependencies=[Depends(query_budget(1))])
+    async def greedy():
+        await db_session.execute(text("SELECT 1"))
+        await db_session.execute(text("SELECT 2"))
+        return {}
+
+    with TestClient(app) as test_client:
+        with pytest.raises(QueryBudgetExceeded):
+            test_client.get("/greedy")
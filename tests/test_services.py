@@ -118,3 +118,44 @@ def test_get_services_include_inactive(client: TestClient, valid_admin_key: str,
     data = response.json()
     service_ids = [s["id"] for s in data["services"]]
     assert test_service in service_ids
+
+
+# --- ETag / If-None-Match ---
+
+
+def test_get_services_etag_not_modified(client: TestClient, valid_api_key: str, test_service: int):
+    """A matching If-None-Match is answered with an empty 304."""
+    headers = {"X-API-Key": valid_api_key}
+    response = client.get("/services", headers=headers)
+    etag = response.headers["ETag"]
+
+    response = client.get("/services", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_get_services_etag_changes_after_update(
+    client: TestClient, valid_api_key: str, valid_admin_key: str, test_service: int
+):
+    """Admin changes produce a new ETag, so stale copies get a full 200."""
+    headers = {"X-API-Key": valid_api_key}
+    etag = client.get("/services", headers=headers).headers["ETag"]
+
+    client.patch(
+        f"/admin/services/{test_service}",
+        json={"base_price": 170000},
+        headers={"X-Admin-Key": valid_admin_key},
+    )
+
+    response = client.get("/services", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_openapi_documents_etag_contract(client: TestClient):
+    """The OpenAPI schema documents 304 and the ETag header for the bot."""
+    schema = client.get("/openapi.json").json()
+    responses = schema["paths"]["/services"]["get"]["responses"]
+    assert "304" in responses
+    assert "ETag" in responses["200"]["headers"]
@@ -0,0 +1,145 @@
+"""Tests for TelegramNotifier with an injected HTTP client and its send scheduler."""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from nms.services.telegram_notifier import SendScheduler, TelegramNotifier, TokenBucket
+
+
+def _stub_client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def test_send_message_uses_injected_client():
+    """Messages go through the injected client to the configured API URL."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"ok": True, "result": {}})
+
+    async with _stub_client(handler) as client:
+        notifier = TelegramNotifier("TOKEN", client=client, api_base_url="http://stub.local")
+        delivered = await notifier.send_message(42, "hello")
+
+    assert delivered is True
+    assert str(requests[0].url) == "http://stub.local/botTOKEN/sendMessage"
+    assert json.loads(requests[0].content) == {"chat_id": 42, "text": "hello"}
+
+
+async def test_send_message_api_error():
+    """Non-OK API responses are reported as undelivered."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(400, json={"ok": False, "description": "chat not found"})
+
+    async with _stub_client(handler) as client:
+        notifier = TelegramNotifier("TOKEN", client=client)
+        assert await notifier.send_message(42, "hello") is False
+
+
+async def test_notify_order_status_renders_template():
+    """Status notifications are rendered in the user's language."""
+    texts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        texts.append(json.loads(request.content)["text"])
+        return httpx.Response(200, json={"ok": True})
+
+    async with _stub_client(handler) as client:
+        notifier = TelegramNotifier("TOKEN", client=client)
+        delivered = await notifier.notify_order_status(
+            telegram_id=42,
+            order_id=7,
+            service_name="Massage",
+            total_amount="150000.00",
+            new_status="confirmed",
+            language_code="en",
+        )
+
+    assert delivered is True
+    assert texts[0].startswith("Order #7 confirmed.")
+    assert "Price: 150 000 sum" in texts[0]
+
+
+async def test_scheduler_serializes_and_spaces_one_chat():
+    """Sends to one chat never overlap and keep chat_interval between them."""
+    scheduler = SendScheduler(global_rate=1000, chat_interval=0.05)
+    active, starts = [], []
+
+    async def send():
+        active.append(1)
+        assert len(active) == 1
+        starts.append(time.monotonic())
+        await asyncio.sleep(0.01)
+        active.pop()
+        return httpx.Response(200, json={"ok": True})
+
+    await asyncio.gather(*(scheduler.run(7, send) for _ in range(3)))
+
+    assert starts[1] - starts[0] >= 0.05
+    assert starts[2] - starts[1] >= 0.05
+    assert scheduler.snapshot()["queue_depth"] == 0
+
+
+async def test_scheduler_runs_different_chats_concurrently():
+    """Different chats are not serialized against each other."""
+    scheduler = SendScheduler(global_rate=1000, chat_interval=1.0)
+    peak, active = [0], [0]
+
+    async def send():
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.02)
+        active[0] -= 1
+        return httpx.Response(200, json={"ok": True})
+
+    await asyncio.gather(*(scheduler.run(chat_id, send) for chat_id in range(5)))
+
+    assert peak[0] == 5
+    assert scheduler.snapshot()["sent"] == 5
+
+
+async def test_send_message_honors_retry_after():
+    """A 429 is retried after retry_after instead of being reported as a failure."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return httpx.Response(429, json={"ok": False, "parameters": {"retry_after": 0.05}})
+        return httpx.Response(200, json={"ok": True, "result": {}})
+
+    scheduler = SendScheduler(chat_interval=0)
+    async with _stub_client(handler) as client:
+        notifier = TelegramNotifier("TOKEN", client=client, scheduler=scheduler)
+        assert await notifier.send_message(42, "hello") is True
+
+    assert calls[1] - calls[0] >= 0.05
+    assert scheduler.snapshot()["throttled"] == 1
+
+
+def test_token_bucket_reserves_in_order():
+    """Once the burst is spent, each reservation waits one more token interval."""
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_token_bucket_default_never_exceeds_rate():
+    """Without an explicit burst, sends are paced at the rate from the first one on."""
+    bucket = TokenBucket(rate=30)
+
+    delays = [bucket.reserve() for _ in range(60)]
+
+    # The 31st send waits a full second: no more than `rate` sends in any second
+    assert sum(1 for delay in delays if delay < 0.99) == 30
+    assert delays[59] == pytest.approx(59 / 30, abs=0.01)
@@ -0,0 +1,60 @@
+"""Tests for TelegramNotifier against the local Bot API stub server."""
+
+import httpx
+import pytest
+
+from nms.services.telegram_notifier import SendScheduler, TelegramNotifier
+from nms.testing.telegram_stub import StubConfig, TelegramStubServer, parse_latency
+
+
+def _notifier(stub: TelegramStubServer, client: httpx.AsyncClient, **scheduler) -> TelegramNotifier:
+    return TelegramNotifier(
+        "TOKEN",
+        client=client,
+        api_base_url=stub.base_url,
+        scheduler=SendScheduler(global_rate=1000, **scheduler),
+    )
+
+
+async def test_stub_records_deliveries():
+    """Messages sent through the notifier are recorded by the stub."""
+    async with TelegramStubServer() as stub, httpx.AsyncClient() as client:
+        notifier = _notifier(stub, client, chat_interval=0)
+        delivered = await notifier.notify_order_status(
+            telegram_id=42,
+            order_id=7,
+            service_name="Massage",
+            total_amount="150000.00",
+            new_status="confirmed",
+            language_code="en",
+        )
+
+    assert delivered is True
+    assert [(d.chat_id, d.text.splitlines()[0]) for d in stub.deliveries] == [(42, "Order #7 confirmed.")]
+
+
+async def test_stub_per_chat_limit_is_honored():
+    """The stub's per-chat 429s are retried after retry_after until delivered."""
+    async with TelegramStubServer(StubConfig(chat_interval=0.05)) as stub, httpx.AsyncClient() as client:
+        notifier = _notifier(stub, client, chat_interval=0, max_retries=10)
+        results = [await notifier.send_message(42, f"message {i}") for i in range(3)]
+
+    assert results == [True, True, True]
+    assert len(stub.deliveries) == 3
+    assert stub.snapshot()["throttled"] >= 2
+
+
+async def test_stub_injects_errors():
+    """Injected 500s are reported as retryable failures."""
+    async with TelegramStubServer(StubConfig(error_rate=1.0)) as stub, httpx.AsyncClient() as client:
+        result = await _notifier(stub, client, chat_interval=0).deliver(42, "hello")
+
+    assert (result.delivered, result.http_status, result.retryable) == (False, 500, True)
+    assert stub.deliveries == []
+
+
+def test_parse_latency():
+    """Latency specs are in milliseconds; malformed specs are rejected."""
+    assert parse_latency("fixed:20")(None) == pytest.approx(0.02)
+    with pytest.raises(ValueError):
+        parse_latency("normal:20")